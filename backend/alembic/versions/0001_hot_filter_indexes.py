@@ -0,0 +1,82 @@
+"""Add composite indexes for the hot filter columns
+
+Covers the candidate list/pool/dashboard filters (is_in_pool, status,
+created_by, job_id, created_at), application lookups by job, candidate,
+status and date, and interview session lookups by application, round and
+status. Single-column indexes on the list filters keep the primary key as
+an implicit suffix, so keyset pages ordered by id need no sort.
+
+The same indexes are declared on the models, so databases built with
+Base.metadata.create_all() already have them - indexes that exist are
+skipped, and such databases can simply be stamped.
+
+Revision ID: 0001_hot_filter_indexes
+Revises:
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001_hot_filter_indexes"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_candidates_is_in_pool", "candidates", ["is_in_pool"]),
+    ("ix_candidates_created_by", "candidates", ["created_by"]),
+    ("ix_candidates_status_created_at", "candidates", ["status", "created_at"]),
+    ("ix_candidates_job_id_is_in_pool", "candidates", ["job_id", "is_in_pool"]),
+    ("ix_candidates_created_at", "candidates", ["created_at"]),
+    ("ix_applications_job_id_candidate_id", "applications", ["job_id", "candidate_id"]),
+    ("ix_applications_candidate_id", "applications", ["candidate_id"]),
+    ("ix_applications_status_applied_at", "applications", ["status", "applied_at"]),
+    ("ix_applications_applied_at", "applications", ["applied_at"]),
+    ("ix_applications_interview_scheduled_at", "applications", ["interview_scheduled_at"]),
+    ("ix_interview_sessions_application_id_round_id", "interview_sessions", ["application_id", "round_id"]),
+    ("ix_interview_sessions_application_id_status", "interview_sessions", ["application_id", "status"]),
+    ("ix_interview_sessions_round_id_status", "interview_sessions", ["round_id", "status"]),
+]
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    existing = set()
+    for table in {table for _, table, _ in INDEXES} & tables:
+        existing.update((table, index["name"]) for index in inspector.get_indexes(table))
+    return tables, existing
+
+
+def upgrade():
+    tables, existing = _existing_indexes()
+    for name, table, columns in INDEXES:
+        # MySQL has no CREATE INDEX IF NOT EXISTS, so check the catalog instead
+        if table in tables and (table, name) not in existing:
+            op.create_index(name, table, columns)
+
+
+def _keep_foreign_key_index(table, column, dropping):
+    """InnoDB reuses a new index for a foreign key and drops its own, and then
+    refuses to drop ours - put a plain index back on the FK column first"""
+    inspector = sa.inspect(op.get_bind())
+    is_fk = any(column == fk["constrained_columns"][0] for fk in inspector.get_foreign_keys(table))
+    covered = any(
+        index["name"] != dropping and index["column_names"][0] == column
+        for index in inspector.get_indexes(table)
+    )
+    if is_fk and not covered:
+        op.create_index(f"{table}_{column}_fk", table, [column])
+
+
+def downgrade():
+    tables, existing = _existing_indexes()
+    for name, table, columns in reversed(INDEXES):
+        if (table, name) in existing:
+            if op.get_bind().dialect.name == "mysql":
+                _keep_foreign_key_index(table, columns[0], name)
+            op.drop_index(name, table_name=table)
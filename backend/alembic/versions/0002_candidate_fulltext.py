@@ -0,0 +1,69 @@
+"""Add full-text search indexes for candidates
+
+MySQL gets two FULLTEXT indexes: one over the searched columns (name, email,
+designation, qualification, resume text) for the search box and one over
+experience_details for the skills filter. SQLite gets an external-content
+FTS5 table, candidates_fts, kept current by triggers, and is filled from the
+existing rows. Other databases are left alone; search falls back to
+substring matching there.
+
+The DDL is the Candidate model's (sqlite_fts_ddl), which is also attached to
+the table, so databases built with Base.metadata.create_all() already have it
+and are skipped.
+
+Revision ID: 0002_candidate_fulltext
+Revises: 0001_hot_filter_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.candidate import CANDIDATE_SEARCH_COLUMNS, sqlite_fts_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = "0002_candidate_fulltext"
+down_revision = "0001_hot_filter_indexes"
+branch_labels = None
+depends_on = None
+
+
+FULLTEXT_INDEXES = [
+    ("ft_candidates_search", list(CANDIDATE_SEARCH_COLUMNS)),
+    ("ft_candidates_experience", ["experience_details"]),
+]
+SQLITE_TRIGGERS = ["candidates_fts_ai", "candidates_fts_ad", "candidates_fts_au"]
+
+
+def _existing_indexes():
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("candidates")}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        if "candidates_fts" in sa.inspect(op.get_bind()).get_table_names():
+            return
+        for statement in sqlite_fts_ddl():
+            op.execute(statement)
+        # Index the rows that are already there
+        op.execute("INSERT INTO candidates_fts(candidates_fts) VALUES ('rebuild')")
+    elif dialect in ("mysql", "mariadb"):
+        existing = _existing_indexes()
+        for name, columns in FULLTEXT_INDEXES:
+            if name not in existing:
+                op.create_index(name, "candidates", columns, mysql_prefix="FULLTEXT")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS candidates_fts")
+    elif dialect in ("mysql", "mariadb"):
+        existing = _existing_indexes()
+        for name, _ in reversed(FULLTEXT_INDEXES):
+            if name in existing:
+                op.drop_index(name, table_name="candidates")
@@ -0,0 +1,53 @@
+"""Add the resume_parse_jobs queue table
+
+Resume uploads queue a row here and the resume parse dispatcher
+(app/core/resume_workers.py) claims queued rows, parses them on worker
+processes and stores the parsed fields. Indexed for claiming the oldest
+queued jobs and for finding a dispatcher's claimed rows.
+
+The table is declared on the ResumeParseJob model, so databases built with
+Base.metadata.create_all() already have it and are skipped.
+
+Revision ID: 0003_resume_parse_jobs
+Revises: 0002_candidate_fulltext
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_resume_parse_jobs"
+down_revision = "0002_candidate_fulltext"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "resume_parse_jobs" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "resume_parse_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("candidate_id", sa.Integer(), sa.ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("file_path", sa.String(500), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("claimed_by", sa.String(100), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_resume_parse_jobs_id", "resume_parse_jobs", ["id"])
+    op.create_index("ix_resume_parse_jobs_candidate_id", "resume_parse_jobs", ["candidate_id"])
+    op.create_index("ix_resume_parse_jobs_status_id", "resume_parse_jobs", ["status", "id"])
+    op.create_index("ix_resume_parse_jobs_claimed_by", "resume_parse_jobs", ["claimed_by"])
+
+
+def downgrade():
+    if "resume_parse_jobs" in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table("resume_parse_jobs")
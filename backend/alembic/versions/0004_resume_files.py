@@ -0,0 +1,61 @@
+"""Add the resume_files content-hash cache
+
+One row per distinct resume content (SHA-256): where the file is stored,
+its extracted text and the parse result with the spaCy model that produced
+it. resume_parse_jobs.resume_file_id links a job to the file it parses.
+
+The table and column are declared on the models, so databases built with
+Base.metadata.create_all() already have them and are skipped.
+
+Revision ID: 0004_resume_files
+Revises: 0003_resume_parse_jobs
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_resume_files"
+down_revision = "0003_resume_parse_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if "resume_files" not in inspector.get_table_names():
+        op.create_table(
+            "resume_files",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("sha256", sa.String(64), nullable=False, unique=True),
+            sa.Column("file_path", sa.String(500), nullable=False),
+            sa.Column("size", sa.Integer(), nullable=False),
+            sa.Column("extracted_text", sa.Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=True),
+            sa.Column("parsed", sa.JSON(), nullable=True),
+            sa.Column("parsed_with", sa.String(255), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("parsed_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_resume_files_id", "resume_files", ["id"])
+    columns = {column["name"] for column in inspector.get_columns("resume_parse_jobs")}
+    if "resume_file_id" not in columns:
+        # batch mode: SQLite can't add a foreign key to an existing table
+        with op.batch_alter_table("resume_parse_jobs") as batch:
+            batch.add_column(sa.Column("resume_file_id", sa.Integer(), nullable=True))
+            batch.create_foreign_key(
+                "fk_resume_parse_jobs_resume_file_id", "resume_files", ["resume_file_id"], ["id"]
+            )
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("resume_parse_jobs")}
+    if "resume_file_id" in columns:
+        with op.batch_alter_table("resume_parse_jobs") as batch:
+            batch.drop_constraint("fk_resume_parse_jobs_resume_file_id", type_="foreignkey")
+            batch.drop_column("resume_file_id")
+    if "resume_files" in inspector.get_table_names():
+        op.drop_table("resume_files")
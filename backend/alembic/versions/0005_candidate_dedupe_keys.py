@@ -0,0 +1,97 @@
+"""Add normalized phone/email dedupe keys to candidates
+
+candidates.phone_e164 (the phone number in E.164 form) and
+candidates.email_normalized (lower-cased, trimmed email), each with a unique
+index, so imports can match a person with an index lookup instead of
+scanning phone/email.
+
+Existing rows are backfilled in batches with the same normalization the model
+uses. Where several candidates already share a phone number or email, only
+the oldest (lowest id) gets the key; the others keep NULL, stay as they are,
+and can be merged by hand.
+
+The columns and indexes are declared on the model, so databases built with
+Base.metadata.create_all() already have them and are skipped.
+
+Revision ID: 0005_candidate_dedupe_keys
+Revises: 0004_resume_files
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.candidate import normalize_email, normalize_phone
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_candidate_dedupe_keys"
+down_revision = "0004_resume_files"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+candidates = sa.table(
+    "candidates",
+    sa.column("id", sa.Integer),
+    sa.column("phone", sa.String),
+    sa.column("email", sa.String),
+    sa.column("phone_e164", sa.String),
+    sa.column("email_normalized", sa.String),
+)
+
+
+def backfill(bind):
+    seen_phones, seen_emails = set(), set()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(candidates.c.id, candidates.c.phone, candidates.c.email)
+            .where(candidates.c.id > last_id).order_by(candidates.c.id).limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        params = []
+        for row in rows:
+            phone, email = normalize_phone(row.phone), normalize_email(row.email)
+            phone = None if phone in seen_phones else phone
+            email = None if email in seen_emails else email
+            seen_phones.add(phone)
+            seen_emails.add(email)
+            if phone or email:
+                params.append({"row_id": row.id, "key_phone": phone, "key_email": email})
+        if params:
+            bind.execute(
+                candidates.update().where(candidates.c.id == sa.bindparam("row_id"))
+                .values(phone_e164=sa.bindparam("key_phone"), email_normalized=sa.bindparam("key_email")),
+                params,
+            )
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("candidates")}
+    if "phone_e164" in columns and "email_normalized" in columns:
+        return
+    if "phone_e164" not in columns:
+        op.add_column("candidates", sa.Column("phone_e164", sa.String(20), nullable=True))
+    if "email_normalized" not in columns:
+        op.add_column("candidates", sa.Column("email_normalized", sa.String(255), nullable=True))
+    backfill(bind)
+    op.create_index("ux_candidates_phone_e164", "candidates", ["phone_e164"], unique=True)
+    op.create_index("ux_candidates_email_normalized", "candidates", ["email_normalized"], unique=True)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    indexes = {index["name"] for index in inspector.get_indexes("candidates")}
+    columns = {column["name"] for column in inspector.get_columns("candidates")}
+    for name in ("ux_candidates_phone_e164", "ux_candidates_email_normalized"):
+        if name in indexes:
+            op.drop_index(name, table_name="candidates")
+    for column in ("phone_e164", "email_normalized"):
+        if column in columns:
+            op.drop_column("candidates", column)
@@ -0,0 +1,73 @@
+"""Turn whatsapp_communications into the outbound message queue
+
+Adds the columns the WhatsApp dispatcher works with (attempts, claimed_by,
+next_attempt_at, provider_message_id, error), an index on (status, id) for
+claiming the oldest queued messages, and one on provider_message_id for
+delivery receipts. `status` becomes VARCHAR(50), as on the model: the MySQL
+ENUM from db/schema.sql has no 'Queued' or 'Sending'. Existing messages keep
+their status.
+
+The columns and indexes are declared on the model, so databases built with
+Base.metadata.create_all() already have them and are skipped.
+
+Revision ID: 0006_whatsapp_outbox
+Revises: 0005_candidate_dedupe_keys
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_whatsapp_outbox"
+down_revision = "0005_candidate_dedupe_keys"
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = (
+    sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+    sa.Column("claimed_by", sa.String(100), nullable=True),
+    sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+    sa.Column("provider_message_id", sa.String(100), nullable=True),
+    sa.Column("error", sa.Text(), nullable=True),
+)
+
+INDEXES = {
+    "ix_whatsapp_communications_status_id": ["status", "id"],
+    "ix_whatsapp_communications_provider_message_id": ["provider_message_id"],
+}
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("whatsapp_communications")}
+    for column in NEW_COLUMNS:
+        if column.name not in columns:
+            op.add_column("whatsapp_communications", column._copy())
+    status = next(column for column in inspector.get_columns("whatsapp_communications") if column["name"] == "status")
+    if isinstance(status["type"], sa.Enum):
+        op.alter_column(
+            "whatsapp_communications", "status", existing_type=status["type"], type_=sa.String(50),
+            existing_nullable=status["nullable"],
+            existing_server_default=sa.text(status["default"]) if status.get("default") else None,
+        )
+    indexes = {index["name"] for index in inspector.get_indexes("whatsapp_communications")}
+    for name, index_columns in INDEXES.items():
+        if name not in indexes:
+            op.create_index(name, "whatsapp_communications", index_columns)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    # Unsent messages go back to Pending; status stays VARCHAR(50), which
+    # holds every value the old ENUM did
+    op.execute("UPDATE whatsapp_communications SET status = 'Pending' WHERE status IN ('Queued', 'Sending')")
+    indexes = {index["name"] for index in inspector.get_indexes("whatsapp_communications")}
+    for name in INDEXES:
+        if name in indexes:
+            op.drop_index(name, table_name="whatsapp_communications")
+    columns = {column["name"] for column in inspector.get_columns("whatsapp_communications")}
+    for column in NEW_COLUMNS:
+        if column.name in columns:
+            op.drop_column("whatsapp_communications", column.name)
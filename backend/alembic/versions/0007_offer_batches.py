@@ -0,0 +1,54 @@
+"""Add the offer_batches table for bulk offer issues
+
+A bulk issue queues its shortlisted candidates here. An offer batch runner
+(app/routers/offer_batch_utils.py) claims the batch (status, claimed_by,
+attempts; the index on (status, id) finds the oldest queued batch and stale
+running ones), updates its progress while the PDFs render, then records the
+offers it created or the errors.
+
+The table is declared on the OfferBatch model, so databases built with
+Base.metadata.create_all() already have it and are skipped.
+
+Revision ID: 0007_offer_batches
+Revises: 0006_whatsapp_outbox
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_offer_batches"
+down_revision = "0006_whatsapp_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if "offer_batches" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "offer_batches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("claimed_by", sa.String(100), nullable=True),
+        sa.Column("candidate_ids", sa.JSON(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("rendered", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_offer_batches_id", "offer_batches", ["id"])
+    op.create_index("ix_offer_batches_status_id", "offer_batches", ["status", "id"])
+
+
+def downgrade():
+    if "offer_batches" in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table("offer_batches")
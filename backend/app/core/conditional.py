@@ -0,0 +1,100 @@
+"""Conditional GET: ETag / Last-Modified validators and 304 responses
+
+A row's version is its last modification time, `coalesce(updated_at,
+created_at)`. Detail routes answer a request carrying If-None-Match or
+If-Modified-Since with a query of just the version (and the columns the
+access check needs) and send 304 when it matches, before loading or
+serializing the row. Every 200 carries the validators, with
+`Cache-Control: private, no-cache` so browsers keep the body and revalidate.
+
+List pages get a collection ETag from the count, id sum and newest version
+of the rows on the page. A conditional request reads them with an aggregate
+over the same (paged) query; a 200 takes them from the rows it loaded.
+
+Versions come from timestamps, so two changes to a row within the column's
+resolution (a second on MySQL DATETIME) share a version.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+
+CACHE_CONTROL = "private, no-cache"
+# Columns a row's version is read from; list routes load them under ?fields= too
+VERSION_FIELDS = ("updated_at", "created_at")
+
+
+def version_column(model, created: str = "created_at"):
+    """SQL expression of a row's version"""
+    return func.coalesce(model.updated_at, getattr(model, created))
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def _utc(value: datetime) -> datetime:
+    # Naive datetimes from the database are UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def _opaque(tag: str) -> str:
+    # Weak comparison, as GET revalidation uses
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def matches(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Whether the request's validators still hold; If-None-Match wins over If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {_opaque(tag) for tag in if_none_match.split(",")}
+        return "*" in tags or _opaque(etag) in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole seconds
+        return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+    return False
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def page_version_query(paged_query, model):
+    """count, sum of ids and newest version of the rows a paged select returns"""
+    page = paged_query.with_only_columns(model.id, version_column(model).label("version")).subquery()
+    return select(func.count(), func.sum(page.c.id), func.max(page.c.version))
+
+
+def page_versions(rows, created: str = "created_at"):
+    """What page_version_query reads, from the loaded rows of the same paged select"""
+    versions = [row.updated_at or getattr(row, created) for row in rows]
+    return len(rows), sum(row.id for row in rows), max((v for v in versions if v is not None), default=None)
+
+
+def collection_etag(request: Request, count, id_sum, latest, *extra) -> str:
+    """ETag of a list page; the query string is part of it, as it picks the page and fields"""
+    return make_etag(request.url.path, str(request.url.query), count, int(id_sum or 0), latest, *extra)
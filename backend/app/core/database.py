@@ -1,7 +1,40 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL
+from app.core.config import (
+    DATABASE_URL, ASYNC_DATABASE_URL,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+    READ_REPLICA_URL, READ_REPLICA_MAX_LAG_SECONDS, READ_REPLICA_CHECK_INTERVAL_SECONDS,
+)
+from app.core.pool_metrics import (
+    InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool, instrument_engine,
+)
+from app.core.replica import ReplicaRouter, make_read_only
+from app.core.request_metrics import track_queries
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync DB-API driver in a URL for its asyncio counterpart"""
+    if url.startswith("sqlite+aiosqlite") or url.startswith("mysql+aiomysql"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("mysql"):
+        return "mysql+aiomysql" + url[url.index(":"):]
+    if url.startswith("postgresql"):
+        return "postgresql+asyncpg" + url[url.index(":"):]
+    return url
+
+
+# Shared pool settings for the MySQL/PostgreSQL engines
+POOL_OPTIONS = dict(
+    pool_pre_ping=DB_POOL_PRE_PING,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+)
 
 # Create database engine
 if DATABASE_URL.startswith("sqlite"):
@@ -14,12 +47,62 @@ else:
     # MySQL/PostgreSQL configuration
     engine = create_engine(
         DATABASE_URL,
-        pool_pre_ping=True,
-        pool_recycle=300
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="primary",
+        **POOL_OPTIONS
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def create_instrumented_async_engine(url: str, name: str):
+    if url.startswith("sqlite"):
+        async_db_engine = create_async_engine(url)
+    else:
+        async_db_engine = create_async_engine(
+            url,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            pool_logging_name=name,
+            **POOL_OPTIONS
+        )
+    instrument_engine(async_db_engine.sync_engine, name)
+    track_queries(async_db_engine.sync_engine)
+    return async_db_engine
+
+
+# Async engine used by the `async def` routes so queries don't block the event loop
+async_database_url = ASYNC_DATABASE_URL or to_async_url(DATABASE_URL)
+async_engine = create_instrumented_async_engine(async_database_url, "primary_async")
+
+instrument_engine(engine, "primary")
+track_queries(engine)
+
+# Read-only replica engine; None when no replica is configured
+read_async_engine = None
+replica_router = None
+if READ_REPLICA_URL:
+    read_async_engine = create_instrumented_async_engine(to_async_url(READ_REPLICA_URL), "replica_async")
+    make_read_only(read_async_engine)
+    replica_router = ReplicaRouter(
+        read_async_engine,
+        max_lag=READ_REPLICA_MAX_LAG_SECONDS,
+        check_interval=READ_REPLICA_CHECK_INTERVAL_SECONDS,
+    )
+
+# expire_on_commit=False: attributes can't be lazily re-loaded outside of an
+# awaited call, so objects must stay usable after commit for serialization
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+ReadSessionLocal = async_sessionmaker(
+    bind=read_async_engine or async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -27,4 +110,16 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db():
+    """AsyncSession for read-only routes: the replica when it is fresh enough, else the primary"""
+    session_factory = AsyncSessionLocal
+    if replica_router is not None and await replica_router.use_replica():
+        session_factory = ReadSessionLocal
+    async with session_factory() as db:
+        yield db
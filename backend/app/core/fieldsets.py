@@ -0,0 +1,59 @@
+"""Sparse fieldsets for list endpoints
+
+`?fields=id,first_name,status` asks for just those fields of each row. The
+request is turned into `load_only()` on the ORM query, so the other columns
+(often large Text fields) are neither selected nor hydrated, relationships
+that weren't asked for aren't loaded, and the rows are serialized through a
+schema that has only the requested fields. `id` is always included; it is the
+pagination key.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from pydantic import ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (default: all)"
+
+
+def parse_fields(fields: Optional[str], schema) -> Optional[Tuple[str, ...]]:
+    """The requested field names of `schema`, in schema order; None for all fields"""
+    if not fields:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - set(schema.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    names.add("id")
+    return tuple(name for name in schema.model_fields if name in names)
+
+
+def load_options(model, names: Optional[Tuple[str, ...]], relationship_loads: Dict,
+                 always: Sequence[str] = ()) -> list:
+    """Loader options for the requested fields: load_only() of their columns and
+    the eager loads (from `relationship_loads`) of their relationships
+
+    Columns in `always` are loaded too (the route reads them, e.g. for an
+    ETag) but not returned. Columns left out raise on access instead of
+    lazy-loading one row at a time.
+    """
+    if names is None:
+        return list(relationship_loads.values())
+    columns = inspect(model).column_attrs
+    loaded = dict.fromkeys(name for name in (*names, *always) if name in columns)
+    options = [load_only(*(getattr(model, name) for name in loaded), raiseload=True)]
+    return options + [relationship_loads[name] for name in names if name in relationship_loads]
+
+
+@lru_cache(maxsize=256)
+def _sparse_schema(schema, names: Tuple[str, ...]):
+    fields = {name: (field.annotation, field) for name, field in schema.model_fields.items() if name in names}
+    return create_model(f"{schema.__name__}Fields", __config__=ConfigDict(from_attributes=True), **fields)
+
+
+def sparse_schema(schema, names: Optional[Tuple[str, ...]]):
+    """`schema` cut down to the requested fields (itself when all are wanted)"""
+    return schema if names is None else _sparse_schema(schema, names)
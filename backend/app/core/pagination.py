@@ -0,0 +1,76 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import DateTime, tuple_
+
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the sort key")
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class CursorPage:
+    """Keyset pagination for list endpoints
+
+    Rows are returned newest first, ordered by the key columns (normally just the
+    primary key, or `created_at, id`). The cursor encodes the key of the last row
+    on a page, so the next page is a `WHERE key < cursor` index range scan rather
+    than an OFFSET that grows with the page number. The cursor for the next page
+    is sent in the X-Next-Cursor response header; it is absent on the last page.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description=f"Page size (at most {MAX_PAGE_SIZE})"),
+    ):
+        self.cursor = cursor
+        self.limit = min(limit, MAX_PAGE_SIZE)
+        self.columns = ()
+
+    def apply(self, query, *columns):
+        """Restrict a select()/Query to this page; fetches one extra row to detect a next page"""
+        self.columns = columns
+        if self.cursor:
+            values = decode_cursor(self.cursor, columns)
+            if len(columns) == 1:
+                query = query.where(columns[0] < values[0])
+            else:
+                query = query.where(tuple_(*columns) < tuple_(*values))
+        return query.order_by(*(column.desc() for column in columns)).limit(self.limit + 1)
+
+    def finish(self, rows, response: Response, key=None) -> list:
+        """Trim the look-ahead row and set X-Next-Cursor when there is another page
+
+        `key(row)` returns the key column values of a row; by default they are
+        read as attributes named after the columns.
+        """
+        rows = list(rows)
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            values = key(last) if key else [getattr(last, column.key) for column in self.columns]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(values)
+        return rows
@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import List, Optional
+
+from passlib.context import CryptContext
+
+from app.core.config import PASSWORD_HASH_CONCURRENCY, PASSWORD_HASH_PROCESSES
+
+# Kept free of app/database imports: this module is what the bulk-hashing
+# worker processes import
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt releases the GIL, so a small thread pool gives real parallelism while
+# capping how many ~250ms hashes a login burst can run at once
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_CONCURRENCY,
+    thread_name_prefix="bcrypt",
+)
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Below this many passwords, process start-up costs more than it saves
+BULK_PROCESS_THRESHOLD = 8
+
+
+def verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password):
+    return pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    """verify_password on the bounded bcrypt executor instead of the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
+def hash_password_bounded(password) -> str:
+    """get_password_hash on the bounded bcrypt executor, for sync routes: the
+    calling threadpool thread waits while the hash counts against the cap"""
+    return _password_executor.submit(get_password_hash, password).result()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn: by now the API process has threads and open DB connections
+        _process_pool = ProcessPoolExecutor(
+            max_workers=_process_count(), mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+def _process_count() -> int:
+    return PASSWORD_HASH_PROCESSES or os.cpu_count() or 1
+
+
+def hash_passwords_bulk(passwords: List[str]) -> List[str]:
+    """Hash many passwords in parallel on a process pool, preserving order"""
+    if len(passwords) < BULK_PROCESS_THRESHOLD:
+        return list(_password_executor.map(get_password_hash, passwords))
+    pool = _get_process_pool()
+    chunksize = max(1, len(passwords) // (_process_count() * 4))
+    return list(pool.map(get_password_hash, passwords, chunksize=chunksize))
+
+
+def shutdown_password_executors():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
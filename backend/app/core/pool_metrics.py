@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Number of recent checkout latencies kept per pool for the percentiles
+LATENCY_SAMPLES = 2048
+
+
+class PoolMetrics:
+    """Counters and checkout latencies for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkins = 0
+        self.connections_opened = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record_checkout_latency(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def latency_percentiles(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return {"samples": 0, "p50_ms": None, "p99_ms": None, "max_ms": None}
+
+        def pct(p):
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))] * 1000, 3)
+
+        return {
+            "samples": len(samples),
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "max_ms": round(samples[-1] * 1000, 3),
+        }
+
+    def snapshot(self, pool) -> dict:
+        # size()/overflow() only exist on the queue-based pools
+        sized = isinstance(pool, QueuePool)
+        return {
+            "pool": type(pool).__name__,
+            "size": pool.size() if sized else None,
+            "checked_out": pool.checkedout() if sized else None,
+            "idle": pool.checkedin() if sized else None,
+            "overflow": max(pool.overflow(), 0) if sized else None,
+            "checkouts_total": self.checkouts,
+            "checkins_total": self.checkins,
+            "connections_opened": self.connections_opened,
+            "invalidations": self.invalidations,
+            "checkout_timeouts": self.timeouts,
+            "checkout_latency": self.latency_percentiles(),
+        }
+
+
+_registry: Dict[str, PoolMetrics] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    if name not in _registry:
+        _registry[name] = PoolMetrics(name)
+    return _registry[name]
+
+
+class _TimedCheckoutMixin:
+    """Measures how long Pool.connect() waits for a connection (incl. pre-ping)"""
+
+    def connect(self):
+        metrics = get_pool_metrics(self.logging_name or "default")
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        metrics.record_checkout_latency(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Attach pool event listeners that feed the PoolMetrics registered under `name`
+
+    For an AsyncEngine pass `async_engine.sync_engine`.
+    """
+    metrics = get_pool_metrics(name)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connections_opened += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    return metrics
+
+
+def engine_pool_status(engine: Engine, name: str) -> dict:
+    return get_pool_metrics(name).snapshot(engine.pool)
@@ -0,0 +1,86 @@
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+def make_read_only(async_engine: AsyncEngine):
+    """Reject writes on every connection the replica engine opens"""
+    dialect = async_engine.dialect.name
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_read_only(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if dialect == "sqlite":
+            cursor.execute("PRAGMA query_only = ON")
+        elif dialect == "mysql":
+            cursor.execute("SET SESSION TRANSACTION READ ONLY")
+        cursor.close()
+
+
+class ReplicaRouter:
+    """Decides whether reads may go to the replica, based on replication lag
+
+    Lag is sampled at most every `check_interval` seconds. If the replica is
+    further behind than `max_lag` seconds, unreachable, or replication is
+    stopped, reads fall back to the primary until the next successful check.
+    """
+
+    def __init__(self, replica_engine: AsyncEngine, max_lag: float, check_interval: float):
+        self.engine = replica_engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None
+        self.healthy = False
+        self.checked_at = 0.0
+        self.last_error: Optional[str] = None
+
+    async def use_replica(self) -> bool:
+        now = time.monotonic()
+        if now - self.checked_at >= self.check_interval:
+            # Claim the check before awaiting so concurrent requests don't stampede it
+            self.checked_at = now
+            await self.refresh()
+        return self.healthy
+
+    async def refresh(self):
+        try:
+            async with self.engine.connect() as conn:
+                self.lag = await self._measure_lag(conn)
+            self.last_error = None
+        except Exception as e:
+            logger.warning("Read replica check failed, routing reads to primary: %s", e)
+            self.lag = None
+            self.last_error = str(e)
+        self.healthy = self.lag is not None and self.lag <= self.max_lag
+
+    async def _measure_lag(self, conn) -> Optional[float]:
+        if conn.dialect.name != "mysql":
+            # e.g. a second SQLite file in local testing - nothing replicates
+            return 0.0
+        try:
+            result = await conn.execute(text("SHOW REPLICA STATUS"))
+            lag_column = "Seconds_Behind_Source"
+        except Exception:
+            # MySQL < 8.0.22
+            result = await conn.execute(text("SHOW SLAVE STATUS"))
+            lag_column = "Seconds_Behind_Master"
+        row = result.mappings().first()
+        if row is None:
+            # Not configured as a replica (e.g. a second schema used for testing)
+            return 0.0
+        lag = row.get(lag_column)
+        # NULL means the replication threads are stopped - treat as unusable
+        return float(lag) if lag is not None else None
+
+    def status(self) -> dict:
+        return {
+            "using_replica": self.healthy,
+            "lag_seconds": self.lag,
+            "max_lag_seconds": self.max_lag,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,203 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.pool_metrics import get_pool_metrics
+
+# Prometheus' default latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL statements per request - the upper buckets are where N+1 queries show up
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# Label used for requests that didn't match any route (404s, bad paths), so
+# arbitrary URLs can't blow up the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+        yield "+Inf", self.count
+
+
+class RouteMetrics:
+    """Latency, SQL statement count and DB time for one (method, route template)"""
+
+    def __init__(self):
+        self.responses: Dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = 0.0
+
+
+class QueryStats:
+    """SQL executed while handling the current request"""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, route: str, status_code: int, seconds: float, stats: QueryStats):
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            metrics.responses[status_code] = metrics.responses.get(status_code, 0) + 1
+            metrics.latency.observe(seconds)
+            metrics.statements.observe(stats.statements)
+            metrics.db_seconds += stats.db_seconds
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def render(self, pool_engines: Dict[str, Engine] = None) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            routes = sorted(self._routes.items())
+
+            lines += [
+                "# HELP hrms_http_requests_total Requests handled, by route template and status code.",
+                "# TYPE hrms_http_requests_total counter",
+            ]
+            for (method, route), metrics in routes:
+                for status_code, count in sorted(metrics.responses.items()):
+                    labels = _labels(method=method, route=route, status=status_code)
+                    lines.append(f"hrms_http_requests_total{labels} {count}")
+
+            _render_histogram(
+                lines, routes, "hrms_http_request_duration_seconds", "latency",
+                "Request latency by route template.",
+            )
+            _render_histogram(
+                lines, routes, "hrms_db_statements_per_request", "statements",
+                "SQL statements executed per request, by route template.",
+            )
+
+            lines += [
+                "# HELP hrms_db_time_seconds_total Time spent executing SQL, by route template.",
+                "# TYPE hrms_db_time_seconds_total counter",
+            ]
+            for (method, route), metrics in routes:
+                labels = _labels(method=method, route=route)
+                lines.append(f"hrms_db_time_seconds_total{labels} {metrics.db_seconds:.6f}")
+
+        if pool_engines:
+            _render_pools(lines, pool_engines)
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _render_histogram(lines, routes, name, attribute, help_text):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), metrics in routes:
+        histogram = getattr(metrics, attribute)
+        for bound, count in histogram.cumulative():
+            labels = _labels(method=method, route=route, le=bound)
+            lines.append(f"{name}_bucket{labels} {count}")
+        labels = _labels(method=method, route=route)
+        lines.append(f"{name}_sum{labels} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{labels} {histogram.count}")
+
+
+def _render_pools(lines, pool_engines):
+    snapshots = {
+        name: get_pool_metrics(name).snapshot(engine.pool) for name, engine in pool_engines.items()
+    }
+    gauges = [
+        ("hrms_db_pool_checked_out", "checked_out", "gauge", "Connections currently checked out."),
+        ("hrms_db_pool_idle", "idle", "gauge", "Idle connections in the pool."),
+        ("hrms_db_pool_checkouts_total", "checkouts_total", "counter", "Connection checkouts."),
+        ("hrms_db_pool_checkout_timeouts_total", "checkout_timeouts", "counter", "Checkouts that timed out waiting for a connection."),
+    ]
+    for name, key, kind, help_text in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for pool, snapshot in snapshots.items():
+            # size-based values are None for SQLite's NullPool/SingletonThreadPool
+            if snapshot[key] is not None:
+                lines.append(f"{name}{_labels(pool=pool)} {snapshot[key]}")
+
+
+def start_request():
+    """Begin collecting SQL stats for the current request; returns (stats, token)"""
+    stats = QueryStats()
+    return stats, _current_query_stats.set(stats)
+
+
+def finish_request(token):
+    _current_query_stats.reset(token)
+
+
+def track_queries(engine: Engine):
+    """Count statements and DB time against the request being handled
+
+    Sync routes run in a threadpool and async sessions in greenlets; both copy
+    the request's context, so the QueryStats set by the middleware is visible.
+    For an AsyncEngine pass `async_engine.sync_engine`.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _record_statement(conn)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        if exception_context.connection is not None:
+            _record_statement(exception_context.connection)
+
+
+def _record_statement(conn):
+    started = conn.info.get("query_start_time")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
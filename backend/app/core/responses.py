@@ -0,0 +1,26 @@
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def json_list_response(schema, rows, response: Optional[Response] = None) -> Response:
+    """Serialize ORM rows for a list endpoint in a single pass
+
+    Returning ORM objects makes FastAPI validate them against response_model,
+    dump that to Python dicts, and then JSON-encode the dicts. Here each row is
+    validated into `schema` once and pydantic writes the JSON bytes directly.
+    Keep `response_model` on the route for the OpenAPI docs; FastAPI skips it
+    for a returned Response. Headers set on the injected `response` (e.g.
+    X-Next-Cursor) are carried over.
+    """
+    adapter = _list_adapter(schema)
+    content = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -0,0 +1,197 @@
+"""Resume parse dispatcher: feeds queued resume_parse_jobs rows to parser processes
+
+Each API worker runs one dispatcher thread (see main.py) unless
+RESUME_PARSE_WORKERS is 0, in which case run it as its own service:
+
+    python -m app.core.resume_workers
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import RESUME_PARSE_POLL_SECONDS, RESUME_PARSE_WORKERS
+from app.core.database import SessionLocal
+from app.routers.resume_queue_utils import claim_jobs, complete_job, fail_job, release_jobs, requeue_stale_jobs
+from app.routers.resume_utils import parse_resume_file
+
+logger = logging.getLogger(__name__)
+
+# Stale running jobs are looked for once per this many polls
+STALE_CHECK_EVERY = 30
+
+
+def _parser_pool(workers: int) -> Executor:
+    # spawn, not fork: the parent has live DB connections and threads, and each
+    # parser loads spaCy once and keeps it for the jobs that follow
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+class ResumeParseDispatcher:
+    """Claims queued jobs while a parser process is free and writes back results
+
+    The job table is the queue, so any number of dispatchers (one per API
+    worker, or standalone) can share it.
+    """
+
+    def __init__(self, workers: int = RESUME_PARSE_WORKERS,
+                 session_factory: Callable[[], Session] = SessionLocal,
+                 parse: Callable[[str, Optional[str]], Tuple[str, Dict]] = parse_resume_file,
+                 executor_factory: Callable[[int], Executor] = _parser_pool,
+                 poll_seconds: float = RESUME_PARSE_POLL_SECONDS):
+        self.workers = max(1, workers)
+        self.session_factory = session_factory
+        self.parse = parse
+        self.executor_factory = executor_factory
+        self.poll_seconds = poll_seconds
+        self._in_flight: Dict[Future, int] = {}
+        self._token_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tokens: Dict[int, str] = {}
+        self._executor: Optional[Executor] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="resume-parse-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Look for new jobs now rather than at the next poll"""
+        self._wake.set()
+
+    def run(self):
+        self._executor = self.executor_factory(self.workers)
+        polls = 0
+        try:
+            while not self._stop.is_set():
+                if polls % STALE_CHECK_EVERY == 0:
+                    self._safely(requeue_stale_jobs)
+                polls += 1
+                self._wake.clear()
+                self._collect()
+                self._dispatch()
+                self._wake.wait(self.poll_seconds)
+        finally:
+            self._shutdown()
+
+    def _safely(self, operation, *args):
+        # A database hiccup mustn't kill the thread: the operation's result, or
+        # None after logging the error; the next poll tries again
+        try:
+            with self.session_factory() as db:
+                return operation(db, *args)
+        except Exception:
+            logger.exception("Resume parse queue: %s failed", operation.__name__)
+            return None
+
+    def _dispatch(self):
+        free = self.workers - len(self._in_flight)
+        if free <= 0:
+            return
+        token = f"{self._token_prefix}:{uuid.uuid4().hex[:12]}"
+        for job in self._safely(claim_jobs, free, token) or []:
+            if job.parsed is not None:
+                # The same file content was parsed since this job was queued
+                self._safely(complete_job, job.id, token, job.parsed)
+                continue
+            self._tokens[job.id] = token
+            future = self._executor.submit(self.parse, job.file_path, job.text)
+            self._in_flight[future] = job.id
+            future.add_done_callback(lambda _: self._wake.set())
+
+    def _collect(self):
+        broken = False
+        for future in [future for future in self._in_flight if future.done()]:
+            job_id = self._in_flight.pop(future)
+            token = self._tokens.pop(job_id)
+            try:
+                text, parsed = future.result()
+            except BrokenProcessPool:
+                # A parser process died (out of memory, segfault in a PDF library)
+                logger.error("Resume parser process died on job %s", job_id)
+                self._safely(fail_job, job_id, token, "Parser process crashed", True)
+                broken = True
+                continue
+            except Exception as e:
+                logger.warning("Resume parse job %s failed: %s", job_id, e)
+                self._safely(fail_job, job_id, token, f"{type(e).__name__}: {e}")
+                continue
+            if not parsed:
+                self._safely(fail_job, job_id, token, "Resume file not found")
+            else:
+                self._safely(complete_job, job_id, token, parsed, text)
+        if broken:
+            # Every job in flight fails with the pool, so this runs once
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self.executor_factory(self.workers)
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        by_token: Dict[str, list] = {}
+        for job_id in self._in_flight.values():
+            by_token.setdefault(self._tokens.pop(job_id), []).append(job_id)
+        self._in_flight.clear()
+        for token, job_ids in by_token.items():
+            self._safely(release_jobs, job_ids, token)
+
+
+_dispatcher: Optional[ResumeParseDispatcher] = None
+
+
+def start_resume_dispatcher() -> Optional[ResumeParseDispatcher]:
+    global _dispatcher
+    if RESUME_PARSE_WORKERS <= 0 or _dispatcher is not None:
+        return _dispatcher
+    _dispatcher = ResumeParseDispatcher()
+    _dispatcher.start()
+    return _dispatcher
+
+
+def stop_resume_dispatcher():
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.stop()
+        _dispatcher = None
+
+
+def notify_resume_queued():
+    """Called after an upload commits its job so this worker's dispatcher picks
+    it up straight away; other dispatchers see it on their next poll"""
+    if _dispatcher is not None:
+        _dispatcher.wake()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    dispatcher = ResumeParseDispatcher(workers=RESUME_PARSE_WORKERS or os.cpu_count() or 1)
+    signal.signal(signal.SIGTERM, lambda *_: dispatcher.stop(timeout=None))
+    logger.info("Resume parse dispatcher running with %d parser processes", dispatcher.workers)
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,34 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.config import (
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
+    USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE,
+)
+from app.core.cache import TTLCache
+from app.core.passwords import (
+    pwd_context, verify_password, get_password_hash,
+    verify_password_async, get_password_hash_async, hash_password_bounded, hash_passwords_bulk,
+)
 from app.core.database import get_db
 from app.models.user import User
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 security = HTTPBearer()
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# Detached User rows keyed by token subject (email)
+user_cache = TTLCache(
+    maxsize=USER_CACHE_MAX_SIZE if USER_CACHE_TTL_SECONDS > 0 else 0,
+    ttl=USER_CACHE_TTL_SECONDS,
+)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+def invalidate_cached_user(*emails: Optional[str]):
+    """Drop cached principals, e.g. after a user is updated or deleted"""
+    for email in emails:
+        if email:
+            user_cache.pop(email)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -61,9 +72,16 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
+    user = user_cache.get(username)
+    if user is not None:
+        return user
+
     # Get user from database
     user = db.query(User).filter(User.email == username).first()
     if user is None:
         raise credentials_exception
-    
+
+    # Detach so a commit later in this request can't expire the cached attributes
+    db.expunge(user)
+    user_cache.set(username, user)
     return user 
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""Streaming multipart uploads
+
+Starlette's form parser spools every file of a request to a temporary file
+before the endpoint runs, so limits can only be checked once the whole body
+has arrived. `receive_uploads` parses the request stream itself instead:
+
+* a Content-Length above the policy's cap is refused before reading the body
+* a file of the wrong type is refused at its part headers (extension) or its
+  first bytes (file signature), an oversized one as soon as it passes its
+  limit - the client stops sending, and nothing more is written
+* chunks are written to disk and hashed (SHA-256) together in a worker
+  thread, about UPLOAD_FLUSH_BYTES at a time, so the event loop only parses
+
+Rejections are HTTPExceptions (400, 413, 415); every temporary file of the
+request is removed when one is raised.
+"""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import (
+    CANDIDATE_IMPORT_MAX_BYTES, RESUME_BULK_MAX_FILES, RESUME_MAX_FILE_BYTES, RESUME_ZIP_MAX_BYTES,
+    UPLOAD_TMP_DIR,
+)
+
+# Bytes buffered per file before a write+hash is handed to the threadpool
+UPLOAD_FLUSH_BYTES = 1024 * 1024
+# Multipart boundaries and part headers on top of the files themselves
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+# Plain (non-file) form fields are read into memory, so they stay small
+MAX_FIELD_BYTES = 64 * 1024
+
+# Leading bytes every file of a type starts with; .docx, .xlsx and .zip are all ZIP containers
+FILE_SIGNATURES: Dict[str, Tuple[bytes, ...]] = {
+    ".pdf": (b"%PDF-",),
+    ".docx": (b"PK\x03\x04",),
+    ".xlsx": (b"PK\x03\x04",),
+    ".zip": (b"PK\x03\x04", b"PK\x05\x06"),
+}
+SIGNATURE_BYTES = max(len(signature) for signatures in FILE_SIGNATURES.values() for signature in signatures)
+
+
+@dataclass(frozen=True)
+class UploadPolicy:
+    """What one upload endpoint accepts: the form field, the largest file per
+    extension, and how many files"""
+    field: str
+    limits: Dict[str, int]
+    max_files: int = 1
+
+    @property
+    def max_request_bytes(self) -> int:
+        return self.max_files * max(self.limits.values()) + MULTIPART_OVERHEAD_BYTES
+
+    def describe_types(self) -> str:
+        return ", ".join(sorted(self.limits))
+
+
+RESUME_UPLOAD = UploadPolicy("resume_file", {".pdf": RESUME_MAX_FILE_BYTES, ".docx": RESUME_MAX_FILE_BYTES})
+RESUME_BULK_UPLOAD = UploadPolicy(
+    "files",
+    {".pdf": RESUME_MAX_FILE_BYTES, ".docx": RESUME_MAX_FILE_BYTES, ".zip": RESUME_ZIP_MAX_BYTES},
+    max_files=RESUME_BULK_MAX_FILES,
+)
+CANDIDATE_EXCEL_UPLOAD = UploadPolicy("file", {".xlsx": CANDIDATE_IMPORT_MAX_BYTES})
+
+
+@dataclass
+class StoredUpload:
+    """A received file: written to `path` (a temporary file), with its size and SHA-256"""
+    filename: str
+    extension: str
+    path: str
+    size: int
+    sha256: str
+
+    def discard(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class HashingWriter:
+    """Writes chunks to a new temporary file in `directory` and hashes them on the way"""
+
+    def __init__(self, directory: str, suffix: str = ".part"):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=directory, suffix=suffix)
+        self.file = os.fdopen(fd, "wb")
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self.digest.update(chunk)
+        self.file.write(chunk)
+        self.size += len(chunk)
+
+    def abort(self):
+        self.file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def finish(self, filename: str, extension: str) -> StoredUpload:
+        self.file.close()
+        return StoredUpload(filename, extension, self.path, self.size, self.digest.hexdigest())
+
+
+def store_file(source: BinaryIO, directory: str, filename: str, max_bytes: int) -> Optional[StoredUpload]:
+    """Copy a file object (e.g. a ZIP member) to a temporary file, hashing it;
+    None, with nothing left behind, when it is larger than max_bytes"""
+    writer = HashingWriter(directory)
+    try:
+        while True:
+            chunk = source.read(UPLOAD_FLUSH_BYTES)
+            if not chunk:
+                break
+            if writer.size + len(chunk) > max_bytes:
+                writer.abort()
+                return None
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.finish(filename, os.path.splitext(filename)[1].lower())
+
+
+def place_by_hash(upload: StoredUpload, directory: str) -> Tuple[str, bool]:
+    """Move a received file to `<directory>/<sha256><extension>`; returns the
+    path and whether it is new. Content already stored there is kept and the
+    upload dropped, so duplicates share one file.
+
+    The temporary file must be on the same filesystem as `directory`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.abspath(os.path.join(directory, upload.sha256 + upload.extension))
+    if os.path.exists(path):
+        upload.discard()
+        return path, False
+    # Atomic: a concurrent upload of the same bytes replaces it with identical content
+    os.replace(upload.path, path)
+    return path, True
+
+
+def upload_openapi(field: str, multiple: bool = False) -> dict:
+    """`openapi_extra` documenting the multipart body of a route using receive_uploads"""
+    file_schema = {"type": "string", "format": "binary"}
+    schema = {"type": "array", "items": file_schema} if multiple else file_schema
+    return {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+        "type": "object", "required": [field], "properties": {field: schema},
+    }}}}}
+
+
+def _too_large(what: str, limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"{what} is larger than {limit // (1024 * 1024)} MB")
+
+
+class _Part:
+    """Receiving state of one multipart part"""
+
+    def __init__(self):
+        self.filename: Optional[str] = None
+        self.extension = ""
+        self.limit = 0
+        self.received = 0
+        self.buffer = bytearray()
+        self.signature_checked = False
+        self.writer: Optional[HashingWriter] = None
+
+
+async def receive_uploads(request: Request, policy: UploadPolicy,
+                          directory: str = UPLOAD_TMP_DIR) -> List[StoredUpload]:
+    """Stream the `policy.field` files of a multipart request to temporary files
+    in `directory`, enforcing the policy while the body arrives
+
+    The caller owns the returned files: move them (place_by_hash) or discard them.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > policy.max_request_bytes:
+        raise _too_large("Upload", policy.max_request_bytes)
+
+    # The parser reports through callbacks; they only record events, which are
+    # then handled (with awaits) after each chunk
+    events: List[Tuple[str, object]] = []
+    header = {"field": b"", "value": b"", "headers": {}}
+
+    def on_part_begin():
+        header["headers"] = {}
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header["value"] += data[start:end]
+
+    def on_header_end():
+        header["headers"][header["field"].lower()] = header["value"]
+        header["field"] = header["value"] = b""
+
+    def on_part_data(data: bytes, start: int, end: int):
+        events.append(("data", data[start:end]))
+
+    callbacks = {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": lambda: events.append(("headers", header["headers"])),
+        "on_part_data": on_part_data,
+        "on_part_end": lambda: events.append(("end", None)),
+    }
+    parser = MultipartParser(boundary, callbacks)
+    stored: List[StoredUpload] = []
+    current: Optional[_Part] = None
+
+    async def flush(state: _Part):
+        if state.buffer and state.writer is not None:
+            chunk, state.buffer = bytes(state.buffer), bytearray()
+            await run_in_threadpool(state.writer.write, chunk)
+
+    def check_signature(state: _Part):
+        state.signature_checked = True
+        if not bytes(state.buffer).startswith(FILE_SIGNATURES.get(state.extension, (b"",))):
+            raise HTTPException(status_code=415, detail=f"{state.filename} is not a valid {state.extension} file")
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            for event, value in events:
+                if event == "headers":
+                    _, params = parse_options_header(value.get(b"content-disposition", b""))
+                    current = _Part()
+                    # Browsers send an empty filename for a file input left empty
+                    if not params.get(b"filename"):
+                        continue
+                    name = params.get(b"name", b"").decode("latin-1")
+                    if name != policy.field:
+                        raise HTTPException(status_code=400, detail=f"Unexpected file field {name!r}; "
+                                                                    f"send files as {policy.field!r}")
+                    if len(stored) >= policy.max_files:
+                        raise HTTPException(status_code=413,
+                                            detail=f"Too many files: at most {policy.max_files} per upload")
+                    current.filename = os.path.basename(params[b"filename"].decode("utf-8", "replace"))
+                    current.extension = os.path.splitext(current.filename)[1].lower()
+                    if current.extension not in policy.limits:
+                        raise HTTPException(status_code=415, detail=f"Unsupported file type "
+                                                                    f"{current.extension or current.filename!r}; "
+                                                                    f"expected {policy.describe_types()}")
+                    current.limit = policy.limits[current.extension]
+                    current.writer = await run_in_threadpool(HashingWriter, directory)
+                elif event == "data":
+                    current.received += len(value)
+                    if current.filename is None:
+                        if current.received > MAX_FIELD_BYTES:
+                            raise _too_large("Form field", MAX_FIELD_BYTES)
+                        continue
+                    if current.received > current.limit:
+                        raise _too_large(current.filename, current.limit)
+                    current.buffer += value
+                    if not current.signature_checked and len(current.buffer) >= SIGNATURE_BYTES:
+                        check_signature(current)
+                    if len(current.buffer) >= UPLOAD_FLUSH_BYTES:
+                        await flush(current)
+                elif event == "end" and current.filename is not None:
+                    if not current.signature_checked:
+                        check_signature(current)
+                    await flush(current)
+                    stored.append(await run_in_threadpool(current.writer.finish, current.filename,
+                                                          current.extension))
+                    current.writer = None
+            events.clear()
+        parser.finalize()
+    except BaseException as e:
+        if current is not None and current.writer is not None:
+            await run_in_threadpool(current.writer.abort)
+        for upload in stored:
+            upload.discard()
+        if isinstance(e, MultipartParseError):
+            raise HTTPException(status_code=400, detail=f"Malformed multipart body: {e}") from e
+        raise
+    if not stored:
+        raise HTTPException(status_code=400, detail=f"No file uploaded in field {policy.field!r}")
+    return stored
@@ -0,0 +1,53 @@
+import importlib
+import logging
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _load_spacy():
+    from app.routers.resume_utils import get_nlp
+    get_nlp()
+
+
+# Heavy dependencies that are otherwise imported on first use
+WARMUP_TARGETS = {
+    "spacy": _load_spacy,
+    "pandas": lambda: importlib.import_module("pandas"),
+    "reportlab": lambda: importlib.import_module("reportlab.pdfgen.canvas"),
+}
+
+
+def warm_up(names: Iterable[str]) -> Dict[str, float]:
+    """Load the named heavy dependencies now; returns seconds taken per name
+
+    Failures are logged rather than raised - a missing spaCy model shouldn't
+    stop a worker that may never parse a resume.
+    """
+    timings = {}
+    for name in names:
+        loader = WARMUP_TARGETS.get(name)
+        if loader is None:
+            logger.warning("Unknown warm-up module %r (expected one of %s)", name, ", ".join(WARMUP_TARGETS))
+            continue
+        start = time.perf_counter()
+        try:
+            loader()
+        except Exception as e:
+            logger.warning("Warm-up of %s failed: %s", name, e)
+            continue
+        timings[name] = time.perf_counter() - start
+        logger.info("Warmed up %s in %.2fs", name, timings[name])
+    return timings
+
+
+def start_warm_up(names: Iterable[str]) -> Optional[threading.Thread]:
+    """Warm up in a background thread so the worker can serve requests meanwhile"""
+    names = list(names)
+    if not names:
+        return None
+    thread = threading.Thread(target=warm_up, args=(names,), name="warm-up", daemon=True)
+    thread.start()
+    return thread
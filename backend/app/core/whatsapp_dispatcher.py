@@ -0,0 +1,289 @@
+"""Outbound WhatsApp dispatcher: sends queued whatsapp_communications rows
+
+Each API worker runs one dispatcher thread (see main.py) unless
+WHATSAPP_DISPATCHER is false, in which case run it as its own service:
+
+    python -m app.core.whatsapp_dispatcher
+
+The thread runs an asyncio loop: it claims up to WHATSAPP_BATCH_SIZE due
+messages, sends them WHATSAPP_SEND_CONCURRENCY at a time through the
+provider, each send waiting for a token from the provider's token bucket,
+and records the whole batch's results in one transaction. Temporary failures
+are queued again with backoff. Send counts and throughput are exported on
+/metrics.
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    WHATSAPP_BATCH_SIZE, WHATSAPP_DISPATCHER, WHATSAPP_POLL_SECONDS, WHATSAPP_PROVIDER, WHATSAPP_SEND_BURST,
+    WHATSAPP_SEND_CONCURRENCY, WHATSAPP_SEND_RATE,
+)
+from app.core.database import SessionLocal
+from app.core.request_metrics import _labels
+from app.core.whatsapp_providers import OutboundMessage, SendResult, WhatsAppProvider, provider_class
+from app.routers.whatsapp_queue_utils import (
+    SendOutcome, claim_messages, finish_messages, release_messages, requeue_stale_messages,
+)
+
+logger = logging.getLogger(__name__)
+
+# Expired claims are looked for once per this many polls
+STALE_CHECK_EVERY = 30
+# Window the send throughput gauge averages over
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+class TokenBucket:
+    """Allows `rate` sends per second on average and bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.clock = clock
+        self.tokens = float(self.capacity)
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # One waiter at a time, so tokens go out in arrival order
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def pause(self, seconds: float):
+        """Send nothing for `seconds` (the provider said it is rate limiting us)"""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class WhatsAppMetrics:
+    """Messages sent, retried and failed per provider, and the recent send rate"""
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._recent: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, counts: Dict[str, int], now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            totals = self.counts.setdefault(provider, {"sent": 0, "retried": 0, "failed": 0})
+            for result, count in counts.items():
+                totals[result] += count
+            self._recent.setdefault(provider, deque()).append((now, counts.get("sent", 0)))
+
+    def throughput(self, provider: str, now: Optional[float] = None) -> float:
+        """Messages sent per second over the last THROUGHPUT_WINDOW_SECONDS"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            recent = self._recent.get(provider, deque())
+            while recent and recent[0][0] < now - THROUGHPUT_WINDOW_SECONDS:
+                recent.popleft()
+            return sum(count for _, count in recent) / THROUGHPUT_WINDOW_SECONDS
+
+    def render(self) -> str:
+        """Prometheus text exposition format, appended to the request metrics"""
+        with self._lock:
+            providers = sorted(self.counts.items())
+        lines = [
+            "# HELP hrms_whatsapp_messages_total WhatsApp send attempts, by provider and result.",
+            "# TYPE hrms_whatsapp_messages_total counter",
+        ]
+        for provider, counts in providers:
+            for result, count in sorted(counts.items()):
+                lines.append(f"hrms_whatsapp_messages_total{_labels(provider=provider, result=result)} {count}")
+        lines += [
+            f"# HELP hrms_whatsapp_send_throughput Messages sent per second over the last {THROUGHPUT_WINDOW_SECONDS}s.",
+            "# TYPE hrms_whatsapp_send_throughput gauge",
+        ]
+        for provider, _ in providers:
+            lines.append(f"hrms_whatsapp_send_throughput{_labels(provider=provider)} {self.throughput(provider):.3f}")
+        return "\n".join(lines) + "\n"
+
+
+whatsapp_metrics = WhatsAppMetrics()
+
+
+def _configured_provider() -> WhatsAppProvider:
+    return provider_class(WHATSAPP_PROVIDER)()
+
+
+class WhatsAppDispatcher:
+    """Claims queued messages in batches and sends them under the rate limit
+
+    The message table is the queue, so any number of dispatchers can share it;
+    each has its own token bucket.
+    """
+
+    def __init__(self, provider_factory: Callable[[], WhatsAppProvider] = _configured_provider,
+                 session_factory: Callable[[], Session] = SessionLocal,
+                 batch_size: int = WHATSAPP_BATCH_SIZE, concurrency: int = WHATSAPP_SEND_CONCURRENCY,
+                 rate: float = WHATSAPP_SEND_RATE, burst: int = WHATSAPP_SEND_BURST,
+                 poll_seconds: float = WHATSAPP_POLL_SECONDS, metrics: WhatsAppMetrics = whatsapp_metrics):
+        self.provider_factory = provider_factory
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.burst = burst
+        self.poll_seconds = poll_seconds
+        self.metrics = metrics
+        self._token_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="whatsapp-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10):
+        self._stop.set()
+        self.wake()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Look for new messages now rather than at the next poll"""
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                # The loop has just closed
+                pass
+
+    def run(self):
+        asyncio.run(self._run())
+
+    async def _run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        provider = self.provider_factory()
+        bucket = TokenBucket(self.rate, self.burst)
+        polls = 0
+        try:
+            while not self._stop.is_set():
+                if polls % STALE_CHECK_EVERY == 0:
+                    await self._safely(requeue_stale_messages)
+                polls += 1
+                self._wake.clear()
+                token = f"{self._token_prefix}:{uuid.uuid4().hex[:12]}"
+                messages = await self._safely(claim_messages, self.batch_size, token) or []
+                if messages:
+                    await self._send_batch(provider, bucket, messages, token)
+                if len(messages) < self.batch_size:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await provider.aclose()
+            self._loop = self._wake = None
+
+    async def _safely(self, operation, *args):
+        # A database hiccup mustn't kill the loop: the operation's result, or
+        # None after logging the error; the next poll tries again. Sessions are
+        # blocking, so they run in a worker thread while sends keep going.
+        def call():
+            with self.session_factory() as db:
+                return operation(db, *args)
+
+        try:
+            return await asyncio.to_thread(call)
+        except Exception:
+            logger.exception("WhatsApp queue: %s failed", operation.__name__)
+            return None
+
+    async def _send_batch(self, provider: WhatsAppProvider, bucket: TokenBucket,
+                          messages: List[OutboundMessage], token: str):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(message: OutboundMessage) -> Optional[SendOutcome]:
+            async with semaphore:
+                if self._stop.is_set():
+                    return None
+                await bucket.acquire()
+                try:
+                    result = await provider.send(message)
+                except Exception as e:
+                    logger.warning("WhatsApp message %s: %s failed: %s", message.id, provider.name, e)
+                    result = SendResult(False, error=f"{type(e).__name__}: {e}", retryable=True)
+                if result.retry_after:
+                    bucket.pause(result.retry_after)
+                return SendOutcome(message.id, message.attempts, result)
+
+        outcomes = await asyncio.gather(*(send(message) for message in messages))
+        finished = [outcome for outcome in outcomes if outcome is not None]
+        unsent = [message.id for message, outcome in zip(messages, outcomes) if outcome is None]
+        counts = await self._safely(finish_messages, token, finished)
+        if counts is not None:
+            self.metrics.record(provider.name, counts)
+        # Stopping: what wasn't sent goes back to the queue
+        await self._safely(release_messages, unsent, token)
+
+
+_dispatcher: Optional[WhatsAppDispatcher] = None
+
+
+def start_whatsapp_dispatcher() -> Optional[WhatsAppDispatcher]:
+    global _dispatcher
+    if not WHATSAPP_DISPATCHER or _dispatcher is not None:
+        return _dispatcher
+    _dispatcher = WhatsAppDispatcher()
+    _dispatcher.start()
+    return _dispatcher
+
+
+def stop_whatsapp_dispatcher():
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.stop()
+        _dispatcher = None
+
+
+def notify_whatsapp_queued():
+    """Called after messages are committed to the queue so this worker's
+    dispatcher sends them straight away; other dispatchers see them on their
+    next poll"""
+    if _dispatcher is not None:
+        _dispatcher.wake()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    dispatcher = WhatsAppDispatcher()
+    signal.signal(signal.SIGTERM, lambda *_: dispatcher.stop(timeout=None))
+    logger.info("WhatsApp dispatcher sending through %s at %s messages/s", WHATSAPP_PROVIDER, dispatcher.rate)
+    try:
+        dispatcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""WhatsApp providers: what the dispatcher (app/core/whatsapp_dispatcher.py)
+sends each message through
+
+A provider sends one message and says how it went; batching, rate limiting
+and retries are the dispatcher's. WHATSAPP_PROVIDER picks one: "stub",
+"cloud", or "module:Class" for a provider class of your own.
+"""
+
+import asyncio
+import importlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from app.core.config import WHATSAPP_ACCESS_TOKEN, WHATSAPP_API_URL, WHATSAPP_PHONE_NUMBER_ID
+
+
+class OutboundMessage(NamedTuple):
+    id: int
+    phone_number: str
+    content: Optional[str]
+    message_type: Optional[str]
+    # Sends so far, this one included
+    attempts: int
+
+
+@dataclass(frozen=True)
+class SendResult:
+    ok: bool
+    provider_message_id: Optional[str] = None
+    error: Optional[str] = None
+    # Worth trying again later (rate limited, provider or network trouble)
+    retryable: bool = False
+    # Seconds the provider asked us to wait (Retry-After)
+    retry_after: Optional[float] = None
+
+
+class DeliveryUpdate(NamedTuple):
+    provider_message_id: str
+    # "delivered", "read" or "failed"
+    status: str
+    timestamp: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class WhatsAppProvider:
+    name = "provider"
+
+    async def send(self, message: OutboundMessage) -> SendResult:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+    @classmethod
+    def delivery_updates(cls, payload) -> List[DeliveryUpdate]:
+        """Delivery receipts from a status callback body; by default a list of
+        {"provider_message_id", "status", "timestamp" (Unix seconds), "error"}"""
+        return [
+            DeliveryUpdate(item["provider_message_id"], item["status"], _timestamp(item.get("timestamp")),
+                           item.get("error"))
+            for item in payload
+        ]
+
+
+def _timestamp(value) -> Optional[datetime]:
+    return datetime.fromtimestamp(int(value), timezone.utc) if value else None
+
+
+class StubWhatsAppProvider(WhatsAppProvider):
+    """Sends nothing: keeps the messages in `sent` and reports them sent. For
+    local development and tests; `results` maps a phone number to SendResults
+    returned, one per attempt, before that number's messages succeed."""
+    name = "stub"
+
+    def __init__(self, latency: float = 0.0, results: Optional[Dict[str, List[SendResult]]] = None):
+        self.latency = latency
+        self.results = {phone: list(outcomes) for phone, outcomes in (results or {}).items()}
+        self.sent: List[OutboundMessage] = []
+
+    async def send(self, message: OutboundMessage) -> SendResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        outcomes = self.results.get(message.phone_number)
+        if outcomes:
+            return outcomes.pop(0)
+        self.sent.append(message)
+        return SendResult(True, provider_message_id=f"stub-{message.id}-{message.attempts}")
+
+
+class CloudApiWhatsAppProvider(WhatsAppProvider):
+    """WhatsApp Business Cloud API: text messages from WHATSAPP_PHONE_NUMBER_ID"""
+    name = "cloud"
+
+    def __init__(self, api_url: str = WHATSAPP_API_URL, phone_number_id: str = WHATSAPP_PHONE_NUMBER_ID,
+                 access_token: str = WHATSAPP_ACCESS_TOKEN, timeout: float = 10.0):
+        if not phone_number_id or not access_token:
+            raise ValueError("WHATSAPP_PHONE_NUMBER_ID and WHATSAPP_ACCESS_TOKEN must be set for the cloud provider")
+        import httpx
+
+        self._httpx = httpx
+        self._path = f"/{phone_number_id}/messages"
+        self._client = httpx.AsyncClient(
+            base_url=api_url, timeout=timeout, headers={"Authorization": f"Bearer {access_token}"}
+        )
+
+    async def send(self, message: OutboundMessage) -> SendResult:
+        from app.models.candidate import normalize_phone
+
+        phone = normalize_phone(message.phone_number)
+        if phone is None:
+            return SendResult(False, error=f"Invalid phone number: {message.phone_number}")
+        body = {
+            "messaging_product": "whatsapp", "to": phone.lstrip("+"),
+            "type": "text", "text": {"body": message.content or ""},
+        }
+        try:
+            response = await self._client.post(self._path, json=body)
+        except self._httpx.HTTPError as e:
+            return SendResult(False, error=f"{type(e).__name__}: {e}", retryable=True)
+        if response.is_success:
+            return SendResult(True, provider_message_id=response.json()["messages"][0]["id"])
+        retry_after = response.headers.get("Retry-After")
+        return SendResult(
+            False, error=f"HTTP {response.status_code}: {response.text[:500]}",
+            retryable=response.status_code == 429 or response.status_code >= 500,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+        )
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    @classmethod
+    def delivery_updates(cls, payload) -> List[DeliveryUpdate]:
+        """Statuses from a Cloud API webhook notification"""
+        updates = []
+        for entry in payload.get("entry", []):
+            for change in entry.get("changes", []):
+                for status in change.get("value", {}).get("statuses", []):
+                    errors = status.get("errors") or [{}]
+                    updates.append(DeliveryUpdate(
+                        status["id"], status["status"], _timestamp(status.get("timestamp")),
+                        errors[0].get("title"),
+                    ))
+        return updates
+
+
+PROVIDERS = {"stub": StubWhatsAppProvider, "cloud": CloudApiWhatsAppProvider}
+
+
+def provider_class(name: str) -> type:
+    """The provider class for a WHATSAPP_PROVIDER value"""
+    if name in PROVIDERS:
+        return PROVIDERS[name]
+    module, _, attribute = name.partition(":")
+    if not attribute:
+        raise ValueError(f"Unknown WhatsApp provider {name!r}: use {', '.join(PROVIDERS)} or module:Class")
+    return getattr(importlib.import_module(module), attribute)
@@ -3,5 +3,8 @@ from .employee import Employee
 from .candidate import Candidate
 from .job import Job
 from .application import Application
+from .resume_parse_job import ResumeParseJob
+from .resume_file import ResumeFile
+from .offer_batch import OfferBatch
 
-__all__ = ["User", "Employee", "Candidate", "Job", "Application"] 
\ No newline at end of file
+__all__ = ["User", "Employee", "Candidate", "Job", "Application", "ResumeParseJob", "ResumeFile", "OfferBatch"] 
\ No newline at end of file
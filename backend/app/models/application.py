@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -13,6 +13,14 @@ class ApplicationStatus(str, enum.Enum):
 
 class Application(Base):
     __tablename__ = "applications"
+    # Kept in sync with alembic/versions/0001_hot_filter_indexes.py
+    __table_args__ = (
+        Index("ix_applications_job_id_candidate_id", "job_id", "candidate_id"),
+        Index("ix_applications_candidate_id", "candidate_id"),
+        Index("ix_applications_status_applied_at", "status", "applied_at"),
+        Index("ix_applications_applied_at", "applied_at"),
+        Index("ix_applications_interview_scheduled_at", "interview_scheduled_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Boolean, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Boolean, ForeignKey, Date, Index, DDL, event
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
+from typing import Optional
 import enum
+import phonenumbers
+from app.core.config import DEFAULT_PHONE_REGION
 from app.core.database import Base
 from sqlalchemy import Enum as SAEnum
 
@@ -38,14 +41,57 @@ class EducationShort(str, enum.Enum):
     Doctorate = "Doctorate"
 
 
+# Columns covered by full-text search (app/routers/search_utils.py). MySQL MATCH()
+# must name exactly the columns of a FULLTEXT index, so keep this order
+CANDIDATE_SEARCH_COLUMNS = (
+    "first_name", "last_name", "email", "designation", "education_qualification_short", "experience_details",
+)
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """E.164 form of a phone number ("+919876543210"), None when it isn't a
+    possible number; numbers without a +code are read as DEFAULT_PHONE_REGION"""
+    if not phone:
+        return None
+    try:
+        number = phonenumbers.parse(str(phone), DEFAULT_PHONE_REGION)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_possible_number(number):
+        return None
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    email = (email or "").strip().lower()
+    return email or None
+
+
 class Candidate(Base):
     __tablename__ = "candidates"
+    # Kept in sync with alembic/versions/0001_hot_filter_indexes.py, 0002_candidate_fulltext.py
+    # and 0005_candidate_dedupe_keys.py
+    __table_args__ = (
+        # One candidate per person: imports match on these instead of scanning phone/email
+        Index("ux_candidates_phone_e164", "phone_e164", unique=True),
+        Index("ux_candidates_email_normalized", "email_normalized", unique=True),
+        Index("ix_candidates_is_in_pool", "is_in_pool"),
+        Index("ix_candidates_created_by", "created_by"),
+        Index("ix_candidates_status_created_at", "status", "created_at"),
+        Index("ix_candidates_job_id_is_in_pool", "job_id", "is_in_pool"),
+        Index("ix_candidates_created_at", "created_at"),
+        Index("ft_candidates_search", *CANDIDATE_SEARCH_COLUMNS, mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+        Index("ft_candidates_experience", "experience_details", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(255), nullable=False)
     last_name = Column(String(255), nullable=True)
     email = Column(String(255), nullable=True)
     phone = Column(String(20), nullable=False)
+    # Dedupe keys, set from phone and email by the validators below (and by the
+    # bulk importers, whose Core INSERTs bypass them); NULL when there is none
+    phone_e164 = Column(String(20), nullable=True)
+    email_normalized = Column(String(255), nullable=True)
     gender = Column(Enum(Gender), nullable=True)
     location_state = Column(String(255))
     location_city = Column(String(255))
@@ -82,16 +128,80 @@ class Candidate(Base):
     applications = relationship("Application", back_populates="candidate")
     whatsapp_communications = relationship("WhatsAppCommunication", back_populates="candidate")
     offer_letter = relationship("OfferLetter", back_populates="candidate")
+    resume_parse_jobs = relationship("ResumeParseJob", back_populates="candidate", cascade="all, delete-orphan")
+
+    @validates("phone")
+    def _set_phone_e164(self, key, phone):
+        self.phone_e164 = normalize_phone(phone)
+        return phone
+
+    @validates("email")
+    def _set_email_normalized(self, key, email):
+        self.email_normalized = normalize_email(email)
+        return email
+
+
+def sqlite_fts_ddl():
+    """FTS5 index for SQLite: an external-content table over the candidates rows,
+    kept current by triggers (updates only re-index when a searched column changes)"""
+    columns = ", ".join(CANDIDATE_SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{column}" for column in CANDIDATE_SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{column}" for column in CANDIDATE_SEARCH_COLUMNS)
+    insert_new = f"INSERT INTO candidates_fts(rowid, {columns}) VALUES (new.id, {new_values});"
+    delete_old = (
+        f"INSERT INTO candidates_fts(candidates_fts, rowid, {columns}) VALUES ('delete', old.id, {old_values});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5({columns}, "
+        "content='candidates', content_rowid='id', prefix='2 3 4', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS candidates_fts_ai AFTER INSERT ON candidates BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS candidates_fts_ad AFTER DELETE ON candidates BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS candidates_fts_au AFTER UPDATE OF {columns} ON candidates "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+for statement in sqlite_fts_ddl():
+    event.listen(Candidate.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Candidate.__table__, "before_drop", DDL("DROP TABLE IF EXISTS candidates_fts").execute_if(dialect="sqlite")
+)
+
+class WhatsAppMessageStatus(str, enum.Enum):
+    PENDING = "Pending"
+    QUEUED = "Queued"
+    SENDING = "Sending"
+    SENT = "Sent"
+    DELIVERED = "Delivered"
+    READ = "Read"
+    FAILED = "Failed"
 
 class WhatsAppCommunication(Base):
+    """An outbound WhatsApp message; queued rows are sent by the WhatsApp
+    dispatcher (app/core/whatsapp_dispatcher.py) - the table is the queue"""
     __tablename__ = "whatsapp_communications"
+    # Kept in sync with alembic/versions/0006_whatsapp_outbox.py
+    __table_args__ = (
+        # Dispatchers claim the oldest queued messages and look for expired claims
+        Index("ix_whatsapp_communications_status_id", "status", "id"),
+        # Delivery receipts name the provider's message id
+        Index("ix_whatsapp_communications_provider_message_id", "provider_message_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
     phone_number = Column(String(20), nullable=False)
     message_content = Column(Text)
     message_type = Column(String(50), default="Initial Contact")
-    status = Column(String(50), default="Pending")
+    status = Column(String(50), default=WhatsAppMessageStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    # Claim token of the dispatcher sending the message (host:pid:batch)
+    claimed_by = Column(String(100), nullable=True)
+    # Queued: not before this time (retry backoff). Sending: when the claim
+    # expires and the message is queued again
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    provider_message_id = Column(String(100), nullable=True)
+    error = Column(Text, nullable=True)
     sent_at = Column(DateTime(timezone=True))
     delivered_at = Column(DateTime(timezone=True))
     read_at = Column(DateTime(timezone=True))
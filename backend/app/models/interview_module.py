@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Text, Enum, ForeignKey, DateTime, Boolean, Float, func
+    Column, Integer, String, Text, Enum, ForeignKey, DateTime, Boolean, Float, Index, func
 )
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -39,6 +39,12 @@ class InterviewQuestion(Base):
 
 class InterviewSession(Base):
     __tablename__ = "interview_sessions"
+    # Kept in sync with alembic/versions/0001_hot_filter_indexes.py
+    __table_args__ = (
+        Index("ix_interview_sessions_application_id_round_id", "application_id", "round_id"),
+        Index("ix_interview_sessions_application_id_status", "application_id", "status"),
+        Index("ix_interview_sessions_round_id_status", "round_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
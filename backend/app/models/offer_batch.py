@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.sql import func
+import enum
+from app.core.database import Base
+
+
+class OfferBatchStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class OfferBatch(Base):
+    """A bulk offer issue: an offer batch runner claims it, renders its
+    candidates' PDFs on the offer render processes (app/routers/offer_batch_utils.py)
+    and creates their OfferLetter rows together when all are rendered; the
+    table is the queue"""
+    __tablename__ = "offer_batches"
+    # Kept in sync with alembic/versions/0007_offer_batches.py
+    __table_args__ = (
+        # Runners claim the oldest queued batch and look for stale running ones
+        Index("ix_offer_batches_status_id", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(
+        SAEnum(OfferBatchStatus, values_callable=lambda enum: [e.value for e in enum], native_enum=False,
+               validate_strings=True, length=20),
+        nullable=False, default=OfferBatchStatus.QUEUED,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    # Claim token of the runner rendering the batch (host:pid:batch)
+    claimed_by = Column(String(100), nullable=True)
+    # Shortlisted candidates selected when the batch was created
+    candidate_ids = Column(JSON, nullable=False)
+    total = Column(Integer, nullable=False, default=0)
+    # Progress: PDFs rendered and failed so far
+    rendered = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    # {"offers": [{"candidate_id", "offer_id"}], "errors": [{"candidate_id", "error"}]}
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
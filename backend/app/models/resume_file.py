@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from sqlalchemy.dialects import mysql
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ResumeFile(Base):
+    """A stored resume, keyed by the SHA-256 of its content
+
+    Every upload of the same bytes shares this row and its file on disk, and
+    the extracted text and parse result are kept so a duplicate upload needs
+    neither extraction nor spaCy (app/routers/resume_cache_utils.py).
+    """
+    __tablename__ = "resume_files"
+    # Kept in sync with alembic/versions/0004_resume_files.py
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, unique=True)
+    file_path = Column(String(500), nullable=False)
+    size = Column(Integer, nullable=False)
+    # MySQL TEXT stops at 64 KB; resumes are cut at MAX_RESUME_CHARS characters
+    extracted_text = Column(Text().with_variant(mysql.MEDIUMTEXT(), "mysql"), nullable=True)
+    parsed = Column(JSON, nullable=True)
+    # SPACY_MODEL that produced `parsed`; results of another model aren't reused
+    parsed_with = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    parsed_at = Column(DateTime(timezone=True), nullable=True)
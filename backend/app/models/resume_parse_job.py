@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+import enum
+from app.core.database import Base
+
+
+class ResumeParseStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ResumeParseJob(Base):
+    """A resume waiting for, or done with, parsing by the resume parse workers
+    (app/core/resume_workers.py); the table is the queue"""
+    __tablename__ = "resume_parse_jobs"
+    # Kept in sync with alembic/versions/0003_resume_parse_jobs.py and 0004_resume_files.py
+    __table_args__ = (
+        # Workers claim the oldest queued jobs and look for stale running ones
+        Index("ix_resume_parse_jobs_status_id", "status", "id"),
+        Index("ix_resume_parse_jobs_claimed_by", "claimed_by"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
+    file_path = Column(String(500), nullable=False)
+    # Content-hash cache entry of the uploaded file; its text and parse result are reused
+    resume_file_id = Column(Integer, ForeignKey("resume_files.id"), nullable=True)
+    status = Column(
+        SAEnum(ResumeParseStatus, values_callable=lambda enum: [e.value for e in enum], native_enum=False,
+               validate_strings=True, length=20),
+        nullable=False, default=ResumeParseStatus.QUEUED,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    # Claim token of the dispatcher running the job (host:pid:batch)
+    claimed_by = Column(String(100), nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    candidate = relationship("Candidate", back_populates="resume_parse_jobs")
+    resume_file = relationship("ResumeFile")
@@ -1,58 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.schemas.application import Application, ApplicationCreate, ApplicationUpdate
 from app.models.application import Application as ApplicationModel
+from app.models.candidate import Candidate as CandidateModel
+from app.models.job import Job as JobModel
 from app.core.security import get_current_user
+from app.core.pagination import CursorPage
+from app.core.responses import json_list_response
 from app.models.user import UserRole
 
 router = APIRouter()
 
-@router.get("/", response_model=List[Application])
-async def get_applications(skip: int = 0, db: Session = Depends(get_db)):
-    applications = (
-        db.query(ApplicationModel)
-        .order_by(ApplicationModel.id.desc())
-        .offset(skip)
-        .all()
+# The response schema nests candidate and job; load them up front since an
+# AsyncSession can't lazy-load while the response is being serialized
+APPLICATION_LOAD_OPTIONS = (
+    selectinload(ApplicationModel.candidate).selectinload(CandidateModel.created_by_user),
+    selectinload(ApplicationModel.job).selectinload(JobModel.department),
+    selectinload(ApplicationModel.job).selectinload(JobModel.created_by_user),
+)
+
+async def _get_application(db: AsyncSession, application_id: int):
+    result = await db.execute(
+        select(ApplicationModel)
+        .options(*APPLICATION_LOAD_OPTIONS)
+        .where(ApplicationModel.id == application_id)
+        .execution_options(populate_existing=True)
     )
-    return applications
+    return result.scalars().first()
+
+@router.get("/", response_model=List[Application])
+async def get_applications(response: Response, page: CursorPage = Depends(), db: AsyncSession = Depends(get_async_db)):
+    query = select(ApplicationModel).options(*APPLICATION_LOAD_OPTIONS)
+    result = await db.execute(page.apply(query, ApplicationModel.id))
+    applications = page.finish(result.scalars().all(), response)
+    return json_list_response(Application, applications, response)
 
 @router.get("/{application_id}", response_model=Application)
-async def get_application(application_id: int, db: Session = Depends(get_db)):
-    application = db.query(ApplicationModel).filter(ApplicationModel.id == application_id).first()
+async def get_application(application_id: int, db: AsyncSession = Depends(get_async_db)):
+    application = await _get_application(db, application_id)
     if application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     return application
 
 @router.post("/", response_model=Application)
-async def create_application(application: ApplicationCreate, db: Session = Depends(get_db)):
+async def create_application(application: ApplicationCreate, db: AsyncSession = Depends(get_async_db)):
     db_application = ApplicationModel(**application.dict())
     db.add(db_application)
-    db.commit()
-    db.refresh(db_application)
-    return db_application
+    await db.commit()
+    return await _get_application(db, db_application.id)
 
 @router.put("/{application_id}", response_model=Application)
-async def update_application(application_id: int, application: ApplicationUpdate, db: Session = Depends(get_db)):
-    db_application = db.query(ApplicationModel).filter(ApplicationModel.id == application_id).first()
+async def update_application(application_id: int, application: ApplicationUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_application = await _get_application(db, application_id)
     if db_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
-    
+
     for field, value in application.dict(exclude_unset=True).items():
         setattr(db_application, field, value)
-    
-    db.commit()
-    db.refresh(db_application)
-    return db_application
+
+    await db.commit()
+    return await _get_application(db, application_id)
 
 @router.delete("/{application_id}")
-async def delete_application(application_id: int, db: Session = Depends(get_db)):
-    db_application = db.query(ApplicationModel).filter(ApplicationModel.id == application_id).first()
+async def delete_application(application_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_application = await db.get(ApplicationModel, application_id)
     if db_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
-    
-    db.delete(db_application)
-    db.commit()
-    return {"message": "Application deleted successfully"}
\ No newline at end of file
+
+    await db.delete(db_application)
+    await db.commit()
+    return {"message": "Application deleted successfully"}
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, get_current_user
+from app.core.security import verify_password_async, create_access_token, get_current_user
 from app.models.user import User
 from app.schemas.auth import Token, UserLogin
 from app.schemas.user import User as UserSchema
@@ -17,7 +17,8 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == user_credentials.email).first()
     
     # Check if user exists and password is correct
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    # bcrypt runs on the bounded password executor, not the event loop
+    if not user or not await verify_password_async(user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -0,0 +1,40 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.candidate import Candidate
+from app.schemas.candidate import CandidateBulkSelection
+
+
+def selection_conditions(selection: CandidateBulkSelection) -> List:
+    if selection.ids is not None:
+        return [Candidate.id.in_(set(selection.ids))]
+    return [getattr(Candidate, column) == value
+            for column, value in selection.filter.model_dump(exclude_none=True).items()]
+
+
+def bulk_update_candidates(db: Session, selection: CandidateBulkSelection, values: Dict,
+                           owner_id: Optional[int] = None) -> int:
+    """Apply `values` to every selected candidate with one set-based UPDATE and
+    commit it; returns the number of candidates matched
+
+    With `owner_id`, only that user's candidates (created_by) are changed -
+    the rest of the selection is left alone rather than refused.
+    """
+    conditions = selection_conditions(selection)
+    if owner_id is not None:
+        conditions.append(Candidate.created_by == owner_id)
+    # No session objects to keep in sync: nothing is loaded
+    statement = update(Candidate).where(*conditions).values(values).execution_options(synchronize_session=False)
+    result = db.execute(statement)
+    db.commit()
+    return result.rowcount
+
+
+def bulk_result(message: str, selection: CandidateBulkSelection, updated: int) -> Dict:
+    result = {"message": f"{message}: {updated}", "updated": updated}
+    if selection.ids is not None:
+        requested = len(set(selection.ids))
+        result.update(requested=requested, skipped=requested - updated)
+    return result
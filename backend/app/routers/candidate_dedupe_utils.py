@@ -0,0 +1,62 @@
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.models.candidate import Candidate, normalize_email, normalize_phone
+
+# Candidates are matched on these uniquely indexed columns (app/models/candidate.py)
+DEDUPE_COLUMNS = ("phone_e164", "email_normalized")
+
+
+def with_dedupe_keys(values: Dict) -> Dict:
+    """The values plus their phone_e164/email_normalized, for Core INSERTs (which
+    don't run the model's validators)"""
+    return dict(values, phone_e164=normalize_phone(values.get("phone")),
+                email_normalized=normalize_email(values.get("email")))
+
+
+def existing_candidates(db: Session, phones: Iterable[Optional[str]], emails: Iterable[Optional[str]],
+                        *columns) -> List:
+    """Candidates holding any of the normalized phones or emails - one lookup on
+    each unique index, whatever the table size. Whole Candidate objects, or rows
+    of `columns` when given."""
+    phones, emails = {phone for phone in phones if phone}, {email for email in emails if email}
+    conditions = []
+    if phones:
+        conditions.append(Candidate.phone_e164.in_(phones))
+    if emails:
+        conditions.append(Candidate.email_normalized.in_(emails))
+    if not conditions:
+        return []
+    if columns:
+        return db.execute(select(*columns).where(or_(*conditions))).all()
+    return db.scalars(select(Candidate).where(or_(*conditions))).all()
+
+
+def find_duplicate(db: Session, phone: Optional[str], email: Optional[str],
+                   exclude_id: Optional[int] = None) -> Optional[Candidate]:
+    """Another candidate with the same phone number or email, if any"""
+    for candidate in existing_candidates(db, [normalize_phone(phone)], [normalize_email(email)]):
+        if candidate.id != exclude_id:
+            return candidate
+    return None
+
+
+def keys_held_by_others(db: Session, candidate: Candidate, phone: Optional[str],
+                        email: Optional[str]) -> Set[str]:
+    """Which of "phone"/"email" would collide with another candidate if given to this one"""
+    phone, email = normalize_phone(phone), normalize_email(email)
+    held = set()
+    for other in existing_candidates(db, [phone], [email]):
+        if other.id == candidate.id:
+            continue
+        if phone and other.phone_e164 == phone:
+            held.add("phone")
+        if email and other.email_normalized == email:
+            held.add("email")
+    return held
+
+
+def duplicate_detail(candidate: Candidate) -> str:
+    return f"Candidate {candidate.id} already has this phone number or email"
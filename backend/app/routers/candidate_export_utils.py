@@ -0,0 +1,98 @@
+import csv
+import enum
+import io
+import os
+import re
+import tempfile
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import CANDIDATE_EXPORT_BATCH_SIZE
+from app.models.candidate import Candidate
+
+# Exported columns, in sheet order; the dedupe keys and other internal columns are left out
+EXPORT_COLUMNS = (
+    "id", "first_name", "last_name", "email", "phone", "gender", "location_state", "location_city",
+    "location_area", "location_pincode", "education_qualification_short", "education_qualification_detailed",
+    "experience_years", "experience_details", "notice_period", "current_compensation", "expected_compensation",
+    "designation", "job_id", "process", "source", "source_details", "status", "reason_of_rejection",
+    "reason_for_kiv_other_roles", "notes", "is_in_pool", "resume_url", "created_by", "created_at", "updated_at",
+)
+EXPORT_SELECT_COLUMNS = tuple(Candidate.__table__.c[column] for column in EXPORT_COLUMNS)
+
+# Spreadsheet apps run a cell starting with one of these as a formula; phone
+# numbers like "+91 98765 43210" are left as they are
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+PHONE_LIKE = re.compile(r"^[+\-]?[\d\s()\-]+$")
+
+XLSX_CHUNK_BYTES = 64 * 1024
+
+
+def export_rows(session_factory: Callable[[], Session], statement,
+                batch_size: int = CANDIDATE_EXPORT_BATCH_SIZE) -> Iterator[Sequence]:
+    """Batches of exported rows (EXPORT_COLUMNS values) from a select of
+    EXPORT_SELECT_COLUMNS, read through a server-side cursor
+
+    yield_per keeps at most `batch_size` rows in memory; plain column rows, not
+    ORM objects, so nothing accumulates in the session either. The session is
+    opened here because the response streams after the request handler (and
+    its dependencies) have returned.
+    """
+    with session_factory() as db:
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield [row[:len(EXPORT_COLUMNS)] for row in partition]
+
+
+def _cell(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        # Excel has no time zones; stored times are UTC
+        return value.replace(tzinfo=None)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) and not PHONE_LIKE.match(value):
+        return "'" + value
+    return value
+
+
+def csv_chunks(batches: Iterable[Sequence]) -> Iterator[bytes]:
+    """UTF-8 CSV (with a BOM, so Excel detects the encoding), one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows([_cell(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def xlsx_chunks(batches: Iterable[Sequence]) -> Iterator[bytes]:
+    """An .xlsx built with openpyxl's write-only mode, which spools rows to a
+    temporary file instead of keeping cells in memory; the finished file is
+    streamed from disk and removed"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Candidates")
+    sheet.append(EXPORT_COLUMNS)
+    for batch in batches:
+        for row in batch:
+            sheet.append([_cell(value) for value in row])
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(path)
+        with open(path, "rb") as file:
+            while True:
+                chunk = file.read(XLSX_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(path)
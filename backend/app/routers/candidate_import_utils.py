@@ -0,0 +1,293 @@
+from itertools import islice
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, insert, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import CANDIDATE_IMPORT_CHUNK_SIZE, CANDIDATE_IMPORT_MAX_ERRORS
+from app.models.candidate import Candidate, EducationShort
+from app.routers.candidate_dedupe_utils import DEDUPE_COLUMNS, existing_candidates, with_dedupe_keys
+
+# Sheet columns read by the importer, as in the download template
+IMPORT_COLUMNS = (
+    "first_name", "last_name", "email", "phone", "location_state", "location_city",
+    "location_area", "location_pincode", "education_qualification_short",
+)
+REQUIRED_COLUMNS = ("first_name", "phone")
+
+# Longest value each column can hold (String(n) on the model)
+MAX_LENGTHS = {
+    column: Candidate.__table__.c[column].type.length
+    for column in IMPORT_COLUMNS if column != "education_qualification_short"
+}
+EDUCATION_VALUES = {education.value.lower(): education.value for education in EducationShort}
+
+CANDIDATES = Candidate.__table__
+UPSERT_COLUMNS = IMPORT_COLUMNS + DEDUPE_COLUMNS
+# Updates only fill in the cells the sheet has; blank cells keep the stored value
+UPDATE_MATCHED = (
+    update(CANDIDATES)
+    .where(CANDIDATES.c.id == bindparam("match_id"))
+    .values({
+        column: func.coalesce(bindparam(f"new_{column}", type_=CANDIDATES.c[column].type), CANDIDATES.c[column])
+        for column in UPSERT_COLUMNS
+    })
+)
+
+
+class ImportReport:
+    """Outcome of an import; only the first `max_errors` row errors are kept"""
+
+    def __init__(self, max_errors: int = CANDIDATE_IMPORT_MAX_ERRORS):
+        self.imported = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self.max_errors = max_errors
+
+    def add_error(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": error})
+
+    def as_response(self) -> dict:
+        if self.failed:
+            message = f"Candidates uploaded: {self.imported}, rows with errors: {self.failed}"
+        else:
+            message = f"Candidates uploaded successfully: {self.imported}"
+        if self.updated:
+            message += f", existing candidates updated: {self.updated}"
+        return {
+            "message": message,
+            "imported": self.imported,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def clean_column(values: list) -> list:
+    """Cell values to stripped strings; blanks become None
+
+    Excel stores phone numbers and pincodes typed as numbers as floats, so
+    whole numbers are written without the trailing ".0".
+    """
+    cleaned = []
+    for value in values:
+        if value is None:
+            cleaned.append(None)
+            continue
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        text = str(value).strip()
+        cleaned.append(text or None)
+    return cleaned
+
+
+def validate_chunk(columns: Dict[str, list], row_numbers: List[int], report: ImportReport) -> List[Tuple[int, dict]]:
+    """Check a chunk column by column; returns (sheet row number, values) of the valid rows"""
+    errors: Dict[int, List[str]] = {}
+
+    def flag(index: int, message: str):
+        errors.setdefault(index, []).append(message)
+
+    for column in REQUIRED_COLUMNS:
+        for index, value in enumerate(columns[column]):
+            if value is None:
+                flag(index, f"{column} is required")
+    for column, max_length in MAX_LENGTHS.items():
+        for index, value in enumerate(columns[column]):
+            if value is not None and len(value) > max_length:
+                flag(index, f"{column} is longer than {max_length} characters")
+    for index, value in enumerate(columns["email"]):
+        if value is not None and "@" not in value:
+            flag(index, f"invalid email {value!r}")
+    education = columns["education_qualification_short"]
+    for index, value in enumerate(education):
+        if value is not None:
+            if value.lower() in EDUCATION_VALUES:
+                education[index] = EDUCATION_VALUES[value.lower()]
+            else:
+                flag(index, f"unknown education_qualification_short {value!r}")
+
+    records = []
+    for index, row_number in enumerate(row_numbers):
+        if index in errors:
+            report.add_error(row_number, "; ".join(errors[index]))
+        else:
+            records.append((row_number, {column: columns[column][index] for column in IMPORT_COLUMNS}))
+    return records
+
+
+class _Match:
+    """The candidate some rows of a chunk resolve to: an existing one (candidate_id)
+    or a new one, with the values gathered from the rows"""
+
+    def __init__(self, candidate_id: Optional[int] = None):
+        self.candidate_id = candidate_id
+        self.values: Dict = {}
+        self.rows: List[int] = []
+
+    def merge(self, row_number: int, values: Dict):
+        if not self.values:
+            self.values = dict(values)
+        else:
+            self.values.update({column: value for column, value in values.items() if value is not None})
+        self.rows.append(row_number)
+
+
+def match_chunk(db: Session, records: List[Tuple[int, dict]], report: ImportReport) -> List[_Match]:
+    """Resolve each row to an existing candidate or a new one by its dedupe keys
+
+    The keys of the whole chunk are looked up at once on the unique indexes.
+    Rows with the key of an earlier row in the chunk are merged into it; a row
+    whose phone and email belong to two different candidates is reported.
+    """
+    keyed = [(row_number, with_dedupe_keys(values)) for row_number, values in records]
+    existing = existing_candidates(
+        db, [values["phone_e164"] for _, values in keyed], [values["email_normalized"] for _, values in keyed],
+        CANDIDATES.c.id, CANDIDATES.c.phone_e164, CANDIDATES.c.email_normalized,
+    )
+    by_key: Dict[Tuple[str, str], _Match] = {}
+    for row in existing:
+        match = _Match(row.id)
+        for column in DEDUPE_COLUMNS:
+            if row._mapping[column]:
+                by_key[column, row._mapping[column]] = match
+
+    matches: List[_Match] = []
+    for row_number, values in keyed:
+        keys = [(column, values[column]) for column in DEDUPE_COLUMNS if values[column]]
+        owners = list({id(by_key[key]): by_key[key] for key in keys if key in by_key}.values())
+        if len(owners) > 1:
+            report.add_error(row_number, "phone and email belong to different candidates")
+            continue
+        match = owners[0] if owners else _Match()
+        if not match.rows:
+            matches.append(match)
+        match.merge(row_number, values)
+        for key in keys:
+            by_key[key] = match
+    return matches
+
+
+def _count(match: _Match, report: ImportReport):
+    if match.candidate_id is None:
+        report.imported += 1
+        report.updated += len(match.rows) - 1
+    else:
+        report.updated += len(match.rows)
+
+
+def upsert_chunk(db: Session, records: List[Tuple[int, dict]], created_by: int, report: ImportReport):
+    """Insert the chunk's new candidates and update its existing ones, then commit
+
+    New rows go in one executemany INSERT (compiled once and cached; MySQL
+    drivers send it as multi-row INSERTs) and matched rows in one executemany
+    UPDATE by primary key, so dedupe costs an index lookup per row rather than
+    a table scan. If the database rejects the chunk, its rows are retried one
+    at a time in savepoints so only the offending rows are reported and skipped.
+    """
+    if not records:
+        return
+    matches = match_chunk(db, records, report)
+    inserts = [match for match in matches if match.candidate_id is None]
+    updates = [match for match in matches if match.candidate_id is not None]
+    try:
+        if inserts:
+            db.execute(insert(CANDIDATES), [dict(match.values, created_by=created_by) for match in inserts])
+        if updates:
+            db.execute(UPDATE_MATCHED, [_update_params(match) for match in updates])
+        db.commit()
+        for match in matches:
+            _count(match, report)
+        return
+    except SQLAlchemyError:
+        db.rollback()
+
+    for match in matches:
+        try:
+            with db.begin_nested():
+                if match.candidate_id is None:
+                    db.execute(insert(CANDIDATES), dict(match.values, created_by=created_by))
+                else:
+                    db.execute(UPDATE_MATCHED, _update_params(match))
+            _count(match, report)
+        except SQLAlchemyError as e:
+            error = str(getattr(e, "orig", e)).splitlines()[0]
+            for row_number in match.rows:
+                report.add_error(row_number, error)
+    db.commit()
+
+
+def _update_params(match: _Match) -> Dict:
+    params = {f"new_{column}": match.values.get(column) for column in UPSERT_COLUMNS}
+    params["match_id"] = match.candidate_id
+    return params
+
+
+def read_header(rows) -> Dict[str, int]:
+    header = next(rows, None) or ()
+    return {
+        str(name).strip().lower(): position
+        for position, name in enumerate(header) if name is not None and str(name).strip()
+    }
+
+
+def iter_chunks(rows, positions: Dict[str, int], chunk_size: int):
+    """Group sheet rows into chunks of cleaned columns: yields (sheet row numbers, columns)"""
+    row_number = 2  # the header is row 1
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        first_row, row_number = row_number, row_number + len(chunk)
+        # Drop fully blank rows (openpyxl reports formatted-but-empty rows)
+        numbered = [(first_row + offset, row) for offset, row in enumerate(chunk)
+                    if any(cell is not None and str(cell).strip() for cell in row)]
+        if not numbered:
+            continue
+        columns = {}
+        for column in IMPORT_COLUMNS:
+            position = positions.get(column)
+            columns[column] = clean_column(
+                [row[position] if position is not None and position < len(row) else None for _, row in numbered]
+            )
+        yield [number for number, _ in numbered], columns
+
+
+def import_candidates(db: Session, file: BinaryIO, created_by: int, chunk_size: int = CANDIDATE_IMPORT_CHUNK_SIZE,
+                      report: Optional[ImportReport] = None) -> ImportReport:
+    """Stream the first sheet of an .xlsx file into the candidates table
+
+    openpyxl's read-only mode parses the sheet row by row, so memory stays
+    bounded by `chunk_size` whatever the file size. Each chunk is cleaned and
+    validated per column, and its valid rows are upserted and committed
+    together: a row with the phone number or email of an existing candidate
+    updates that candidate. Invalid rows are reported with their sheet row
+    number and don't stop the import. Raises ValueError when a required column is
+    missing from the header.
+    """
+    from openpyxl import load_workbook
+
+    report = report or ImportReport()
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        # Don't trust (or, when missing, compute by scanning the whole sheet)
+        # the stored dimensions; rows then come back without padding
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        positions = read_header(rows)
+        missing = [column for column in REQUIRED_COLUMNS if column not in positions]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+        for row_numbers, columns in iter_chunks(rows, positions, chunk_size):
+            upsert_chunk(db, validate_chunk(columns, row_numbers, report), created_by, report)
+    finally:
+        workbook.close()
+    return report
+
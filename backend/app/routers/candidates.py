@@ -1,58 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, cast, false, String
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 import json
-from app.core.database import get_db
+import secrets
+from app.core.database import engine, get_db, get_async_db, get_read_db, SessionLocal
 from app.core.security import get_current_user
+from app.core.pagination import CursorPage
+from app.core.conditional import (
+    VERSION_FIELDS, collection_etag, is_conditional, make_etag, matches, not_modified, page_version_query,
+    page_versions, set_validators, version_column,
+)
+from app.core.fieldsets import FIELDS_DESCRIPTION, load_options, parse_fields, sparse_schema
+from app.core.responses import json_list_response
 from app.schemas.candidate import (
     Candidate, CandidateCreate, CandidateUpdate, 
-    WhatsAppCommunication, WhatsAppCommunicationCreate, WhatsAppCommunicationUpdate
+    WhatsAppCommunication, WhatsAppCommunicationCreate, WhatsAppCommunicationUpdate, ResumeParseJob,
+    CandidateBulkPoolUpdate, CandidateBulkStatusUpdate, CandidateBulkResult, WhatsAppBulkSend, WhatsAppBulkResult,
+    CandidateBulkSelection, OfferBatch, OfferBatchQueued,
 )
 from app.models.candidate import Candidate as CandidateModel, WhatsAppCommunication as WhatsAppCommunicationModel, OfferLetter
-from app.models.candidate import CandidateStatus, CandidateSource, OfferStatus
+from app.models.candidate import CandidateStatus, CandidateSource, OfferStatus, WhatsAppMessageStatus
 from app.models.user import UserRole
-import os, shutil
-from app.routers.resume_utils import parse_resume_spacy
-import pandas as pd
-from io import BytesIO
-from fastapi.responses import FileResponse
+import os, zipfile
+from app.models.resume_parse_job import ResumeParseJob as ResumeParseJobModel, ResumeParseStatus as ResumeParseJobStatus
+from app.models.offer_batch import OfferBatch as OfferBatchModel
+from app.core.resume_workers import notify_resume_queued
+from app.core.whatsapp_dispatcher import notify_whatsapp_queued
+from app.core.whatsapp_providers import provider_class
+from app.routers.resume_queue_utils import enqueue_resume_parse
+from app.routers.resume_bulk_utils import ingest_resumes
+from app.routers.resume_cache_utils import get_or_create_resume_file
+from app.routers.candidate_import_utils import import_candidates
+from app.routers.candidate_dedupe_utils import duplicate_detail, find_duplicate
+from app.routers.candidate_bulk_utils import bulk_result, bulk_update_candidates
+from app.routers.candidate_export_utils import EXPORT_SELECT_COLUMNS, csv_chunks, export_rows, xlsx_chunks
+from app.routers.whatsapp_queue_utils import queue_bulk_messages, queue_message, record_delivery_updates
+from app.routers.offer_batch_utils import (
+    create_offer_batch, notify_offer_batch_queued, offer_candidate_ids, send_offer_email,
+)
+from app.routers.offer_pdf_utils import OfferContent, render_offer_pdf
+from app.routers.search_utils import parse_search_query, parse_skills, fulltext_search, fulltext_cursor_key
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 import traceback
 from pathlib import Path
 from fastapi import Request
-from reportlab.lib.pagesizes import LETTER
-from reportlab.pdfgen import canvas
-from app.core.config import ALLOWED_ORIGINS
+from app.core.config import ALLOWED_ORIGINS, OFFER_BULK_MAX_CANDIDATES, WHATSAPP_PROVIDER, WHATSAPP_WEBHOOK_TOKEN
+from app.core.uploads import (
+    CANDIDATE_EXCEL_UPLOAD, RESUME_BULK_UPLOAD, RESUME_UPLOAD, StoredUpload, place_by_hash, receive_uploads,
+    upload_openapi,
+)
+from starlette.concurrency import run_in_threadpool
 
 
 router = APIRouter()
 
 OFFER_DIR = Path("offers")
 
-# Candidate Management Endpoints
-@router.get("/", response_model=List[Candidate])
-async def get_candidates(
-    skip: int = 0,
-    status: Optional[CandidateStatus] = None,
-    source: Optional[CandidateSource] = None,
-    is_in_pool: Optional[bool] = None,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    """Get all candidates with optional filtering"""
-    query = (db.query(CandidateModel).options(joinedload(CandidateModel.created_by_user)))
-    
+# Candidate responses include created_by_user, which an AsyncSession can't lazy-load
+CANDIDATE_RELATIONSHIP_LOADS = {"created_by_user": joinedload(CandidateModel.created_by_user)}
+CANDIDATE_LOAD_OPTIONS = tuple(CANDIDATE_RELATIONSHIP_LOADS.values())
+
+def list_filters(query, status, source, is_in_pool, current_user):
+    """The get_candidates filters and role-based visibility, applied to a select on candidates"""
     if status:
-        query = query.filter(CandidateModel.status == status)
+        query = query.where(CandidateModel.status == status)
     if source:
-        query = query.filter(CandidateModel.source == source)
+        query = query.where(CandidateModel.source == source)
     if is_in_pool is not None:
-        query = query.filter(CandidateModel.is_in_pool == is_in_pool)
+        query = query.where(CandidateModel.is_in_pool == is_in_pool)
     
     # Role-based filtering
     if current_user.role == UserRole.RECRUITER:
         # Recruiters can see candidates they created or are assigned to
-        query = query.filter(CandidateModel.created_by == current_user.id)
+        query = query.where(CandidateModel.created_by == current_user.id)
     elif current_user.role == UserRole.HR_SPOC:
         # HR SPOC can see all candidates
         pass
@@ -61,33 +85,122 @@ async def get_candidates(
         pass
     else:
         # Other roles have limited access
-        query = query.filter(CandidateModel.created_by == current_user.id)
+        query = query.where(CandidateModel.created_by == current_user.id)
+    return query
 
-    candidates = (
-        query.order_by(CandidateModel.id.desc())
-        .offset(skip)
-        .all()
-    )
-    return candidates
+def search_filters(experience_min, experience_max, location) -> list:
+    """Conditions of the search_candidates filters besides the query and skills"""
+    filters = []
+    
+    # Experience filter
+    if experience_min is not None:
+        filters.append(CandidateModel.experience_years >= experience_min)
+    if experience_max is not None:
+        filters.append(CandidateModel.experience_years <= experience_max)
+    
+    # Location filter
+    if location:
+        filters.append(
+            (CandidateModel.location_city.contains(location)) |
+            (CandidateModel.location_state.contains(location))
+        )
+    return filters
+
+def contains_search(query_filter, query, skills):
+    """Substring matching of the query and skills (search mode=contains)"""
+    # Basic text search
+    if query:
+        query_filter = query_filter.where(
+            (CandidateModel.first_name.contains(query)) |
+            (CandidateModel.last_name.contains(query)) |
+            (CandidateModel.email.contains(query)) |
+            (cast(CandidateModel.education_qualification_short, String).contains(query))
+        )
+    
+    # Skills filter
+    if skills:
+        skills_list = [skill.strip() for skill in skills.split(",")]
+        for skill in skills_list:
+            query_filter = query_filter.where(
+                CandidateModel.experience_details.contains(skill)
+            )
+    return query_filter
+
+def check_candidate_access(current_user, created_by):
+    # Role-based access control
+    if current_user.role == UserRole.RECRUITER and created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    elif current_user.role not in [UserRole.HR_SPOC, UserRole.ADMIN]:
+        if created_by != current_user.id:
+            raise HTTPException(status_code=403, detail="Access denied")
+
+# Candidate Management Endpoints
+@router.get("/", response_model=List[Candidate])
+async def get_candidates(
+    request: Request,
+    response: Response,
+    page: CursorPage = Depends(),
+    status: Optional[CandidateStatus] = None,
+    source: Optional[CandidateSource] = None,
+    is_in_pool: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(get_current_user)
+):
+    """Get all candidates with optional filtering
+
+    Pages carry a collection ETag; If-None-Match gets 304 when the rows on the
+    page haven't changed.
+    """
+    selected = parse_fields(fields, Candidate)
+    query = page.apply(list_filters(select(CandidateModel), status, source, is_in_pool, current_user),
+                       CandidateModel.id)
+    if is_conditional(request):
+        etag = collection_etag(request, *(await db.execute(page_version_query(query, CandidateModel))).one())
+        if matches(request, etag):
+            return not_modified(etag)
+
+    result = await db.execute(query.options(
+        *load_options(CandidateModel, selected, CANDIDATE_RELATIONSHIP_LOADS, always=VERSION_FIELDS)
+    ))
+    rows = result.scalars().all()
+    set_validators(response, collection_etag(request, *page_versions(rows)))
+    candidates = page.finish(rows, response)
+    return json_list_response(sparse_schema(Candidate, selected), candidates, response)
 
 @router.get("/{candidate_id}", response_model=Candidate)
 async def get_candidate(
     candidate_id: int, 
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    """Get a specific candidate by ID"""
-    candidate = db.query(CandidateModel).filter(CandidateModel.id == candidate_id).first()
+    """Get a specific candidate by ID
+
+    Sends ETag/Last-Modified; a matching If-None-Match or If-Modified-Since
+    gets 304 after a lookup of just the version.
+    """
+    if is_conditional(request):
+        row = (await db.execute(
+            select(CandidateModel.created_by, version_column(CandidateModel)).where(CandidateModel.id == candidate_id)
+        )).first()
+        if row is not None:
+            check_candidate_access(current_user, row.created_by)
+            etag = make_etag("candidate", candidate_id, row[1])
+            if matches(request, etag, row[1]):
+                return not_modified(etag, row[1])
+
+    result = await db.execute(
+        select(CandidateModel).options(*CANDIDATE_LOAD_OPTIONS).where(CandidateModel.id == candidate_id)
+    )
+    candidate = result.scalars().first()
     if candidate is None:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Role-based access control
-    if current_user.role == UserRole.RECRUITER and candidate.created_by != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    elif current_user.role not in [UserRole.HR_SPOC, UserRole.ADMIN]:
-        if candidate.created_by != current_user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
-    
+    check_candidate_access(current_user, candidate.created_by)
+    version = candidate.updated_at or candidate.created_at
+    set_validators(response, make_etag("candidate", candidate.id, version), version)
     return candidate
 
 @router.post("/", response_model=Candidate)
@@ -108,9 +221,18 @@ async def create_candidate(
         for key, value in candidate_data.items()
     }
     
+    duplicate = find_duplicate(db, cleaned_data.get("phone"), cleaned_data.get("email"))
+    if duplicate is not None:
+        raise HTTPException(status_code=409, detail=duplicate_detail(duplicate))
+
     db_candidate = CandidateModel(**cleaned_data, created_by=current_user.id)
     db.add(db_candidate)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race with another request adding the same person
+        db.rollback()
+        raise HTTPException(status_code=409, detail="A candidate with this phone number or email already exists")
     db.refresh(db_candidate)
     return db_candidate
 
@@ -133,10 +255,20 @@ async def update_candidate(
         if db_candidate.created_by != current_user.id:
             raise HTTPException(status_code=403, detail="Access denied")
     
-    for field, value in candidate.dict(exclude_unset=True).items():
+    changes = candidate.dict(exclude_unset=True)
+    if "phone" in changes or "email" in changes:
+        duplicate = find_duplicate(db, changes.get("phone"), changes.get("email"), exclude_id=candidate_id)
+        if duplicate is not None:
+            raise HTTPException(status_code=409, detail=duplicate_detail(duplicate))
+
+    for field, value in changes.items():
         setattr(db_candidate, field, value)
     
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="A candidate with this phone number or email already exists")
     db.refresh(db_candidate)
     return db_candidate
 
@@ -165,18 +297,33 @@ async def delete_candidate(
 # Candidate Pool Management
 @router.get("/pool/", response_model=List[Candidate])
 async def get_candidate_pool(
-    skip: int = 0,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    page: CursorPage = Depends(),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
     """Get all candidates in the pool"""
     if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    candidates = db.query(CandidateModel).filter(
+    selected = parse_fields(fields, Candidate)
+    query = page.apply(select(CandidateModel).where(
         CandidateModel.is_in_pool == True
-    ).offset(skip).all()
-    return candidates
+    ), CandidateModel.id)
+    if is_conditional(request):
+        etag = collection_etag(request, *(await db.execute(page_version_query(query, CandidateModel))).one())
+        if matches(request, etag):
+            return not_modified(etag)
+
+    result = await db.execute(query.options(
+        *load_options(CandidateModel, selected, CANDIDATE_RELATIONSHIP_LOADS, always=VERSION_FIELDS)
+    ))
+    rows = result.scalars().all()
+    set_validators(response, collection_etag(request, *page_versions(rows)))
+    candidates = page.finish(rows, response)
+    return json_list_response(sparse_schema(Candidate, selected), candidates, response)
 
 @router.post("/{candidate_id}/add-to-pool")
 async def add_to_pool(
@@ -218,6 +365,108 @@ async def remove_from_pool(
     db.refresh(candidate)
     return {"message": "Candidate removed from pool", "candidate": candidate}
 
+# Bulk pool and status changes: one UPDATE for the whole selection
+@router.post("/bulk/pool", response_model=CandidateBulkResult)
+def bulk_update_pool(
+    change: CandidateBulkPoolUpdate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Add candidates to, or remove them from, the pool by ids or filter
+
+    Same rules as add-to-pool/remove-from-pool: removed candidates go back
+    to status New.
+    """
+    if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    values = {"is_in_pool": change.in_pool}
+    if not change.in_pool:
+        values["status"] = CandidateStatus.NEW
+    updated = bulk_update_candidates(db, change, values)
+    return bulk_result("Candidates added to pool" if change.in_pool else "Candidates removed from pool",
+                       change, updated)
+
+@router.post("/bulk/status", response_model=CandidateBulkResult)
+def bulk_update_status(
+    change: CandidateBulkStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Set the status and/or rejection/KIV reasons of candidates by ids or filter
+
+    As with PUT /candidates/{id}, HR SPOCs and admins can change any
+    candidate and everyone else only the candidates they created; others in
+    the selection are skipped.
+    """
+    owner_id = None if current_user.role in [UserRole.HR_SPOC, UserRole.ADMIN] else current_user.id
+    values = change.model_dump(include={"status", "reason_of_rejection", "reason_for_kiv_other_roles"},
+                               exclude_unset=True)
+    updated = bulk_update_candidates(db, change, values, owner_id=owner_id)
+    return bulk_result("Candidates updated", change, updated)
+
+@router.post("/bulk/whatsapp", response_model=WhatsAppBulkResult)
+def bulk_send_whatsapp(
+    campaign: WhatsAppBulkSend,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Queue a WhatsApp message to candidates by ids or filter
+
+    One whatsapp_communications row per candidate with a phone number, written
+    with a single INSERT ... SELECT; the dispatcher sends them under the
+    provider's rate limit. Recruiters only message the candidates they created.
+    """
+    if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    owner_id = None if current_user.role in [UserRole.HR_SPOC, UserRole.ADMIN] else current_user.id
+    queued = queue_bulk_messages(db, campaign, campaign.message_content, campaign.message_type, owner_id=owner_id)
+    notify_whatsapp_queued()
+    return {"message": f"WhatsApp messages queued: {queued}", "queued": queued}
+
+@router.post("/bulk/issue-offers", response_model=OfferBatchQueued, status_code=status.HTTP_202_ACCEPTED)
+def bulk_issue_offers(
+    selection: CandidateBulkSelection,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Issue offers to the shortlisted candidates among a selection
+
+    Returns a batch id at once; poll GET /candidates/offer-batches/{batch_id}
+    for progress. An offer batch runner claims the batch, renders the letters
+    on the offer render processes and creates all the batch's OfferLetter rows
+    in one transaction.
+    """
+    if current_user.role not in [UserRole.HR_SPOC, UserRole.ADMIN]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    candidate_ids = offer_candidate_ids(db, selection)
+    if not candidate_ids:
+        raise HTTPException(status_code=400, detail="No shortlisted candidates selected")
+    if len(candidate_ids) > OFFER_BULK_MAX_CANDIDATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{len(candidate_ids)} candidates selected; at most {OFFER_BULK_MAX_CANDIDATES} offers per batch",
+        )
+    batch = create_offer_batch(db, candidate_ids, current_user.id)
+    notify_offer_batch_queued()
+    return {"message": f"Offers queued: {batch.total}", "batch_id": batch.id, "total": batch.total,
+            "status": batch.status}
+
+@router.get("/offer-batches/{batch_id}", response_model=OfferBatch)
+def get_offer_batch(
+    batch_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Progress of a bulk offer issue, with the offers created once it is done"""
+    if current_user.role not in [UserRole.HR_SPOC, UserRole.ADMIN]:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    batch = db.get(OfferBatchModel, batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Offer batch not found")
+    return batch
+
 # WhatsApp Communication Endpoints
 @router.get("/{candidate_id}/whatsapp/", response_model=List[WhatsAppCommunication])
 async def get_whatsapp_communications(
@@ -263,7 +512,12 @@ async def send_whatsapp_message(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Send a WhatsApp message"""
+    """Queue a WhatsApp message for sending
+
+    The WhatsApp dispatcher sends it through the configured provider, retrying
+    temporary failures; its status goes Queued -> Sent (-> Delivered -> Read
+    from delivery receipts) or Failed, with the error.
+    """
     if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Access denied")
     
@@ -274,53 +528,146 @@ async def send_whatsapp_message(
     
     if communication is None:
         raise HTTPException(status_code=404, detail="Communication not found")
+    if communication.status in (WhatsAppMessageStatus.QUEUED, WhatsAppMessageStatus.SENDING):
+        return {"message": "WhatsApp message already queued", "communication": communication}
+    if communication.status not in (WhatsAppMessageStatus.PENDING, WhatsAppMessageStatus.FAILED):
+        raise HTTPException(status_code=409, detail=f"WhatsApp message already {communication.status.lower()}")
     
-    # Here you would integrate with WhatsApp API
-    # For now, we'll just update the status
-    communication.status = "Sent"
-    communication.sent_at = datetime.now()
+    queue_message(communication)
     db.commit()
     db.refresh(communication)
-    return {"message": "WhatsApp message sent", "communication": communication}
+    notify_whatsapp_queued()
+    return {"message": "WhatsApp message queued", "communication": communication}
+
+@router.get("/whatsapp/status", response_class=PlainTextResponse, include_in_schema=False)
+def verify_whatsapp_webhook(
+    mode: str = Query("", alias="hub.mode"),
+    verify_token: str = Query("", alias="hub.verify_token"),
+    challenge: str = Query("", alias="hub.challenge"),
+):
+    """Webhook verification handshake of the WhatsApp Cloud API"""
+    if mode != "subscribe" or not WHATSAPP_WEBHOOK_TOKEN or not secrets.compare_digest(verify_token, WHATSAPP_WEBHOOK_TOKEN):
+        raise HTTPException(status_code=403, detail="Access denied")
+    return challenge
+
+@router.post("/whatsapp/status")
+async def whatsapp_delivery_status(
+    request: Request,
+    token: str = Query(""),
+    db: Session = Depends(get_db),
+):
+    """Delivery receipts from the WhatsApp provider (its status callback)
+
+    Authenticated with ?token=WHATSAPP_WEBHOOK_TOKEN; the body is read by the
+    configured provider (see WhatsAppProvider.delivery_updates). Messages only
+    move forward: Sent -> Delivered -> Read, or Sent -> Failed.
+    """
+    if not WHATSAPP_WEBHOOK_TOKEN or not secrets.compare_digest(token, WHATSAPP_WEBHOOK_TOKEN):
+        raise HTTPException(status_code=403, detail="Access denied")
+    try:
+        updates = provider_class(WHATSAPP_PROVIDER).delivery_updates(await request.json())
+    except (KeyError, TypeError, ValueError, AttributeError):
+        raise HTTPException(status_code=400, detail="Unrecognised delivery status payload")
+    return {"updated": await run_in_threadpool(record_delivery_updates, db, updates)}
 
 # Resume Upload and Parsing
-@router.post("/{candidate_id}/upload-resume")
+def _queue_resume(db: Session, candidate_id: int, upload: StoredUpload, created_by: int) -> dict:
+    candidate = db.query(CandidateModel).filter(CandidateModel.id == candidate_id).first()
+    if candidate is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    # Stored once per distinct content, named by its SHA-256
+    file_path, _ = place_by_hash(upload, "uploads/resumes")
+    cached = get_or_create_resume_file(db, upload.sha256, file_path)
+
+    backend_url = "http://localhost:8000"
+    candidate.resume_url = f"{backend_url}/uploads/resumes/{os.path.basename(cached.file_path)}"
+    job = enqueue_resume_parse(db, candidate, cached.file_path, created_by=created_by, resume_file=cached)
+    db.commit()
+    if job.status == ResumeParseJobStatus.DONE:
+        return {"message": "Resume uploaded; parsed before", "job_id": job.id, "status": job.status,
+                "parsed": job.result}
+    notify_resume_queued()
+
+    return {"message": "Resume uploaded; parsing queued", "job_id": job.id, "status": job.status}
+
+@router.post("/{candidate_id}/upload-resume", status_code=status.HTTP_202_ACCEPTED,
+             openapi_extra=upload_openapi(RESUME_UPLOAD.field))
 async def upload_resume(
     candidate_id: int,
-    resume_file: UploadFile = File(...),
+    request: Request,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user)
 ):
+    """Save a resume and queue it for parsing
+
+    Multipart field `resume_file`, a .pdf or .docx. The body is streamed to
+    disk and checked while it arrives (app/core/uploads.py): wrong types are
+    refused with 415 and oversized files with 413 before they are received
+    in full. Parsing (text extraction plus a spaCy pass) runs on the resume
+    parser processes; poll GET /candidates/resume-jobs/{job_id} for the
+    parsed fields. The candidate is updated when the job finishes. A file
+    whose content (SHA-256) was parsed before shares the stored file and is
+    answered at once with the cached fields.
+    """
     if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    candidate = db.query(CandidateModel).filter(CandidateModel.id == candidate_id).first()
-    if candidate is None:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-
-    # Save file
-    upload_dir = "uploads/resumes"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_name = f"{candidate_id}_{resume_file.filename}"
-    file_path = os.path.join(upload_dir, file_name)
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(resume_file.file, buffer)
-
-    # Parse using spaCy
-    parsed_data = parse_resume_spacy(file_path)
-
-    if parsed_data:
-        backend_url = "http://localhost:8000"
-        candidate.resume_url = f"{backend_url}/uploads/resumes/{file_name}"
-        candidate.experience_details = parsed_data.get("experience_summary", "")
-        candidate.first_name = parsed_data.get("name", candidate.first_name)
-        candidate.email = parsed_data.get("email", candidate.email)
-        candidate.phone = parsed_data.get("phone", candidate.phone)
+    upload = (await receive_uploads(request, RESUME_UPLOAD))[0]
+    try:
+        # The session is synchronous: every query runs off the event loop
+        return await run_in_threadpool(_queue_resume, db, candidate_id, upload, current_user.id)
+    finally:
+        upload.discard()
+
+@router.post("/upload-resumes/", openapi_extra=upload_openapi(RESUME_BULK_UPLOAD.field, multiple=True))
+async def upload_resumes_bulk(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """Create or update candidates from a batch of resumes
+
+    Multipart field `files`: .pdf/.docx files and ZIP archives of them,
+    streamed to disk and checked as they arrive. Text is extracted in
+    parallel and all resumes are parsed in one spaCy nlp.pipe pass; a resume
+    updates the candidate with the same email or phone, otherwise it creates
+    one. The response reports per-file errors and resumes per second.
+    """
+    if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
+        raise HTTPException(status_code=403, detail="Access denied")
 
-        db.commit()
-        db.refresh(candidate)
+    uploads = await receive_uploads(request, RESUME_BULK_UPLOAD)
+    backend_url = "http://localhost:8000"
+    try:
+        report = await run_in_threadpool(
+            ingest_resumes, db, uploads, created_by=current_user.id,
+            upload_dir="uploads/resumes", url_prefix=f"{backend_url}/uploads/resumes/",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Invalid ZIP file")
+    finally:
+        # Resumes were moved into uploads/resumes; this drops ZIPs and rejected files
+        for upload in uploads:
+            upload.discard()
+    return report.as_response()
+
+@router.get("/resume-jobs/{job_id}", response_model=ResumeParseJob)
+def get_resume_parse_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    """Status of a resume parse job, with the parsed fields once it is done"""
+    if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
+        raise HTTPException(status_code=403, detail="Access denied")
 
-    return {"message": "Resume uploaded and parsed using spaCy", "parsed": parsed_data}
+    job = db.get(ResumeParseJobModel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Resume parse job not found")
+    return job
 
 # Bulk Import from WhatsApp
 @router.post("/import-from-whatsapp")
@@ -345,6 +692,16 @@ async def import_from_whatsapp(
         "created_by": current_user.id
     }
     
+    # Someone who messages again updates their existing candidate
+    db_candidate = find_duplicate(db, candidate_data["phone"], candidate_data["email"])
+    if db_candidate is not None:
+        for field in ("first_name", "last_name", "email"):
+            if candidate_data[field] and not getattr(db_candidate, field):
+                setattr(db_candidate, field, candidate_data[field])
+        db.commit()
+        db.refresh(db_candidate)
+        return {"message": "Candidate already exists; updated from WhatsApp", "candidate": db_candidate}
+
     db_candidate = CandidateModel(**candidate_data)
     db.add(db_candidate)
     db.commit()
@@ -354,125 +711,138 @@ async def import_from_whatsapp(
 # Candidate Search and Filtering
 @router.get("/search/", response_model=List[Candidate])
 async def search_candidates(
+    response: Response,
     query: str = Query(..., description="Search query"),
     skills: Optional[str] = Query(None, description="Comma-separated skills"),
     experience_min: Optional[int] = Query(None, description="Minimum experience years"),
     experience_max: Optional[int] = Query(None, description="Maximum experience years"),
     location: Optional[str] = Query(None, description="Location"),
-    skip: int = 0,
-    db: Session = Depends(get_db),
+    mode: str = Query("fulltext", pattern="^(fulltext|contains)$", description="fulltext: ranked word/\"phrase\"/prefix* search; contains: substring match"),
+    page: CursorPage = Depends(),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    """Search candidates with various filters"""
+    """Search candidates with various filters
+
+    Full-text mode returns the best matches first; every word, "quoted phrase"
+    and prefix* in the query (and every skill) must match. Databases without a
+    full-text index fall back to substring matching, newest first.
+    """
     if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    query_filter = db.query(CandidateModel)
-    
-    # Basic text search
-    if query:
-        query_filter = query_filter.filter(
-            (CandidateModel.first_name.contains(query)) |
-            (CandidateModel.last_name.contains(query)) |
-            (CandidateModel.email.contains(query)) |
-            (CandidateModel.education_qualification_short.contains(query))
-        )
-    
-    # Skills filter
-    if skills:
-        skills_list = [skill.strip() for skill in skills.split(",")]
-        for skill in skills_list:
-            query_filter = query_filter.filter(
-                CandidateModel.experience_details.contains(skill)
-            )
-    
-    # Experience filter
-    if experience_min is not None:
-        query_filter = query_filter.filter(CandidateModel.experience_years >= experience_min)
-    if experience_max is not None:
-        query_filter = query_filter.filter(CandidateModel.experience_years <= experience_max)
+    selected = parse_fields(fields, Candidate)
+    schema = sparse_schema(Candidate, selected)
+    query_filter = select(CandidateModel).options(
+        *load_options(CandidateModel, selected, CANDIDATE_RELATIONSHIP_LOADS)
+    )
+    filters = search_filters(experience_min, experience_max, location)
     
-    # Location filter
-    if location:
-        query_filter = query_filter.filter(
-            (CandidateModel.location_city.contains(location)) |
-            (CandidateModel.location_state.contains(location))
+    if mode == "fulltext":
+        terms = parse_search_query(query)
+        if not terms:
+            return []
+        statement = fulltext_search(
+            query_filter, db.bind.dialect.name, terms, parse_skills(skills), page, filters
         )
-    
-    candidates = query_filter.offset(skip).all()
-    return candidates
+        if statement is not None:
+            result = await db.execute(statement)
+            rows = page.finish(result.all(), response, key=fulltext_cursor_key)
+            return json_list_response(schema, [row.Candidate for row in rows], response)
 
+    query_filter = contains_search(query_filter, query, skills)
+    result = await db.execute(page.apply(query_filter.where(*filters), CandidateModel.id))
+    candidates = page.finish(result.scalars().all(), response)
+    return json_list_response(schema, candidates, response)
 
-@router.post("/upload-excel/")
-async def upload_candidates_excel(
-    file: UploadFile = File(...), db: Session = Depends(get_db), current_user = Depends(get_current_user)
-):
 
-    # Role-based access control
-    if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
+@router.get("/export/")
+def export_candidates(
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    status: Optional[CandidateStatus] = None,
+    source: Optional[CandidateSource] = None,
+    is_in_pool: Optional[bool] = None,
+    query: Optional[str] = Query(None, description="Search query, as in /candidates/search/"),
+    skills: Optional[str] = Query(None, description="Comma-separated skills"),
+    experience_min: Optional[int] = Query(None, description="Minimum experience years"),
+    experience_max: Optional[int] = Query(None, description="Maximum experience years"),
+    location: Optional[str] = Query(None, description="Location"),
+    mode: str = Query("fulltext", pattern="^(fulltext|contains)$"),
+    current_user = Depends(get_current_user)
+):
+    """Download the candidates matching the list and search filters as CSV or XLSX
+
+    Visibility is that of GET /candidates/; the search filters need search
+    access, and full-text matches come best first (otherwise newest first).
+    Rows are read through a server-side cursor in CANDIDATE_EXPORT_BATCH_SIZE
+    batches and streamed, so memory use doesn't grow with the row count.
+    """
+    searching = any(value is not None for value in (query, skills, experience_min, experience_max, location))
+    if searching and current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file format. Please upload an Excel file."
-        )
-
-    try:
-        contents = await file.read()
-        df = pd.read_excel(BytesIO(contents))
+    statement = list_filters(select(*EXPORT_SELECT_COLUMNS), status, source, is_in_pool, current_user)
+    filters = search_filters(experience_min, experience_max, location)
+    ranked = None
+    if mode == "fulltext" and query:
+        terms = parse_search_query(query)
+        if not terms:
+            filters.append(false())
+        else:
+            # Every match, not just the newest SEARCH_RANK_WINDOW
+            ranked = fulltext_search(statement, engine.dialect.name, terms, parse_skills(skills), None, filters,
+                                     rank_window=0)
+    if ranked is not None:
+        statement = ranked
+    else:
+        statement = contains_search(statement, query, skills).where(*filters).order_by(CandidateModel.id.desc())
 
-        # Normalize column names
-        df.columns = df.columns.str.strip().str.lower()
+    batches = export_rows(SessionLocal, statement)
+    filename = f"candidates-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    if format == "xlsx":
+        content, media_type = xlsx_chunks(batches), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    else:
+        content, media_type = csv_chunks(batches), "text/csv"
+    return StreamingResponse(content, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
 
-        # REQUIRED COLUMNS (changed)
-        required_columns = ["first_name", "phone"]
 
-        missing_cols = [col for col in required_columns if col not in df.columns]
-        if missing_cols:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Missing required columns: {', '.join(missing_cols)}"
-            )
+@router.post("/upload-excel/", openapi_extra=upload_openapi(CANDIDATE_EXCEL_UPLOAD.field))
+async def upload_candidates_excel(
+    request: Request, db: Session = Depends(get_db), current_user = Depends(get_current_user)
+):
+    """Bulk import candidates from the first sheet of an .xlsx file
 
-        # Insert candidates
-        for idx, row in df.iterrows():
-            try:
-                candidate = CandidateModel(
-                    first_name=str(row["first_name"]).strip() if pd.notna(row["first_name"]) else None,
-                    last_name=str(row["last_name"]).strip() if "last_name" in df.columns and pd.notna(row.get("last_name")) else None,
-                    email=str(row["email"]).strip() if "email" in df.columns and pd.notna(row.get("email")) else None,
-                    phone=str(row["phone"]).strip() if pd.notna(row["phone"]) else None,
-
-                    # Optional fields
-                    location_state=str(row.get("location_state", None)).strip() if pd.notna(row.get("location_state")) else None,
-                    location_city=str(row.get("location_city", None)).strip() if pd.notna(row.get("location_city")) else None,
-                    location_area=str(row.get("location_area", None)).strip() if pd.notna(row.get("location_area")) else None,
-                    location_pincode=str(row.get("location_pincode", None)).strip() if pd.notna(row.get("location_pincode")) else None,
-                    education_qualification_short=str(row.get("education_qualification_short", None)).strip()
-                        if pd.notna(row.get("education_qualification_short")) else None,
-
-                    created_by=current_user.id,
-                )
-                db.add(candidate)
-
-            except Exception as row_err:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Row {idx + 2} error: {row_err}"
-                )
+    Multipart field `file`. The upload is streamed to a temporary file
+    (refused early when it isn't an .xlsx or is over CANDIDATE_IMPORT_MAX_BYTES);
+    rows are then streamed and inserted in chunks in the threadpool. Rows
+    that fail validation are listed in `errors` (by sheet row number) and the
+    rest are still imported.
+    """
 
-        db.commit()
-        return {"message": f"Candidates uploaded successfully: {len(df)}"}
+    # Role-based access control
+    if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
+        raise HTTPException(status_code=403, detail="Access denied")
 
-    except HTTPException:
-        raise
+    upload = (await receive_uploads(request, CANDIDATE_EXCEL_UPLOAD))[0]
+    try:
+        with open(upload.path, "rb") as file:
+            report = await run_in_threadpool(import_candidates, db, file, created_by=current_user.id)
+        return report.as_response()
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (zipfile.BadZipFile, KeyError, OSError):
+        raise HTTPException(status_code=400, detail="Invalid file format. Please upload an Excel file.")
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(
             status_code=500,
             detail=f"Unexpected error: {e}"
         )
+    finally:
+        upload.discard()
 
 
 
@@ -492,6 +862,8 @@ async def download_template():
         "education_qualification_short",
     ]
 
+    import pandas as pd
+
     df = pd.DataFrame(columns=template_columns)  # Only headers, no dummy row
 
     output_dir = "templates"
@@ -509,26 +881,14 @@ async def download_template():
 
 
 def generate_offer_pdf(candidate):
-    file_name = f"offer_{candidate.id}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.pdf"
-    file_path = OFFER_DIR / file_name
-
-    c = canvas.Canvas(str(file_path), pagesize=LETTER)
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(200, 750, "OFFER LETTER")
-    c.setFont("Helvetica", 12)
-    c.drawString(100, 700, f"Candidate: {candidate.first_name} {candidate.last_name}")
-    c.drawString(100, 680, f"Date: {datetime.utcnow().strftime('%d-%m-%Y')}")
-    c.save()
+    # Drawn on the cached letterhead and fonts, written atomically
+    content = OfferContent(candidate.id, candidate.first_name, candidate.last_name, datetime.utcnow())
+    file_name = render_offer_pdf(content, str(OFFER_DIR))
 
     # Return static URL path (relative to FastAPI mount)
     return f"/offers/{file_name}"
 
 
-def send_offer_email(email, file_path):
-    # TODO: Replace with actual email integration
-    print(f"📧 Sending offer letter {file_path} to {email}")
-
-
 @router.post("/{candidate_id}/issue-offer")
 def issue_offer(candidate_id: int, db: Session = Depends(get_db)):
     candidate = db.query(CandidateModel).get(candidate_id)
@@ -588,13 +948,11 @@ def accept_offer(offer_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/offers/all")
-def list_offers(request: Request, db: Session = Depends(get_db)):
+def list_offers(request: Request, response: Response, page: CursorPage = Depends(), db: Session = Depends(get_db)):
     base_url = ALLOWED_ORIGINS[0] if ALLOWED_ORIGINS else "http://localhost:3000"
-    offers = (
-        db.query(OfferLetter)
-        .options(joinedload(OfferLetter.candidate))
-        .order_by(OfferLetter.id.desc())
-        .all()
+    offers = page.finish(
+        page.apply(db.query(OfferLetter).options(joinedload(OfferLetter.candidate)), OfferLetter.id).all(),
+        response,
     )
 
     return [
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, and_, case, select
 from typing import List, Dict, Any
 from datetime import datetime, timedelta
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.core.security import get_current_user
 from app.models.job import Job as JobModel, JobStatus
 from app.models.candidate import Candidate as CandidateModel, CandidateStatus, CandidateSource
@@ -12,32 +12,39 @@ from app.models.user import UserRole
 
 router = APIRouter()
 
+async def _count(db: AsyncSession, model, *criteria) -> int:
+    """SELECT COUNT(*) for a model with optional filter criteria"""
+    stmt = select(func.count()).select_from(model)
+    if criteria:
+        stmt = stmt.where(*criteria)
+    return await db.scalar(stmt)
+
 @router.get("/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get dashboard statistics for the frontend"""
     try:
         # Job statistics
-        total_jobs = db.query(JobModel).count()
-        active_jobs = db.query(JobModel).filter(JobModel.status == JobStatus.APPROVED).count()
-        pending_approval_jobs = db.query(JobModel).filter(JobModel.status == JobStatus.PENDING_APPROVAL).count()
-        draft_jobs = db.query(JobModel).filter(JobModel.status == JobStatus.DRAFT).count()
+        total_jobs = await _count(db, JobModel)
+        active_jobs = await _count(db, JobModel, JobModel.status == JobStatus.APPROVED)
+        pending_approval_jobs = await _count(db, JobModel, JobModel.status == JobStatus.PENDING_APPROVAL)
+        draft_jobs = await _count(db, JobModel, JobModel.status == JobStatus.DRAFT)
         
         # Candidate statistics
-        total_candidates = db.query(CandidateModel).count()
-        new_candidates = db.query(CandidateModel).filter(CandidateModel.status == CandidateStatus.NEW).count()
-        shortlisted_candidates = db.query(CandidateModel).filter(CandidateModel.status == CandidateStatus.SHORTLISTED).count()
-        # interviewed_candidates = db.query(CandidateModel).filter(CandidateModel.status == CandidateStatus.INTERVIEWED).count()
-        pool_candidates = db.query(CandidateModel).filter(CandidateModel.is_in_pool == True).count()
+        total_candidates = await _count(db, CandidateModel)
+        new_candidates = await _count(db, CandidateModel, CandidateModel.status == CandidateStatus.NEW)
+        shortlisted_candidates = await _count(db, CandidateModel, CandidateModel.status == CandidateStatus.SHORTLISTED)
+        # interviewed_candidates = await _count(db, CandidateModel, CandidateModel.status == CandidateStatus.INTERVIEWED)
+        pool_candidates = await _count(db, CandidateModel, CandidateModel.is_in_pool == True)
         
         # Application statistics
-        total_applications = db.query(ApplicationModel).count()
-        applied_applications = db.query(ApplicationModel).filter(ApplicationModel.status == ApplicationStatus.APPLIED).count()
-        shortlisted_applications = db.query(ApplicationModel.status == ApplicationStatus.SHORTLISTED).count()
-        # interviewed_applications = db.query(ApplicationModel.status == ApplicationStatus.INTERVIEWED).count()
-        hired_applications = db.query(ApplicationModel.status == ApplicationStatus.HIRED).count()
+        total_applications = await _count(db, ApplicationModel)
+        applied_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.APPLIED)
+        shortlisted_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.SHORTLISTED)
+        # interviewed_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.INTERVIEWED)
+        hired_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.HIRED)
         
         # Calculate changes (mock data for now)
         jobs_change = "+12%" if total_jobs > 0 else "+0%"
@@ -111,7 +118,7 @@ async def get_dashboard_stats(
 
 @router.get("/activities")
 async def get_dashboard_activities(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get recent activities for the dashboard"""
@@ -119,7 +126,7 @@ async def get_dashboard_activities(
         activities = []
         
         # Get recent jobs
-        recent_jobs = db.query(JobModel).order_by(JobModel.created_at.desc()).limit(5).all()
+        recent_jobs = (await db.execute(select(JobModel).order_by(JobModel.created_at.desc()).limit(5))).scalars().all()
         for job in recent_jobs:
             activities.append({
                 "id": f"job_{job.id}",
@@ -129,7 +136,7 @@ async def get_dashboard_activities(
             })
         
         # Get recent candidates
-        recent_candidates = db.query(CandidateModel).order_by(CandidateModel.created_at.desc()).limit(5).all()
+        recent_candidates = (await db.execute(select(CandidateModel).order_by(CandidateModel.created_at.desc()).limit(5))).scalars().all()
         for candidate in recent_candidates:
             activities.append({
                 "id": f"candidate_{candidate.id}",
@@ -139,7 +146,7 @@ async def get_dashboard_activities(
             })
         
         # Get recent applications
-        recent_applications = db.query(ApplicationModel).order_by(ApplicationModel.applied_at.desc()).limit(5).all()
+        recent_applications = (await db.execute(select(ApplicationModel).order_by(ApplicationModel.applied_at.desc()).limit(5))).scalars().all()
         for application in recent_applications:
             activities.append({
                 "id": f"application_{application.id}",
@@ -166,7 +173,7 @@ async def get_dashboard_activities(
 
 @router.get("/recruitment-overview")
 async def get_recruitment_overview(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get recruitment overview statistics"""
@@ -174,30 +181,30 @@ async def get_recruitment_overview(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Job statistics
-    total_jobs = db.query(JobModel).count()
-    active_jobs = db.query(JobModel).filter(JobModel.status == JobStatus.ACTIVE).count()
-    pending_approval_jobs = db.query(JobModel).filter(JobModel.status == JobStatus.PENDING_APPROVAL).count()
-    draft_jobs = db.query(JobModel).filter(JobModel.status == JobStatus.DRAFT).count()
+    total_jobs = await _count(db, JobModel)
+    active_jobs = await _count(db, JobModel, JobModel.status == JobStatus.ACTIVE)
+    pending_approval_jobs = await _count(db, JobModel, JobModel.status == JobStatus.PENDING_APPROVAL)
+    draft_jobs = await _count(db, JobModel, JobModel.status == JobStatus.DRAFT)
     
     # Candidate statistics
-    total_candidates = db.query(CandidateModel).count()
-    new_candidates = db.query(CandidateModel).filter(CandidateModel.status == CandidateStatus.NEW).count()
-    shortlisted_candidates = db.query(CandidateModel).filter(CandidateModel.status == CandidateStatus.SHORTLISTED).count()
-    # interviewed_candidates = db.query(CandidateModel).filter(CandidateModel.status == CandidateStatus.INTERVIEWED).count()
-    pool_candidates = db.query(CandidateModel).filter(CandidateModel.is_in_pool == True).count()
+    total_candidates = await _count(db, CandidateModel)
+    new_candidates = await _count(db, CandidateModel, CandidateModel.status == CandidateStatus.NEW)
+    shortlisted_candidates = await _count(db, CandidateModel, CandidateModel.status == CandidateStatus.SHORTLISTED)
+    # interviewed_candidates = await _count(db, CandidateModel, CandidateModel.status == CandidateStatus.INTERVIEWED)
+    pool_candidates = await _count(db, CandidateModel, CandidateModel.is_in_pool == True)
     
     # Application statistics
-    total_applications = db.query(ApplicationModel).count()
-    applied_applications = db.query(ApplicationModel).filter(ApplicationModel.status == ApplicationStatus.APPLIED).count()
-    shortlisted_applications = db.query(ApplicationModel).filter(ApplicationModel.status == ApplicationStatus.SHORTLISTED).count()
-    interviewed_applications = db.query(ApplicationModel).filter(ApplicationModel.status == ApplicationStatus.INTERVIEWED).count()
-    hired_applications = db.query(ApplicationModel).filter(ApplicationModel.status == ApplicationStatus.HIRED).count()
+    total_applications = await _count(db, ApplicationModel)
+    applied_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.APPLIED)
+    shortlisted_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.SHORTLISTED)
+    interviewed_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.INTERVIEWED)
+    hired_applications = await _count(db, ApplicationModel, ApplicationModel.status == ApplicationStatus.HIRED)
     
     # Source breakdown
-    source_stats = db.query(
+    source_stats = (await db.execute(select(
         CandidateModel.source,
         func.count(CandidateModel.id).label('count')
-    ).group_by(CandidateModel.source).all()
+    ).group_by(CandidateModel.source))).all()
     
     return {
         "jobs": {
@@ -228,7 +235,7 @@ async def get_recruitment_overview(
 @router.get("/recent-activities")
 async def get_recent_activities(
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get recent recruitment activities"""
@@ -236,13 +243,13 @@ async def get_recent_activities(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Recent job activities
-    recent_jobs = db.query(JobModel).order_by(JobModel.created_at.desc()).limit(limit).all()
+    recent_jobs = (await db.execute(select(JobModel).order_by(JobModel.created_at.desc()).limit(limit))).scalars().all()
     
     # Recent candidate activities
-    recent_candidates = db.query(CandidateModel).order_by(CandidateModel.created_at.desc()).limit(limit).all()
+    recent_candidates = (await db.execute(select(CandidateModel).order_by(CandidateModel.created_at.desc()).limit(limit))).scalars().all()
     
     # Recent application activities
-    recent_applications = db.query(ApplicationModel).order_by(ApplicationModel.applied_at.desc()).limit(limit).all()
+    recent_applications = (await db.execute(select(ApplicationModel).order_by(ApplicationModel.applied_at.desc()).limit(limit))).scalars().all()
     
     activities = []
     
@@ -283,22 +290,22 @@ async def get_recent_activities(
 
 @router.get("/pending-approvals")
 async def get_pending_approvals(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get jobs pending approval"""
     if current_user.role not in [UserRole.HR_SPOC, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    pending_jobs = db.query(JobModel).filter(
+    pending_jobs = (await db.execute(select(JobModel).where(
         JobModel.status == JobStatus.PENDING_APPROVAL
-    ).all()
+    ))).scalars().all()
     
     return pending_jobs
 
 @router.get("/upcoming-interviews")
 async def get_upcoming_interviews(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get upcoming interviews"""
@@ -308,26 +315,26 @@ async def get_upcoming_interviews(
     # Get interviews scheduled in the next 7 days
     next_week = datetime.now() + timedelta(days=7)
     
-    upcoming_interviews = db.query(ApplicationModel).filter(
+    upcoming_interviews = (await db.execute(select(ApplicationModel).where(
         and_(
             ApplicationModel.interview_scheduled_at.isnot(None),
             ApplicationModel.interview_scheduled_at >= datetime.now(),
             ApplicationModel.interview_scheduled_at <= next_week
         )
-    ).all()
+    ))).scalars().all()
     
     return upcoming_interviews
 
 @router.get("/candidate-pool-stats")
 async def get_candidate_pool_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get candidate pool statistics"""
     if current_user.role not in [UserRole.HR_SPOC, UserRole.RECRUITER, UserRole.ADMIN]:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    pool_candidates = db.query(CandidateModel).filter(CandidateModel.is_in_pool == True).all()
+    pool_candidates = (await db.execute(select(CandidateModel).where(CandidateModel.is_in_pool == True))).scalars().all()
     
     # Skills breakdown in pool
     skills_count = {}
@@ -357,7 +364,7 @@ async def get_candidate_pool_stats(
 
 @router.get("/recruitment-funnel")
 async def get_recruitment_funnel(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get recruitment funnel data"""
@@ -368,22 +375,22 @@ async def get_recruitment_funnel(
     thirty_days_ago = datetime.now() - timedelta(days=30)
     
     # Applications by status
-    applications_by_status = db.query(
+    applications_by_status = (await db.execute(select(
         ApplicationModel.status,
         func.count(ApplicationModel.id).label('count')
-    ).filter(
+    ).where(
         ApplicationModel.applied_at >= thirty_days_ago
-    ).group_by(ApplicationModel.status).all()
+    ).group_by(ApplicationModel.status))).all()
     
     # Source effectiveness
-    source_effectiveness = db.query(
+    source_effectiveness = (await db.execute(select(
         CandidateModel.source,
         func.count(CandidateModel.id).label('total'),
-        func.sum(func.case([(CandidateModel.status == CandidateStatus.SHORTLISTED, 1)], else_=0)).label('shortlisted'),
-        func.sum(func.case([(CandidateModel.status == CandidateStatus.HIRED, 1)], else_=0)).label('hired')
-    ).filter(
+        func.sum(case((CandidateModel.status == CandidateStatus.SHORTLISTED, 1), else_=0)).label('shortlisted'),
+        func.sum(case((CandidateModel.status == CandidateStatus.HIRED, 1), else_=0)).label('hired')
+    ).where(
         CandidateModel.created_at >= thirty_days_ago
-    ).group_by(CandidateModel.source).all()
+    ).group_by(CandidateModel.source))).all()
     
     return {
         "funnel": [
@@ -404,7 +411,7 @@ async def get_recruitment_funnel(
 
 @router.get("/department-stats")
 async def get_department_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get recruitment statistics by department"""
@@ -412,19 +419,19 @@ async def get_department_stats(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Jobs by department
-    jobs_by_department = db.query(
+    jobs_by_department = (await db.execute(select(
         JobModel.department_id,
         func.count(JobModel.id).label('total_jobs'),
-        func.sum(func.case([(JobModel.status == JobStatus.ACTIVE, 1)], else_=0)).label('active_jobs')
-    ).group_by(JobModel.department_id).all()
+        func.sum(case((JobModel.status == JobStatus.ACTIVE, 1), else_=0)).label('active_jobs')
+    ).group_by(JobModel.department_id))).all()
     
     # Applications by department (through jobs)
-    applications_by_department = db.query(
+    applications_by_department = (await db.execute(select(
         JobModel.department_id,
         func.count(ApplicationModel.id).label('total_applications'),
-        func.sum(func.case([(ApplicationModel.status == ApplicationStatus.SHORTLISTED, 1)], else_=0)).label('shortlisted'),
-        func.sum(func.case([(ApplicationModel.status == ApplicationStatus.HIRED, 1)], else_=0)).label('hired')
-    ).join(ApplicationModel, JobModel.id == ApplicationModel.job_id).group_by(JobModel.department_id).all()
+        func.sum(case((ApplicationModel.status == ApplicationStatus.SHORTLISTED, 1), else_=0)).label('shortlisted'),
+        func.sum(case((ApplicationModel.status == ApplicationStatus.HIRED, 1), else_=0)).label('hired')
+    ).join(ApplicationModel, JobModel.id == ApplicationModel.job_id).group_by(JobModel.department_id))).all()
     
     return {
         "jobs_by_department": [
@@ -450,7 +457,7 @@ async def get_department_stats(
 
 @router.get("/recruiter-performance")
 async def get_recruiter_performance(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
     """Get recruiter performance metrics"""
@@ -460,15 +467,15 @@ async def get_recruiter_performance(
     # Recruiter performance (last 30 days)
     thirty_days_ago = datetime.now() - timedelta(days=30)
     
-    recruiter_stats = db.query(
+    recruiter_stats = (await db.execute(select(
         JobModel.recruiter_id,
         func.count(JobModel.id).label('assigned_jobs'),
         func.count(ApplicationModel.id).label('total_applications'),
-        func.sum(func.case([(ApplicationModel.status == ApplicationStatus.SHORTLISTED, 1)], else_=0)).label('shortlisted'),
-        func.sum(func.case([(ApplicationModel.status == ApplicationStatus.HIRED, 1)], else_=0)).label('hired')
-    ).join(ApplicationModel, JobModel.id == ApplicationModel.job_id).filter(
+        func.sum(case((ApplicationModel.status == ApplicationStatus.SHORTLISTED, 1), else_=0)).label('shortlisted'),
+        func.sum(case((ApplicationModel.status == ApplicationStatus.HIRED, 1), else_=0)).label('hired')
+    ).join(ApplicationModel, JobModel.id == ApplicationModel.job_id).where(
         JobModel.created_at >= thirty_days_ago
-    ).group_by(JobModel.recruiter_id).all()
+    ).group_by(JobModel.recruiter_id))).all()
     
     return [
         {
@@ -1,51 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.schemas.employee import Employee, EmployeeCreate, EmployeeUpdate
 from app.models.employee import Employee as EmployeeModel
 
 router = APIRouter()
 
 @router.get("/", response_model=List[Employee])
-async def get_employees(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    employees = db.query(EmployeeModel).offset(skip).limit(limit).all()
-    return employees
+async def get_employees(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(EmployeeModel).offset(skip).limit(limit))
+    return result.scalars().all()
 
 @router.get("/{employee_id}", response_model=Employee)
-async def get_employee(employee_id: int, db: Session = Depends(get_db)):
-    employee = db.query(EmployeeModel).filter(EmployeeModel.id == employee_id).first()
+async def get_employee(employee_id: int, db: AsyncSession = Depends(get_async_db)):
+    employee = await db.get(EmployeeModel, employee_id)
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
 
 @router.post("/", response_model=Employee)
-async def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
+async def create_employee(employee: EmployeeCreate, db: AsyncSession = Depends(get_async_db)):
     db_employee = EmployeeModel(**employee.dict())
     db.add(db_employee)
-    db.commit()
-    db.refresh(db_employee)
+    await db.commit()
+    await db.refresh(db_employee)
     return db_employee
 
 @router.put("/{employee_id}", response_model=Employee)
-async def update_employee(employee_id: int, employee: EmployeeUpdate, db: Session = Depends(get_db)):
-    db_employee = db.query(EmployeeModel).filter(EmployeeModel.id == employee_id).first()
+async def update_employee(employee_id: int, employee: EmployeeUpdate, db: AsyncSession = Depends(get_async_db)):
+    db_employee = await db.get(EmployeeModel, employee_id)
     if db_employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
-    
+
     for field, value in employee.dict(exclude_unset=True).items():
         setattr(db_employee, field, value)
-    
-    db.commit()
-    db.refresh(db_employee)
+
+    await db.commit()
+    await db.refresh(db_employee)
     return db_employee
 
 @router.delete("/{employee_id}")
-async def delete_employee(employee_id: int, db: Session = Depends(get_db)):
-    db_employee = db.query(EmployeeModel).filter(EmployeeModel.id == employee_id).first()
+async def delete_employee(employee_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_employee = await db.get(EmployeeModel, employee_id)
     if db_employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
-    
-    db.delete(db_employee)
-    db.commit()
-    return {"message": "Employee deleted successfully"} 
\ No newline at end of file
+
+    await db.delete(db_employee)
+    await db.commit()
+    return {"message": "Employee deleted successfully"}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
@@ -10,6 +10,7 @@ from app.models.candidate import Candidate
 from sqlalchemy import func
 from app.core.database import get_db
 from app.core.security import get_current_user
+from app.core.pagination import CursorPage
 from app.models.user import UserRole
 
 router = APIRouter()
@@ -347,9 +348,9 @@ def create_interview_session(
 
 # ---------- GET ALL SESSIONS ----------
 @router.get("/interview-sessions", response_model=list[InterviewSessionOut])
-def list_interview_sessions(db: Session = Depends(get_db)):
-    sessions = db.query(InterviewSession).all()
-    return sessions
+def list_interview_sessions(response: Response, page: CursorPage = Depends(), db: Session = Depends(get_db)):
+    sessions = page.apply(db.query(InterviewSession), InterviewSession.id).all()
+    return page.finish(sessions, response)
 
 
 # ---------- CONDUCT INTERVIEW ----------
@@ -1,12 +1,13 @@
 # app/routers/interviews.py
 from typing import List, Optional, Any, Dict
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 # import your utils
 from app.core.database import get_db
+from app.core.conditional import is_conditional, make_etag, matches, not_modified, set_validators, version_column
 from app.core.security import get_current_user  # adapt to your project
 from app.models.candidate import Candidate as CandidateModel, CandidateStatus
 from app.models.job import Job as JobModel
@@ -18,14 +19,37 @@ from app.schemas.interviews import *
 from app.schemas.application import *
 from app.schemas.interviews import RoundStartRequest
 import json
-import openai
 from app.core.config import OPENAI_API_KEY
 
 router = APIRouter()
 
 
+def _application_validators(application_id: int, versions):
+    etag = make_etag("application", application_id, *versions)
+    return etag, max((version for version in versions if version is not None), default=None)
+
+
 @router.get("/{application_id}", response_model=Application)
-def get_application(application_id: int, db: Session = Depends(get_db)):
+def get_application(application_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
+    # The response has fields of the application, its candidate and its job,
+    # so all three versions make up the ETag
+    if is_conditional(request):
+        versions = (
+            db.query(
+                version_column(ApplicationModel, created="applied_at"),
+                version_column(CandidateModel),
+                version_column(JobModel),
+            )
+            .outerjoin(CandidateModel, CandidateModel.id == ApplicationModel.candidate_id)
+            .outerjoin(JobModel, JobModel.id == ApplicationModel.job_id)
+            .filter(ApplicationModel.id == application_id)
+            .first()
+        )
+        if versions is not None:
+            etag, last_modified = _application_validators(application_id, versions)
+            if matches(request, etag, last_modified):
+                return not_modified(etag, last_modified)
+
     application = (
         db.query(ApplicationModel)
         .filter(ApplicationModel.id == application_id)
@@ -41,6 +65,12 @@ def get_application(application_id: int, db: Session = Depends(get_db)):
     if not candidate or not job:
         raise HTTPException(status_code=400, detail="Invalid application links")
 
+    set_validators(response, *_application_validators(application_id, (
+        application.updated_at or application.applied_at,
+        candidate.updated_at or candidate.created_at,
+        job.updated_at or job.created_at,
+    )))
+
     # Build response schema
     return {
         "id": application.id,
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
-from app.core.database import get_db
+from app.core.config import POOL_MATCH_MAX_LIMIT
+from app.core.database import get_db, get_async_db, get_read_db
 from app.core.security import get_current_user
+from app.core.pagination import CursorPage
+from app.core.conditional import (
+    VERSION_FIELDS, collection_etag, is_conditional, make_etag, matches, not_modified, page_version_query,
+    page_versions, set_validators, version_column,
+)
+from app.core.fieldsets import FIELDS_DESCRIPTION, load_options, parse_fields, sparse_schema
+from app.core.responses import json_list_response
 from app.schemas.job import *
 from app.schemas.candidate import Candidate
 from app.schemas.interviews import QuestionBase
@@ -14,19 +23,28 @@ from app.models.user import UserRole
 from app.models.candidate import Candidate as CandidateModel
 from app.models.application import Application as ApplicationModel, ApplicationStatus
 from app.models.interview import Question as QuestionModel
-from app.routers.match_pool_utils import match_pool_candidates_to_job, extract_skills, parse_experience_range
+from app.routers.match_pool_utils import match_pool_candidates_to_job, pool_candidate_counts
+from app.routers.pool_scoring_utils import rank_pool_candidates
 from app.models.interview import RoundType
-from sqlalchemy import func, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import joinedload, selectinload
 
 
 router = APIRouter()
 
+# Job responses include department and created_by_user, which an AsyncSession can't lazy-load
+JOB_RELATIONSHIP_LOADS = {
+    "created_by_user": joinedload(JobModel.created_by_user),
+    "department": selectinload(JobModel.department),
+}
+JOB_LOAD_OPTIONS = tuple(JOB_RELATIONSHIP_LOADS.values())
+
 
 
 class JobMinimal(BaseModel):
     id: int
     position_title: str
+    position_code: Optional[str] = None
 
     class Config:
         orm_mode = True
@@ -39,72 +57,66 @@ def get_jobs_minimal(
 ):
 
     jobs = (
-        db.query(JobModel.id, JobModel.position_title)
+        db.query(JobModel.id, JobModel.position_title, JobModel.position_code)
         .order_by(JobModel.position_title.asc())
         .all()
     )
 
     return [
-        {"id": job.id, "position_title": job.position_title}
+        {"id": job.id, "position_title": job.position_title, "position_code": job.position_code}
         for job in jobs
     ]
 
 
-def get_pool_candidates_to_job(job: JobModel, db: Session) -> List[CandidateModel]:
-    # Fetch all pool candidates
-    pool_candidates = db.query(CandidateModel).filter(CandidateModel.is_in_pool == True).all()
-
-    # Parse required job skills and experience
-    required_skills = extract_skills(job.required_skills or "")
-    exp_min, exp_max = parse_experience_range(job.experience_level or "")
-
-    matched = []
-    for candidate in pool_candidates:
-        # Make sure candidate has experience details
-        candidate_skills = extract_skills(candidate.cover_letter or "")
-        skill_match = bool(required_skills.intersection(candidate_skills))
-
-        # Experience matching
-        exp_match = True
-        if exp_min is not None and exp_max is not None:
-            if candidate.experience_years is None:
-                exp_match = False
-            else:
-                exp_match = exp_min <= candidate.experience_years <= exp_max
+def candidates_by_id(db: Session, ids: List[int]) -> dict:
+    return {candidate.id: candidate for candidate in db.query(CandidateModel).filter(CandidateModel.id.in_(ids))}
 
-        # Add to matched if both conditions are met
-        if skill_match and exp_match:
-            matched.append(candidate)
-
-        # Stop if enough matches for job vacancies
-        if len(matched) >= (job.number_of_vacancies or 1):
-            break
+def get_pool_candidates_to_job(job: JobModel, db: Session) -> List[CandidateModel]:
+    """The best-fitting pool candidates for the job's vacancies, best first"""
+    matches = rank_pool_candidates(db, job, job.number_of_vacancies or 1)
+    candidates = candidates_by_id(db, [match.candidate_id for match in matches])
+    # A candidate deleted since the matrix was built has no row
+    return [candidates[match.candidate_id] for match in matches if match.candidate_id in candidates]
 
-    return matched
+def check_job_access(current_user, created_by):
+    # Role-based access control
+    if current_user.role == UserRole.EMPLOYER and created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    elif current_user.role == UserRole.RECRUITER and created_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
 
 # Job Management Endpoints
 @router.get("/", response_model=List[Job])
 async def get_jobs(
-    skip: int = 0, 
-    limit: int = 100, 
+    request: Request,
+    response: Response,
+    page: CursorPage = Depends(),
     status: Optional[JobStatus] = None,
     department_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
     current_user = Depends(get_current_user)
 ):
-    """Get all jobs with optional filtering"""
-    query = (db.query(JobModel).options(joinedload(JobModel.created_by_user)))
+    """Get all jobs with optional filtering
+
+    pool_candidate_count comes from one GROUP BY over the page's jobs. Pages
+    carry a collection ETag (covering those counts when they are returned);
+    If-None-Match gets 304 when nothing on the page changed.
+    """
+    selected = parse_fields(fields, Job)
+    counts_pool = selected is None or "pool_candidate_count" in selected
+    query = select(JobModel)
     
     if status:
-        query = query.filter(JobModel.status == status)
+        query = query.where(JobModel.status == status)
     if department_id:
-        query = query.filter(JobModel.department_id == department_id)
+        query = query.where(JobModel.department_id == department_id)
     
     # Role-based filtering
     if current_user.role == UserRole.EMPLOYER:
-        query = query.filter(JobModel.created_by == current_user.id)
+        query = query.where(JobModel.created_by == current_user.id)
     elif current_user.role == UserRole.RECRUITER:
-        query = query.filter(JobModel.created_by == current_user.id)
+        query = query.where(JobModel.created_by == current_user.id)
     elif current_user.role == UserRole.HR_SPOC:
         # HR SPOC can see all jobs
         pass
@@ -112,45 +124,63 @@ async def get_jobs(
         # Admin can see all jobs
         pass
 
-    jobs = (
-        query.order_by(JobModel.id.desc())
-        .offset(skip)
-        .all()
-    )
-
-    all_pool_candidates = (
-        db.query(CandidateModel)
-        .filter(CandidateModel.is_in_pool == True)
-        .all()
-    )
-
-    # Add pool candidate count to each job
-    job_outputs = []
+    query = page.apply(query, JobModel.id)
+    pool_counts = {}
+    if counts_pool:
+        page_ids = query.with_only_columns(JobModel.id).subquery()
+        pool_counts = dict((await db.execute(pool_candidate_counts(page_ids))).all())
+    if is_conditional(request):
+        versions = (await db.execute(page_version_query(query, JobModel))).one()
+        etag = collection_etag(request, *versions, sorted(pool_counts.items()))
+        if matches(request, etag):
+            return not_modified(etag)
+
+    result = await db.execute(query.options(
+        *load_options(JobModel, selected, JOB_RELATIONSHIP_LOADS, always=VERSION_FIELDS)
+    ))
+    rows = result.scalars().all()
+    set_validators(response, collection_etag(request, *page_versions(rows), sorted(pool_counts.items())))
+    jobs = page.finish(rows, response)
+    if not counts_pool:
+        return json_list_response(sparse_schema(Job, selected), jobs, response)
+
+    # A plain attribute, read by the Job schema
     for job in jobs:
-        matched_candidates = match_pool_candidates_to_job(job, all_pool_candidates)
-        job_dict = Job.from_orm(job).dict()
-        job_dict["pool_candidate_count"] = len(matched_candidates)
-        job_outputs.append(job_dict)
+        job.pool_candidate_count = pool_counts.get(job.id, 0)
 
-    return job_outputs
+    return json_list_response(sparse_schema(Job, selected), jobs, response)
 
 @router.get("/{job_id}", response_model=Job)
 async def get_job(
     job_id: int, 
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    """Get a specific job by ID"""
-    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+    """Get a specific job by ID
+
+    Sends ETag/Last-Modified; a matching If-None-Match or If-Modified-Since
+    gets 304 after a lookup of just the version.
+    """
+    if is_conditional(request):
+        row = (await db.execute(
+            select(JobModel.created_by, version_column(JobModel)).where(JobModel.id == job_id)
+        )).first()
+        if row is not None:
+            check_job_access(current_user, row.created_by)
+            etag = make_etag("job", job_id, row[1])
+            if matches(request, etag, row[1]):
+                return not_modified(etag, row[1])
+
+    result = await db.execute(select(JobModel).options(*JOB_LOAD_OPTIONS).where(JobModel.id == job_id))
+    job = result.scalars().first()
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Role-based access control
-    if current_user.role == UserRole.EMPLOYER and job.created_by != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    elif current_user.role == UserRole.RECRUITER and job.created_by != current_user.id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
+    check_job_access(current_user, job.created_by)
+    version = job.updated_at or job.created_at
+    set_validators(response, make_etag("job", job.id, version), version)
     return job
 
 @router.post("/", response_model=Job)
@@ -500,6 +530,32 @@ def get_pool_candidates_for_job(job_id: int, db: Session = Depends(get_db)):
     return matched_candidates
 
 
+@router.get("/{job_id}/pool_matches", response_model=List[PoolCandidateMatch])
+def get_pool_matches_for_job(
+    job_id: int,
+    limit: int = Query(20, ge=1, le=POOL_MATCH_MAX_LIMIT),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """Pool candidates ranked by how well they fit the job
+
+    Every pool candidate is scored on the job's required skills (weighted so
+    rare skills count more) and experience level in one vectorized pass over
+    the per-worker skill matrix; the best `limit` are returned, best first.
+    """
+    job = db.query(JobModel).filter(JobModel.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    check_job_access(current_user, job.created_by)
+
+    matches = rank_pool_candidates(db, job, limit)
+    candidates = candidates_by_id(db, [match.candidate_id for match in matches])
+    return [
+        {"candidate": candidates[match.candidate_id], **match._asdict()}
+        for match in matches if match.candidate_id in candidates
+    ]
+
+
 @router.post("/{job_id}/publish")
 def publish_job(job_id: int, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
 
@@ -519,16 +575,16 @@ def publish_job(job_id: int, db: Session = Depends(get_db), current_user = Depen
 
 
 @router.get("/public/careers", response_model=List[Job])
-def list_published_jobs(db: Session = Depends(get_db)):
+async def list_published_jobs(db: AsyncSession = Depends(get_read_db)):
 
-    jobs = (
-        db.query(JobModel)
+    result = await db.execute(
+        select(JobModel)
+        .options(*JOB_LOAD_OPTIONS)
         .order_by(JobModel.id.desc())
-        .filter(JobModel.is_published == True, JobModel.status == "Approved")
-        .all()
+        .where(JobModel.is_published == True, JobModel.status == "Approved")
     )
 
-    return jobs
+    return result.scalars().all()
 
 
 @router.post("/{job_id}/candidates/{candidate_id}/shortlist")
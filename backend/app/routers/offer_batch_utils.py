@@ -0,0 +1,373 @@
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    OFFER_BATCH_MAX_ATTEMPTS, OFFER_BATCH_POLL_SECONDS, OFFER_BATCH_TIMEOUT_SECONDS, OFFER_RENDER_PROCESSES,
+)
+from app.core.database import SessionLocal
+from app.models.candidate import Candidate, CandidateStatus, OfferLetter, OfferStatus
+from app.models.offer_batch import OfferBatch, OfferBatchStatus
+from app.routers.candidate_bulk_utils import selection_conditions
+from app.routers.offer_pdf_utils import OfferContent, render_offer_pdf
+from app.schemas.candidate import CandidateBulkSelection
+
+logger = logging.getLogger(__name__)
+
+# Below this many letters, starting render processes costs more than it saves
+PARALLEL_RENDER_THRESHOLD = 4
+# Progress is written to the batch row at most this often
+PROGRESS_INTERVAL_SECONDS = 1.0
+# Stale running batches are looked for once per this many polls
+STALE_CHECK_EVERY = 12
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _render_processes() -> int:
+    return OFFER_RENDER_PROCESSES or os.cpu_count() or 1
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        # spawn: the API process has threads and open DB connections; each
+        # process builds the letter template once and keeps it
+        _render_pool = ProcessPoolExecutor(
+            max_workers=_render_processes(), mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def shutdown_offer_renderers():
+    # The runner first: the batch it is rendering goes back to the queue
+    stop_offer_batch_runner()
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(cancel_futures=True)
+        _render_pool = None
+
+
+def send_offer_email(email, file_path):
+    # TODO: Replace with actual email integration
+    logger.info("Sending offer letter %s to %s", file_path, email)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def offer_candidate_ids(db: Session, selection: CandidateBulkSelection) -> List[int]:
+    """Shortlisted candidates among the selection - the only ones offers go to"""
+    return db.scalars(
+        select(Candidate.id)
+        .where(*selection_conditions(selection), Candidate.status == CandidateStatus.SHORTLISTED)
+        .order_by(Candidate.id)
+    ).all()
+
+
+def create_offer_batch(db: Session, candidate_ids: List[int], created_by: Optional[int]) -> OfferBatch:
+    batch = OfferBatch(candidate_ids=list(candidate_ids), total=len(candidate_ids), created_by=created_by)
+    db.add(batch)
+    db.commit()
+    db.refresh(batch)
+    return batch
+
+
+class OfferBatchReleased(Exception):
+    """The batch is no longer this runner's: it is stopping, or the batch was
+    requeued (timed out) and claimed elsewhere"""
+
+
+def claim_offer_batch(db: Session, token: str) -> Optional[int]:
+    """Claim the oldest queued batch; None when there is none
+
+    The UPDATE only moves a batch that is still queued, so when runners race
+    for it exactly one of them gets it; the others try the next one.
+    """
+    while True:
+        batch_id = db.scalars(
+            select(OfferBatch.id)
+            .where(OfferBatch.status == OfferBatchStatus.QUEUED)
+            .order_by(OfferBatch.id)
+            .limit(1)
+        ).first()
+        if batch_id is None:
+            return None
+        claimed = db.execute(
+            update(OfferBatch)
+            .where(OfferBatch.id == batch_id, OfferBatch.status == OfferBatchStatus.QUEUED)
+            .values(
+                status=OfferBatchStatus.RUNNING, claimed_by=token, started_at=utcnow(),
+                attempts=OfferBatch.attempts + 1,
+            )
+        ).rowcount
+        db.commit()
+        if claimed:
+            return batch_id
+
+
+def requeue_stale_batches(db: Session, timeout_seconds: int = OFFER_BATCH_TIMEOUT_SECONDS,
+                          max_attempts: int = OFFER_BATCH_MAX_ATTEMPTS) -> int:
+    """Put back batches whose runner stopped without finishing them; batches
+    that have used up their attempts are failed instead. Returns the number requeued"""
+    stale = [
+        OfferBatch.status == OfferBatchStatus.RUNNING,
+        OfferBatch.started_at < utcnow() - timedelta(seconds=timeout_seconds),
+    ]
+    db.execute(
+        update(OfferBatch)
+        .where(*stale, OfferBatch.attempts >= max_attempts)
+        .values(status=OfferBatchStatus.FAILED, error="Rendering timed out", finished_at=utcnow(), claimed_by=None)
+    )
+    requeued = db.execute(
+        update(OfferBatch)
+        .where(*stale)
+        .values(status=OfferBatchStatus.QUEUED, claimed_by=None, rendered=0, failed=0)
+    ).rowcount
+    db.commit()
+    return requeued
+
+
+def release_offer_batch(db: Session, batch_id: int, token: str):
+    """Hand an unfinished batch back to the queue on shutdown, without using up an attempt"""
+    db.execute(
+        update(OfferBatch)
+        .where(OfferBatch.id == batch_id, OfferBatch.claimed_by == token,
+               OfferBatch.status == OfferBatchStatus.RUNNING)
+        .values(status=OfferBatchStatus.QUEUED, claimed_by=None, attempts=OfferBatch.attempts - 1,
+                rendered=0, failed=0)
+    )
+    db.commit()
+
+
+def run_offer_batch(batch_id: int, token: str, directory: Path,
+                    session_factory: Callable[[], Session] = SessionLocal, executor: Optional[Executor] = None,
+                    stopping: Callable[[], bool] = lambda: False):
+    """Render a claimed batch's letters and create its OfferLetter rows
+
+    The PDFs are rendered in parallel while the batch row's rendered/failed
+    counts track progress. Once all are done, one transaction creates an
+    OfferLetter per rendered PDF and finishes the batch; if that fails the
+    PDFs are removed and the batch is failed, so no letter exists without
+    its row. Candidates no longer shortlisted are reported as errors. When
+    `stopping()` turns true mid-batch, its PDFs are removed and the batch
+    goes back to the queue.
+    """
+    with session_factory() as db:
+        batch = db.get(OfferBatch, batch_id)
+        if batch is None or batch.claimed_by != token or batch.status != OfferBatchStatus.RUNNING:
+            return
+
+        issued_at = datetime.utcnow()
+        candidates = db.execute(
+            select(Candidate.id, Candidate.first_name, Candidate.last_name, Candidate.email)
+            .where(Candidate.id.in_(batch.candidate_ids), Candidate.status == CandidateStatus.SHORTLISTED)
+            .order_by(Candidate.id)
+        ).all()
+        emails = {row.id: row.email for row in candidates}
+        errors = [
+            {"candidate_id": candidate_id, "error": "Candidate is no longer shortlisted"}
+            for candidate_id in batch.candidate_ids if candidate_id not in emails
+        ]
+        file_names: Dict[int, str] = {}
+        progress_at = time.monotonic()
+        try:
+            contents = [OfferContent(row.id, row.first_name, row.last_name, issued_at) for row in candidates]
+            with closing(_render_all(contents, str(directory), executor)) as letters:
+                for content, file_name, error in letters:
+                    if error is None:
+                        file_names[content.candidate_id] = file_name
+                    else:
+                        errors.append({"candidate_id": content.candidate_id, "error": error})
+                    if stopping():
+                        raise OfferBatchReleased("Runner stopping")
+                    if time.monotonic() - progress_at >= PROGRESS_INTERVAL_SECONDS:
+                        batch.rendered, batch.failed = len(file_names), len(errors)
+                        db.commit()
+                        progress_at = time.monotonic()
+
+            db.refresh(batch)
+            if batch.claimed_by != token or batch.status != OfferBatchStatus.RUNNING:
+                raise OfferBatchReleased("Batch requeued and claimed elsewhere")
+            offers = [
+                OfferLetter(candidate_id=candidate_id, file_path=f"/offers/{file_name}",
+                            status=OfferStatus.SENT, sent_at=issued_at)
+                for candidate_id, file_name in sorted(file_names.items())
+            ]
+            db.add_all(offers)
+            db.flush()
+            batch.rendered, batch.failed = len(file_names), len(errors)
+            batch.result = {
+                "offers": [{"candidate_id": offer.candidate_id, "offer_id": offer.id} for offer in offers],
+                "errors": sorted(errors, key=lambda error: error["candidate_id"]),
+            }
+            batch.status = OfferBatchStatus.DONE
+            batch.claimed_by = None
+            batch.finished_at = utcnow()
+            db.commit()
+        except OfferBatchReleased as e:
+            logger.info("Offer batch %s released: %s", batch_id, e)
+            db.rollback()
+            _remove_letters(directory, file_names)
+            release_offer_batch(db, batch_id, token)
+            return
+        except Exception as e:
+            logger.exception("Offer batch %s failed", batch_id)
+            db.rollback()
+            _remove_letters(directory, file_names)
+            db.execute(
+                update(OfferBatch)
+                .where(OfferBatch.id == batch_id, OfferBatch.claimed_by == token)
+                .values(status=OfferBatchStatus.FAILED, error=f"{type(e).__name__}: {e}", finished_at=utcnow(),
+                        claimed_by=None)
+            )
+            db.commit()
+            return
+
+    # TODO: integrate with e-sign provider (DocuSign/AdobeSign)
+    for candidate_id, file_name in file_names.items():
+        send_offer_email(emails[candidate_id], f"/offers/{file_name}")
+
+
+def _remove_letters(directory: Path, file_names: Dict[int, str]):
+    for file_name in file_names.values():
+        Path(directory, file_name).unlink(missing_ok=True)
+
+
+def _render_all(contents: List[OfferContent], directory: str, executor: Optional[Executor]):
+    # (content, file name, error) per letter, in the order they finish
+    if executor is None and len(contents) < PARALLEL_RENDER_THRESHOLD:
+        for content in contents:
+            try:
+                yield content, render_offer_pdf(content, directory), None
+            except Exception as e:
+                yield content, None, f"{type(e).__name__}: {e}"
+        return
+    futures = {(executor or _get_render_pool()).submit(render_offer_pdf, content, directory): content
+               for content in contents}
+    pending = set(futures)
+    try:
+        for future in as_completed(futures):
+            pending.discard(future)
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, f"{type(e).__name__}: {e}"
+    finally:
+        # Closed early: letters not started are cancelled, those rendering are
+        # waited for and removed
+        for future in pending:
+            future.cancel()
+        for future in pending:
+            if not future.cancelled():
+                try:
+                    Path(directory, future.result()).unlink(missing_ok=True)
+                except Exception:
+                    pass
+
+
+class OfferBatchRunner:
+    """Claims queued batches from the offer_batches table and runs them one
+    after another, each spread over the render processes
+
+    The table is the queue, so the runners of all API workers share it, and a
+    batch whose worker died is picked up again (requeue_stale_batches).
+    """
+
+    def __init__(self, directory: Path, session_factory: Callable[[], Session] = SessionLocal,
+                 executor: Optional[Executor] = None, poll_seconds: float = OFFER_BATCH_POLL_SECONDS):
+        self.directory = directory
+        self.session_factory = session_factory
+        self.executor = executor
+        self.poll_seconds = poll_seconds
+        self._token_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="offer-batch-runner", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Look for new batches now rather than at the next poll"""
+        self._wake.set()
+
+    def run(self):
+        polls = 0
+        while not self._stop.is_set():
+            if polls % STALE_CHECK_EVERY == 0:
+                self._safely(requeue_stale_batches)
+            polls += 1
+            self._wake.clear()
+            while not self._stop.is_set():
+                token = f"{self._token_prefix}:{uuid.uuid4().hex[:12]}"
+                batch_id = self._safely(claim_offer_batch, token)
+                if batch_id is None:
+                    break
+                try:
+                    run_offer_batch(batch_id, token, self.directory, self.session_factory, self.executor,
+                                    self._stop.is_set)
+                except Exception:
+                    # Left running; requeued once it times out
+                    logger.exception("Offer batch %s: runner error", batch_id)
+            self._wake.wait(self.poll_seconds)
+
+    def _safely(self, operation, *args):
+        # A database hiccup mustn't kill the thread: the operation's result, or
+        # None after logging the error; the next poll tries again
+        try:
+            with self.session_factory() as db:
+                return operation(db, *args)
+        except Exception:
+            logger.exception("Offer batch queue: %s failed", operation.__name__)
+            return None
+
+
+_runner: Optional[OfferBatchRunner] = None
+
+
+def start_offer_batch_runner(directory: Path) -> OfferBatchRunner:
+    global _runner
+    if _runner is None:
+        _runner = OfferBatchRunner(directory)
+        _runner.start()
+    return _runner
+
+
+def stop_offer_batch_runner():
+    global _runner
+    if _runner is not None:
+        _runner.stop()
+        _runner = None
+
+
+def notify_offer_batch_queued():
+    """Called after a bulk issue commits its batch so this worker's runner picks
+    it up straight away; other runners see it on their next poll"""
+    if _runner is not None:
+        _runner.wake()
+
@@ -0,0 +1,103 @@
+"""Offer letter PDFs
+
+Kept free of app/database imports: this module is what the offer render
+processes import. reportlab is loaded on the first render.
+"""
+import os
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+from app.core.config import OFFER_COMPANY_NAME, OFFER_FONT_PATH, OFFER_LOGO_PATH
+
+# Name the OFFER_FONT_PATH font is registered under
+OFFER_FONT = "OfferFont"
+LETTERHEAD_HEIGHT = 72
+
+
+class OfferContent(NamedTuple):
+    candidate_id: int
+    first_name: str
+    last_name: Optional[str]
+    issued_at: datetime
+
+
+class OfferTemplate(NamedTuple):
+    font: str
+    bold_font: str
+    # reportlab Drawing of the company name and rule, and the decoded logo
+    letterhead: Any
+    logo: Optional[Any]
+
+
+@lru_cache(maxsize=None)
+def offer_template(company: str = OFFER_COMPANY_NAME, logo_path: Optional[str] = OFFER_LOGO_PATH,
+                   font_path: Optional[str] = OFFER_FONT_PATH) -> OfferTemplate:
+    """The static layers every letter shares, built once per process
+
+    Registering a TrueType font parses the whole file and the logo is decoded
+    on first use; both are then reused by every letter this process renders.
+    """
+    from reportlab.graphics.shapes import Drawing, Line, String
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    font, bold_font = "Helvetica", "Helvetica-Bold"
+    if font_path:
+        pdfmetrics.registerFont(TTFont(OFFER_FONT, font_path))
+        font = bold_font = OFFER_FONT
+
+    width = LETTER[0]
+    letterhead = Drawing(width, LETTERHEAD_HEIGHT)
+    letterhead.add(String(width - 72, 32, company, fontName=bold_font, fontSize=18, textAnchor="end"))
+    letterhead.add(Line(72, 16, width - 72, 16, strokeWidth=1))
+    logo = ImageReader(logo_path) if logo_path else None
+    if logo is not None:
+        # Decode now rather than in the first letter
+        logo.getRGBData()
+    return OfferTemplate(font, bold_font, letterhead, logo)
+
+
+def offer_file_name(content: OfferContent) -> str:
+    return f"offer_{content.candidate_id}_{content.issued_at.strftime('%Y%m%d%H%M%S')}.pdf"
+
+
+def render_offer_pdf(content: OfferContent, directory: str) -> str:
+    """Write the candidate's offer letter into `directory`; returns its file name
+
+    The PDF is written to a temporary file in the same directory and renamed
+    into place, so the /offers mount never serves a half-written letter.
+    """
+    from reportlab.graphics import renderPDF
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.pdfgen import canvas
+
+    template = offer_template()
+    file_name = offer_file_name(content)
+    fd, temp_path = tempfile.mkstemp(prefix=".offer_", suffix=".part", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            c = canvas.Canvas(out, pagesize=LETTER)
+            top = LETTER[1] - LETTERHEAD_HEIGHT - 24
+            renderPDF.draw(template.letterhead, c, 0, top)
+            if template.logo is not None:
+                c.drawImage(template.logo, 72, top + 24, height=40, width=120,
+                            preserveAspectRatio=True, anchor="sw", mask="auto")
+            c.setFont(template.bold_font, 16)
+            c.drawString(200, top - 40, "OFFER LETTER")
+            c.setFont(template.font, 12)
+            name = " ".join(part for part in (content.first_name, content.last_name) if part)
+            c.drawString(100, top - 90, f"Candidate: {name}")
+            c.drawString(100, top - 110, f"Date: {content.issued_at.strftime('%d-%m-%Y')}")
+            c.save()
+        os.replace(temp_path, os.path.join(directory, file_name))
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return file_name
@@ -0,0 +1,250 @@
+"""Ranks pool candidates for a job by skill overlap and experience fit
+
+The pool candidates' skills (their comma-separated cover_letter, as
+match_pool_utils reads it) are held as a sparse candidate x skill matrix
+(SciPy CSR), built once per worker and rebuilt in the background when the
+pool changes, while requests keep scoring against the previous matrix.
+Scoring a job is one sparse matrix-vector product for the weighted skill
+overlap plus array arithmetic for the experience fit, over every pool
+candidate at once; the best k are picked with a partial sort.
+
+numpy and scipy are imported on first use.
+"""
+import logging
+import math
+import re
+import threading
+import time
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.conditional import version_column
+from app.core.config import POOL_MATRIX_REFRESH_SECONDS
+from app.models.candidate import Candidate
+from app.routers.match_pool_utils import parse_experience_range
+
+logger = logging.getLogger(__name__)
+
+# The score is SKILL_WEIGHT x skill overlap + EXPERIENCE_WEIGHT x experience fit,
+# each 0 to 1; only candidates with at least one required skill are ranked
+SKILL_WEIGHT = 0.8
+EXPERIENCE_WEIGHT = 0.2
+
+SKILL_SEPARATORS = re.compile(r"[,;|\n]")
+YEARS = re.compile(r"\d+(?:\.\d+)?")
+# Rows read per batch while building the matrix
+LOAD_BATCH_SIZE = 5000
+
+
+def normalize_skills(text: Optional[str]) -> List[str]:
+    """Distinct skills in a comma-separated list, lower-cased with whitespace collapsed"""
+    skills = (" ".join(part.split()).lower().strip(" .:") for part in SKILL_SEPARATORS.split(text or ""))
+    return list(dict.fromkeys(skill for skill in skills if skill))
+
+
+def parse_years(value: Optional[str]) -> Optional[float]:
+    """Years of experience from the free-text column ("3", "4.5 years", "5+")"""
+    match = YEARS.search(value or "")
+    return float(match.group()) if match else None
+
+
+class PoolMatch(NamedTuple):
+    candidate_id: int
+    score: float
+    skill_score: float
+    experience_fit: float
+    matched_skills: Tuple[str, ...]
+
+
+class PoolSkillMatrix:
+    """Pool candidates x skills, with each candidate's years of experience
+
+    `skill_rows` holds each candidate's normalized skills; `version` is what
+    the pool looked like when the rows were read (see pool_version_query).
+    """
+
+    def __init__(self, candidate_ids: Sequence[int], skill_rows: Iterable[Sequence[str]],
+                 experience_years: Sequence[Optional[float]], version=None):
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        vocabulary = {}
+        indptr, indices = [0], []
+        for skills in skill_rows:
+            indices.extend(sorted({vocabulary.setdefault(skill, len(vocabulary)) for skill in skills}))
+            indptr.append(len(indices))
+        self.vocabulary = vocabulary
+        self.skills = list(vocabulary)
+        self.candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int32)
+        self.matrix = csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, np.asarray(indptr, dtype=np.int64)),
+            shape=(len(self.candidate_ids), len(vocabulary)),
+        )
+        self.experience = np.array([np.nan if years is None else years for years in experience_years], dtype=float)
+        # Candidates per skill, for weighting rare skills above common ones
+        self.document_frequency = np.bincount(indices, minlength=len(vocabulary))
+        self.version = version
+
+    def __len__(self):
+        return len(self.candidate_ids)
+
+    def score(self, required_skills: Sequence[str], experience_min: Optional[float] = None,
+              experience_max: Optional[float] = None, limit: int = 10) -> List[PoolMatch]:
+        """The `limit` best candidates for a job, best first (ties: lowest id)
+
+        Skill overlap is the IDF-weighted share of the required skills a
+        candidate has. Experience fit is 1 inside the job's range, falling
+        linearly to 0 one range-width outside it; 0 for unknown experience,
+        and 1 for everyone when the job gives no range.
+        """
+        import numpy as np
+
+        columns = sorted({self.vocabulary[skill] for skill in required_skills if skill in self.vocabulary})
+        if not columns or limit <= 0 or not len(self):
+            return []
+        # Smoothed IDF; a required skill nobody has weighs the most and can't be matched
+        count = len(self)
+        weights = np.log((1 + count) / (1 + self.document_frequency[columns])) + 1
+        unknown = len(set(required_skills)) - len(columns)
+        total = float(weights.sum()) + unknown * (math.log(1 + count) + 1)
+        query = np.zeros(len(self.vocabulary))
+        query[columns] = weights
+        skill = (self.matrix @ query) / total
+
+        fit = self.experience_fit(experience_min, experience_max)
+        scores = SKILL_WEIGHT * skill + EXPERIENCE_WEIGHT * fit
+        rows = np.flatnonzero(skill > 0)
+        if len(rows) > limit:
+            # Everyone scoring at least the k-th best, so ties at the cut go by id too
+            kth = np.partition(scores[rows], len(rows) - limit)[len(rows) - limit]
+            rows = rows[scores[rows] >= kth]
+        rows = rows[np.lexsort((self.candidate_ids[rows], -scores[rows]))][:limit]
+
+        required = set(columns)
+        indptr, indices = self.matrix.indptr, self.matrix.indices
+        return [
+            PoolMatch(
+                int(self.candidate_ids[row]), round(float(scores[row]), 4), round(float(skill[row]), 4),
+                round(float(fit[row]), 4),
+                tuple(self.skills[column] for column in indices[indptr[row]:indptr[row + 1]] if column in required),
+            )
+            for row in rows
+        ]
+
+    def experience_fit(self, experience_min: Optional[float], experience_max: Optional[float]):
+        import numpy as np
+
+        if experience_min is None or experience_max is None:
+            return np.ones(len(self))
+        width = max(experience_max - experience_min, 1)
+        distance = np.maximum(experience_min - self.experience, 0) + np.maximum(self.experience - experience_max, 0)
+        return np.nan_to_num(np.clip(1 - distance / width, 0, 1), nan=0.0)
+
+
+def pool_version_query():
+    """count, sum of ids and newest version of the pool candidates: changes
+    whenever a candidate joins, leaves or is edited"""
+    return select(func.count(), func.sum(Candidate.id), func.max(version_column(Candidate))).where(
+        Candidate.is_in_pool == True
+    )
+
+
+def load_pool_matrix(db: Session, version=None) -> PoolSkillMatrix:
+    rows = db.execute(
+        select(Candidate.id, Candidate.cover_letter, Candidate.experience_years)
+        .where(Candidate.is_in_pool == True)
+        .order_by(Candidate.id)
+        .execution_options(yield_per=LOAD_BATCH_SIZE)
+    )
+    ids, skills, years = [], [], []
+    for candidate_id, cover_letter, experience_years in rows:
+        ids.append(candidate_id)
+        skills.append(normalize_skills(cover_letter))
+        years.append(parse_years(experience_years))
+    return PoolSkillMatrix(ids, skills, years, version)
+
+
+_matrix: Optional[PoolSkillMatrix] = None
+_checked_at = 0.0
+# The background refresh in progress, if any; cleared matrices don't take its result
+_refresh: Optional[threading.Thread] = None
+_generation = 0
+# _matrix_lock guards the globals above and is never held while reading the
+# pool; _build_lock makes concurrent first requests wait for one build
+_matrix_lock = threading.Lock()
+_build_lock = threading.Lock()
+
+
+def pool_matrix(db: Session, refresh_seconds: float = POOL_MATRIX_REFRESH_SECONDS) -> PoolSkillMatrix:
+    """This worker's matrix
+
+    Once every `refresh_seconds` a background thread reads the pool's version
+    and, if the pool has changed, builds a new matrix and swaps it in; requests
+    are served the current matrix meanwhile, so a pool change shows up in
+    rankings within `refresh_seconds` plus one build. Only the first request
+    waits for a build.
+    """
+    global _checked_at, _refresh
+    with _matrix_lock:
+        matrix = _matrix
+        if matrix is not None and _refresh is None and time.monotonic() - _checked_at >= refresh_seconds:
+            _checked_at = time.monotonic()
+            _refresh = threading.Thread(
+                target=_refresh_pool_matrix, args=(db.get_bind(), matrix.version, _generation),
+                name="pool-matrix-refresh", daemon=True,
+            )
+            _refresh.start()
+    if matrix is not None:
+        return matrix
+    with _build_lock:
+        with _matrix_lock:
+            if _matrix is not None:
+                return _matrix
+            generation = _generation
+        version = tuple(db.execute(pool_version_query()).one())
+        matrix = load_pool_matrix(db, version)
+        return _swap_in(matrix, generation) or matrix
+
+
+def _swap_in(matrix: PoolSkillMatrix, generation: int) -> Optional[PoolSkillMatrix]:
+    # The matrix now in use, or None when clear_pool_matrix() ran since the build started
+    global _matrix, _checked_at
+    with _matrix_lock:
+        if generation != _generation:
+            return None
+        _matrix, _checked_at = matrix, time.monotonic()
+        return _matrix
+
+
+def _refresh_pool_matrix(bind, version, generation: int):
+    global _checked_at, _refresh
+    try:
+        with Session(bind) as db:
+            current = tuple(db.execute(pool_version_query()).one())
+            if current != version:
+                _swap_in(load_pool_matrix(db, current), generation)
+            else:
+                with _matrix_lock:
+                    _checked_at = time.monotonic()
+    except Exception:
+        # The current matrix stays; the next check after refresh_seconds tries again
+        logger.exception("Pool matrix refresh failed")
+    finally:
+        with _matrix_lock:
+            _refresh = None
+
+
+def clear_pool_matrix():
+    global _matrix, _checked_at, _generation
+    with _matrix_lock:
+        _matrix, _checked_at = None, 0.0
+        _generation += 1
+
+
+def rank_pool_candidates(db: Session, job, limit: int) -> List[PoolMatch]:
+    """The `limit` pool candidates that best fit the job's required skills and experience level"""
+    experience_min, experience_max = parse_experience_range(job.experience_level or "")
+    return pool_matrix(db).score(normalize_skills(job.required_skills), experience_min, experience_max, limit)
@@ -0,0 +1,266 @@
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import (
+    RESUME_BULK_MAX_FILES, RESUME_EXTRACT_PROCESSES, RESUME_MAX_FILE_BYTES, RESUME_NLP_BATCH_SIZE,
+    RESUME_NLP_PROCESSES,
+)
+from app.core.uploads import StoredUpload, place_by_hash
+from app.models.candidate import Candidate
+from app.routers.candidate_dedupe_utils import DEDUPE_COLUMNS, existing_candidates, with_dedupe_keys
+from app.routers.resume_cache_utils import (
+    cached_parse, get_or_create_resume_file, resume_files_by_hash, save_hashed, store_parse,
+)
+from app.routers.resume_queue_utils import parsed_columns, split_name
+from app.routers.resume_utils import RESUME_EXTENSIONS, parse_resume_texts, try_extract_text
+
+# Below this many files, starting extraction processes costs more than it saves
+PARALLEL_EXTRACT_THRESHOLD = 4
+
+_extract_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _extract_processes() -> int:
+    return RESUME_EXTRACT_PROCESSES or os.cpu_count() or 1
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    global _extract_pool
+    if _extract_pool is None:
+        # spawn: the API process has threads and open DB connections
+        _extract_pool = ProcessPoolExecutor(
+            max_workers=_extract_processes(), mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _extract_pool
+
+
+def shutdown_resume_extractors():
+    global _extract_pool
+    if _extract_pool is not None:
+        _extract_pool.shutdown(cancel_futures=True)
+        _extract_pool = None
+
+
+class BulkResumeReport:
+    """Outcome of a bulk resume upload, per file"""
+
+    def __init__(self):
+        self.files = 0
+        self.created = 0
+        self.updated = 0
+        self.errors: List[Dict] = []
+        self.seconds = 0.0
+
+    def add_error(self, file_name: str, error: str):
+        self.errors.append({"file": file_name, "error": error})
+
+    def as_response(self) -> dict:
+        parsed = self.created + self.updated
+        return {
+            "message": f"Resumes processed: {parsed} ({self.created} new, {self.updated} updated), "
+                       f"failed: {len(self.errors)}",
+            "files": self.files,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": len(self.errors),
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "resumes_per_second": round(self.files / self.seconds, 1) if self.seconds else None,
+        }
+
+
+Upload = Union[StoredUpload, Tuple[str, BinaryIO]]
+
+
+def _members(upload: Upload):
+    """(name, source) of each resume in an upload - a received file, or a (name,
+    file object) pair; ZIP archives are opened and their directories and macOS
+    metadata skipped"""
+    if isinstance(upload, StoredUpload):
+        name, source, archive_file = upload.filename, upload, upload.path
+    else:
+        name, source = os.path.basename(upload[0] or ""), upload[1]
+        archive_file = source
+    if not name.lower().endswith(".zip"):
+        yield name, source
+        return
+    with zipfile.ZipFile(archive_file) as archive:
+        for info in archive.infolist():
+            member = os.path.basename(info.filename)
+            if info.is_dir() or not member or member.startswith(".") or info.filename.startswith("__MACOSX/"):
+                continue
+            with archive.open(info) as source:
+                yield member, source
+
+
+def save_resumes(uploads: List[Upload], upload_dir: str, report: BulkResumeReport,
+                 max_files: int = RESUME_BULK_MAX_FILES,
+                 max_bytes: int = RESUME_MAX_FILE_BYTES) -> List[Tuple[str, str, str, bool]]:
+    """Write every .pdf/.docx in the uploads (files or ZIPs) to upload_dir,
+    one file per distinct content; returns (file name, sha256, path, whether
+    the file is new) per resume
+
+    Received files were hashed (and size-checked) as they arrived and are
+    just moved into place. Raises ValueError, after removing the files it
+    added, when there are more than max_files resumes, and zipfile.BadZipFile
+    for a corrupt archive.
+    """
+    saved = []
+    try:
+        for upload in uploads:
+            for name, source in _members(upload):
+                report.files += 1
+                extension = os.path.splitext(name)[1].lower()
+                if extension not in RESUME_EXTENSIONS:
+                    report.add_error(name, "Only .pdf and .docx resumes are supported")
+                    continue
+                if len(saved) >= max_files:
+                    raise ValueError(f"Too many resumes: at most {max_files} per upload")
+                if isinstance(source, StoredUpload):
+                    stored = (source.sha256, *place_by_hash(source, upload_dir))
+                else:
+                    stored = save_hashed(source, upload_dir, extension, max_bytes)
+                if stored is None:
+                    report.add_error(name, f"Larger than {max_bytes // (1024 * 1024)} MB")
+                else:
+                    saved.append((name, *stored))
+    except Exception:
+        for _, _, path, created in saved:
+            if created and os.path.exists(path):
+                os.remove(path)
+        raise
+    return saved
+
+
+def extract_texts(paths: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """(text, error) per path, in order; extracted on the process pool for larger batches"""
+    if len(paths) < PARALLEL_EXTRACT_THRESHOLD:
+        return [try_extract_text(path) for path in paths]
+    chunksize = max(1, len(paths) // (_extract_processes() * 4))
+    return list(_get_extract_pool().map(try_extract_text, paths, chunksize=chunksize))
+
+
+def upsert_candidates(db: Session, records: List[Tuple[str, str, Dict]], created_by: int,
+                      report: BulkResumeReport):
+    """Create or update candidates from (file name, resume URL, parsed fields)
+
+    A resume belongs to the existing candidate with the same normalized email
+    or phone (looked up for the whole batch at once on the unique dedupe
+    indexes); two resumes of one person in the batch make one candidate, and
+    a resume whose email and phone belong to two different candidates is
+    reported. Updates and the multi-row INSERT commit together.
+    """
+    values_by_file = []
+    for file_name, resume_url, parsed in records:
+        values = with_dedupe_keys(parsed_columns(parsed))
+        values["resume_url"] = resume_url
+        values_by_file.append((file_name, values))
+
+    existing = existing_candidates(db, [values["phone_e164"] for _, values in values_by_file],
+                                   [values["email_normalized"] for _, values in values_by_file])
+    # Existing candidates, and the rows of new ones, by dedupe key
+    owners: Dict[Tuple[str, str], object] = {}
+    for candidate in existing:
+        for column in DEDUPE_COLUMNS:
+            if getattr(candidate, column):
+                owners[column, getattr(candidate, column)] = candidate
+
+    new_rows: List[Dict] = []
+    for file_name, values in values_by_file:
+        keys = [(column, values[column]) for column in DEDUPE_COLUMNS if values[column]]
+        matched = list({id(owners[key]): owners[key] for key in keys if key in owners}.values())
+        if len(matched) > 1:
+            report.add_error(file_name, "Email and phone belong to different candidates")
+            continue
+        owner = matched[0] if matched else None
+        if isinstance(owner, Candidate):
+            for column, value in values.items():
+                if column not in DEDUPE_COLUMNS:
+                    # The model's validators update the dedupe keys
+                    setattr(owner, column, value)
+            report.updated += 1
+        elif owner is not None:
+            # Same person twice in this batch: the later resume wins
+            owner.update({column: value for column, value in values.items() if value is not None})
+            report.updated += 1
+        elif not values.get("phone"):
+            report.add_error(file_name, "No phone number found in the resume")
+            continue
+        else:
+            if not values.get("first_name"):
+                # No name found: the file name stands in for it
+                values.update(split_name(os.path.splitext(file_name)[0]))
+            owner = dict(values, created_by=created_by)
+            new_rows.append(owner)
+        for key in keys:
+            owners[key] = owner
+
+    if new_rows:
+        # executemany needs the same keys in every row
+        columns = {column for row in new_rows for column in row}
+        db.execute(insert(Candidate.__table__), [{column: row.get(column) for column in columns} for row in new_rows])
+    db.commit()
+    report.created += len(new_rows)
+
+
+def ingest_resumes(db: Session, uploads: List[Upload], created_by: int, upload_dir: str,
+                   url_prefix: str, batch_size: int = RESUME_NLP_BATCH_SIZE,
+                   n_process: int = RESUME_NLP_PROCESSES) -> BulkResumeReport:
+    """Save, parse and upsert a batch of resumes
+
+    Text is extracted in parallel worker processes and parsed in a single
+    nlp.pipe pass over the whole batch, instead of one nlp() call per file.
+    Each distinct file content is extracted and parsed once, and not at all
+    when the content-hash cache already has it.
+    """
+    report = BulkResumeReport()
+    start = time.perf_counter()
+    saved = save_resumes(uploads, upload_dir, report)
+    paths = {sha256: path for _, sha256, path, _ in saved}
+    created = {sha256 for _, sha256, _, is_new in saved if is_new}
+
+    # Content seen before skips extraction, and spaCy too when parsed with this model
+    known = resume_files_by_hash(db, paths)
+    parsed: Dict[str, Dict] = {}
+    texts: Dict[str, str] = {}
+    for sha256, resume_file in known.items():
+        if cached_parse(resume_file) is not None:
+            parsed[sha256] = resume_file.parsed
+        elif resume_file.extracted_text is not None:
+            texts[sha256] = resume_file.extracted_text
+
+    errors: Dict[str, str] = {}
+    pending = [sha256 for sha256 in paths if sha256 not in parsed and sha256 not in texts]
+    for sha256, (text, error) in zip(pending, extract_texts([paths[sha256] for sha256 in pending])):
+        if error is None:
+            texts[sha256] = text
+        else:
+            errors[sha256] = error
+            if sha256 in created and sha256 not in known:
+                os.remove(paths[sha256])
+
+    to_parse = list(texts)
+    fields = parse_resume_texts([texts[sha256] for sha256 in to_parse], batch_size=batch_size,
+                                n_process=n_process) if to_parse else []
+    for sha256, result in zip(to_parse, fields):
+        parsed[sha256] = result
+        resume_file = known.get(sha256) or get_or_create_resume_file(db, sha256, paths[sha256])
+        store_parse(resume_file, texts[sha256], result)
+
+    records = []
+    for name, sha256, path, _ in saved:
+        if sha256 in errors:
+            report.add_error(name, errors[sha256])
+        else:
+            records.append((name, url_prefix + os.path.basename(path), parsed[sha256]))
+    # Commits the cache entries along with the candidates
+    upsert_candidates(db, records, created_by, report)
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,63 @@
+import os
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import RESUME_MAX_FILE_BYTES, SPACY_MODEL
+from app.core.uploads import place_by_hash, store_file
+from app.models.resume_file import ResumeFile
+
+
+def save_hashed(source: BinaryIO, upload_dir: str, extension: str,
+                max_bytes: int = RESUME_MAX_FILE_BYTES) -> Optional[Tuple[str, str, bool]]:
+    """Stream a file object to disk, hashing it as it is written
+
+    The bytes go to a temporary file next to their destination, then move to
+    `<sha256><extension>` - or are dropped when a file with that content is
+    already stored, so duplicates share one file. Returns (sha256, path,
+    whether the file is new), or None when the upload exceeds max_bytes.
+    """
+    upload = store_file(source, upload_dir, "upload" + extension.lower(), max_bytes)
+    if upload is None:
+        return None
+    return (upload.sha256, *place_by_hash(upload, upload_dir))
+
+
+def get_or_create_resume_file(db: Session, sha256: str, file_path: str) -> ResumeFile:
+    """The cache entry for a content hash, created (and flushed) when new"""
+    resume_file = db.scalars(select(ResumeFile).where(ResumeFile.sha256 == sha256)).first()
+    if resume_file is not None:
+        return resume_file
+    try:
+        # A savepoint, so losing the race to a concurrent upload keeps the caller's transaction
+        with db.begin_nested():
+            resume_file = ResumeFile(sha256=sha256, file_path=file_path, size=os.path.getsize(file_path))
+            db.add(resume_file)
+        return resume_file
+    except IntegrityError:
+        return db.scalars(select(ResumeFile).where(ResumeFile.sha256 == sha256)).one()
+
+
+def resume_files_by_hash(db: Session, hashes: Iterable[str]) -> Dict[str, ResumeFile]:
+    hashes = set(hashes)
+    if not hashes:
+        return {}
+    return {row.sha256: row for row in db.scalars(select(ResumeFile).where(ResumeFile.sha256.in_(hashes)))}
+
+
+def cached_parse(resume_file: Optional[ResumeFile]) -> Optional[Dict]:
+    """The stored parse result, if it came from the current SPACY_MODEL"""
+    if resume_file is None or resume_file.parsed is None or resume_file.parsed_with != SPACY_MODEL:
+        return None
+    return resume_file.parsed
+
+
+def store_parse(resume_file: ResumeFile, text: Optional[str], parsed: Dict):
+    if text is not None:
+        resume_file.extracted_text = text
+    resume_file.parsed = parsed
+    resume_file.parsed_with = SPACY_MODEL
+    resume_file.parsed_at = datetime.now(timezone.utc)
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import RESUME_PARSE_MAX_ATTEMPTS, RESUME_PARSE_TIMEOUT_SECONDS
+from app.models.candidate import Candidate
+from app.models.resume_file import ResumeFile
+from app.models.resume_parse_job import ResumeParseJob, ResumeParseStatus
+from app.routers.candidate_dedupe_utils import keys_held_by_others
+from app.routers.resume_cache_utils import cached_parse, store_parse
+
+# Parsed field -> candidate column it fills in when the job finishes; the
+# parsed name fills first_name and last_name (split_name)
+PARSED_FIELDS = {
+    "email": "email",
+    "phone": "phone",
+    "experience_summary": "experience_details",
+}
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    file_path: str
+    # Cached for the same file content: text to skip extraction, or a parse
+    # result (current SPACY_MODEL) that makes the job done without parsing
+    text: Optional[str]
+    parsed: Optional[Dict]
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_resume_parse(db: Session, candidate: Candidate, file_path: str, created_by: Optional[int],
+                         resume_file: Optional[ResumeFile] = None) -> ResumeParseJob:
+    """Queue a saved resume for parsing; committed with the caller's transaction
+
+    When the same content was parsed before, the job is created done and the
+    cached fields are applied to the candidate straight away.
+    """
+    job = ResumeParseJob(candidate=candidate, file_path=file_path, resume_file=resume_file, created_by=created_by)
+    parsed = cached_parse(resume_file)
+    if parsed is not None:
+        job.status = ResumeParseStatus.DONE
+        job.result = parsed
+        job.started_at = job.finished_at = utcnow()
+        apply_parsed_resume(db, candidate, parsed)
+    db.add(job)
+    return job
+
+
+def requeue_stale_jobs(db: Session, timeout_seconds: int = RESUME_PARSE_TIMEOUT_SECONDS,
+                       max_attempts: int = RESUME_PARSE_MAX_ATTEMPTS) -> int:
+    """Put back jobs whose dispatcher stopped without finishing them; jobs that
+    have used up their attempts are failed instead. Returns the number requeued"""
+    stale = [
+        ResumeParseJob.status == ResumeParseStatus.RUNNING,
+        ResumeParseJob.started_at < utcnow() - timedelta(seconds=timeout_seconds),
+    ]
+    db.execute(
+        update(ResumeParseJob)
+        .where(*stale, ResumeParseJob.attempts >= max_attempts)
+        .values(status=ResumeParseStatus.FAILED, error="Parsing timed out", finished_at=utcnow(), claimed_by=None)
+    )
+    requeued = db.execute(
+        update(ResumeParseJob)
+        .where(*stale)
+        .values(status=ResumeParseStatus.QUEUED, claimed_by=None)
+    ).rowcount
+    db.commit()
+    return requeued
+
+
+def claim_jobs(db: Session, limit: int, token: str) -> List[ClaimedJob]:
+    """Claim up to `limit` of the oldest queued jobs
+
+    The UPDATE only moves rows that are still queued, so when dispatchers race
+    for the same rows each job goes to exactly one of them - the one whose
+    unique claim token ends up on the row.
+    """
+    if limit <= 0:
+        return []
+    candidates = db.scalars(
+        select(ResumeParseJob.id)
+        .where(ResumeParseJob.status == ResumeParseStatus.QUEUED)
+        .order_by(ResumeParseJob.id)
+        .limit(limit)
+    ).all()
+    if not candidates:
+        return []
+    db.execute(
+        update(ResumeParseJob)
+        .where(ResumeParseJob.id.in_(candidates), ResumeParseJob.status == ResumeParseStatus.QUEUED)
+        .values(
+            status=ResumeParseStatus.RUNNING, claimed_by=token, started_at=utcnow(),
+            attempts=ResumeParseJob.attempts + 1,
+        )
+    )
+    db.commit()
+    rows = db.execute(
+        select(ResumeParseJob.id, ResumeParseJob.file_path, ResumeFile)
+        .outerjoin(ResumeFile, ResumeParseJob.resume_file_id == ResumeFile.id)
+        .where(ResumeParseJob.claimed_by == token, ResumeParseJob.status == ResumeParseStatus.RUNNING)
+        .order_by(ResumeParseJob.id)
+    ).all()
+    return [
+        ClaimedJob(job_id, file_path, resume_file.extracted_text if resume_file else None, cached_parse(resume_file))
+        for job_id, file_path, resume_file in rows
+    ]
+
+
+def _claimed_job(db: Session, job_id: int, token: str) -> Optional[ResumeParseJob]:
+    # None when the job was requeued and claimed elsewhere meanwhile, or deleted
+    # along with its candidate
+    return db.scalars(
+        select(ResumeParseJob)
+        .where(ResumeParseJob.id == job_id, ResumeParseJob.claimed_by == token,
+               ResumeParseJob.status == ResumeParseStatus.RUNNING)
+    ).first()
+
+
+def _column_value(column: str, value: str) -> str:
+    max_length = getattr(Candidate.__table__.c[column].type, "length", None)
+    return value[:max_length] if max_length else value
+
+
+def split_name(name: str) -> Dict[str, Optional[str]]:
+    """first_name and last_name from a full name ("Asha Rao" -> Asha, Rao)"""
+    first_name, _, last_name = name.strip().partition(" ")
+    last_name = last_name.strip()
+    return {"first_name": _column_value("first_name", first_name),
+            "last_name": _column_value("last_name", last_name) if last_name else None}
+
+
+def parsed_columns(parsed: Dict) -> Dict[str, str]:
+    """Candidate column values from parsed resume fields, cut to the column
+    length; fields the parser couldn't find are left out"""
+    values = {}
+    for field, column in PARSED_FIELDS.items():
+        value = (parsed.get(field) or "").strip()
+        if value:
+            values[column] = _column_value(column, value)
+    name = (parsed.get("name") or "").strip()
+    if name:
+        values.update((column, value) for column, value in split_name(name).items() if value)
+    return values
+
+
+def apply_parsed_resume(db: Session, candidate: Candidate, parsed: Dict):
+    """Copy the parsed fields onto the candidate; fields the parser couldn't find
+    keep their current value, and so do the phone and email when another
+    candidate already has them"""
+    values = parsed_columns(parsed)
+    for column in keys_held_by_others(db, candidate, values.get("phone"), values.get("email")):
+        del values[column]
+    for column, value in values.items():
+        setattr(candidate, column, value)
+
+
+def complete_job(db: Session, job_id: int, token: str, parsed: Dict, text: Optional[str] = None) -> bool:
+    """Store the parse result (on the job and in the content-hash cache) and
+    update the candidate in one transaction"""
+    job = _claimed_job(db, job_id, token)
+    if job is None:
+        return False
+    if job.resume_file is not None:
+        store_parse(job.resume_file, text, parsed)
+    job.status = ResumeParseStatus.DONE
+    job.result = parsed
+    job.error = None
+    job.finished_at = utcnow()
+    apply_parsed_resume(db, job.candidate, parsed)
+    db.commit()
+    return True
+
+
+def fail_job(db: Session, job_id: int, token: str, error: str, retry: bool = False,
+             max_attempts: int = RESUME_PARSE_MAX_ATTEMPTS) -> bool:
+    """Record a failed parse; with `retry` the job is queued again while it has attempts left"""
+    job = _claimed_job(db, job_id, token)
+    if job is None:
+        return False
+    job.claimed_by = None
+    job.error = error
+    if retry and job.attempts < max_attempts:
+        job.status = ResumeParseStatus.QUEUED
+    else:
+        job.status = ResumeParseStatus.FAILED
+        job.finished_at = utcnow()
+    db.commit()
+    return True
+
+
+def release_jobs(db: Session, job_ids: List[int], token: str):
+    """Hand unfinished jobs back to the queue on shutdown, without using up an attempt"""
+    if not job_ids:
+        return
+    db.execute(
+        update(ResumeParseJob)
+        .where(ResumeParseJob.id.in_(job_ids), ResumeParseJob.claimed_by == token,
+               ResumeParseJob.status == ResumeParseStatus.RUNNING)
+        .values(status=ResumeParseStatus.QUEUED, claimed_by=None, attempts=ResumeParseJob.attempts - 1)
+    )
+    db.commit()
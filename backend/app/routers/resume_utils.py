@@ -1,17 +1,34 @@
-import spacy
 import os
 import re
-from typing import Dict
-from docx import Document
-import pdfplumber
+import threading
+from typing import Dict, List, Optional, Tuple
 
-nlp = spacy.load("en_core_web_sm")
+from app.core.config import SPACY_MODEL
+
+# spaCy, python-docx and pdfplumber are imported on first use so that workers,
+# tests and scripts that never parse a resume don't pay for them at startup
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """The spaCy pipeline, loaded once per process on first use"""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL)
+    return _nlp
 
 def extract_text_from_docx(file_path: str) -> str:
+    from docx import Document
+
     doc = Document(file_path)
     return "\n".join([para.text for para in doc.paragraphs])
 
 def extract_text_from_pdf(file_path: str) -> str:
+    import pdfplumber
+
     text = ""
     with pdfplumber.open(file_path) as pdf:
         for page in pdf.pages:
@@ -20,6 +37,8 @@ def extract_text_from_pdf(file_path: str) -> str:
                 text += page_text + "\n"
     return text
 
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
 def extract_text(file_path: str) -> str:
     if file_path.lower().endswith(".pdf"):
         return extract_text_from_pdf(file_path)
@@ -36,23 +55,23 @@ def extract_phone(text: str) -> str:
     match = re.search(r'(\+91[-\s]?)?\d{10}', text)
     return match.group(0) if match else ""
 
-def parse_resume_spacy(file_path: str) -> Dict:
-    if not os.path.exists(file_path):
-        return {}
+EXPERIENCE_KEYWORDS = ["experience", "worked", "employed", "responsibilities", "internship"]
 
-    text = extract_text(file_path)
-    doc = nlp(text)
+# Longest resume text sent to spaCy; beyond a few pages it's not a resume, and
+# spaCy refuses texts over nlp.max_length
+MAX_RESUME_CHARS = 100000
 
+def resume_fields(text: str, doc) -> Dict:
+    """The parsed fields of a resume from its text and spaCy Doc"""
     name = ""
     experience_sentences = []
-    experience_keywords = ["experience", "worked", "employed", "responsibilities", "internship"]
 
     for ent in doc.ents:
         if ent.label_ == "PERSON" and not name:
             name = ent.text
 
     for sent in doc.sents:
-        if any(kw in sent.text.lower() for kw in experience_keywords):
+        if any(kw in sent.text.lower() for kw in EXPERIENCE_KEYWORDS):
             experience_sentences.append(sent.text.strip())
 
     return {
@@ -61,3 +80,32 @@ def parse_resume_spacy(file_path: str) -> Dict:
         "phone": extract_phone(text),
         "experience_summary": "\n".join(experience_sentences[:5])
     }
+
+def parse_resume_spacy(file_path: str) -> Dict:
+    return parse_resume_file(file_path)[1]
+
+def parse_resume_file(file_path: str, text: Optional[str] = None) -> Tuple[str, Dict]:
+    """(extracted text, parsed fields) of a resume; pass `text` when it was
+    already extracted. ("", {}) when the file doesn't exist"""
+    if text is None:
+        if not os.path.exists(file_path):
+            return "", {}
+        text = extract_text(file_path)[:MAX_RESUME_CHARS]
+    return text, resume_fields(text, get_nlp()(text))
+
+def try_extract_text(file_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """(text, None), or (None, error) when the file can't be read - for
+    extraction pools, where one bad file mustn't fail the batch"""
+    try:
+        return extract_text(file_path)[:MAX_RESUME_CHARS], None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def parse_resume_texts(texts: List[str], batch_size: int, n_process: int = 1) -> List[Dict]:
+    """resume_fields for many texts in one nlp.pipe pass, in order
+
+    Batching lets spaCy run its components over many documents at once, and
+    n_process > 1 spreads the batches over that many processes.
+    """
+    docs = get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [resume_fields(text, doc) for text, doc in zip(texts, docs)]
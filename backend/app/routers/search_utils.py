@@ -0,0 +1,140 @@
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, select, table
+from sqlalchemy.dialects.mysql import match
+
+from app.core.config import SEARCH_RANK_WINDOW
+from app.core.pagination import CursorPage
+from app.models.candidate import Candidate, CANDIDATE_SEARCH_COLUMNS
+
+FTS_TABLE = "candidates_fts"
+fts_table = table(FTS_TABLE, column("rowid"))
+
+# bm25 column weights, in CANDIDATE_SEARCH_COLUMNS order: a hit on the name
+# ranks above one in the email, designation, qualification or resume text
+SQLITE_COLUMN_WEIGHTS = (10.0, 10.0, 5.0, 4.0, 2.0, 1.0)
+
+_TERM = re.compile(r'"([^"]*)"?|(\S+)')
+_WORD = re.compile(r"\w+")
+
+
+class SearchTerm:
+    """One required term of a search: a single word or a phrase, optionally a prefix"""
+
+    def __init__(self, words: List[str], prefix: bool = False):
+        self.words = words
+        self.prefix = prefix
+
+
+def parse_search_query(query: str) -> List[SearchTerm]:
+    """Split a search box query into terms that must all match
+
+    `"machine learning"` is a phrase, `dev*` a prefix, anything else a word.
+    Punctuation separates words, so `node.js` becomes the phrase "node js".
+    """
+    terms = []
+    for phrase, bare in _TERM.findall(query or ""):
+        words = _WORD.findall(phrase or bare)
+        if not words:
+            continue
+        prefix = bool(bare) and bare.endswith("*") and len(words) == 1
+        terms.append(SearchTerm(words, prefix=prefix))
+    return terms
+
+
+def parse_skills(skills: Optional[str]) -> List[SearchTerm]:
+    """Comma-separated skills; each skill is matched as a phrase"""
+    terms = []
+    for skill in (skills or "").split(","):
+        words = _WORD.findall(skill)
+        if words:
+            terms.append(SearchTerm(words))
+    return terms
+
+
+def to_fts5(terms: List[SearchTerm]) -> str:
+    """FTS5 query syntax: every term quoted, so user input can't inject operators"""
+    parts = []
+    for term in terms:
+        part = '"' + " ".join(term.words) + '"'
+        parts.append(part + "*" if term.prefix else part)
+    return " AND ".join(parts)
+
+
+def to_mysql_boolean(terms: List[SearchTerm]) -> str:
+    """MySQL boolean mode: every term required (+), phrases quoted, prefixes with *"""
+    parts = []
+    for term in terms:
+        if len(term.words) > 1:
+            parts.append('+"' + " ".join(term.words) + '"')
+        else:
+            parts.append("+" + term.words[0] + ("*" if term.prefix else ""))
+    return " ".join(parts)
+
+
+def fulltext_search(query_filter, dialect_name: str, terms: List[SearchTerm], skill_terms: List[SearchTerm],
+                    page: Optional[CursorPage], filters=(), rank_window: int = SEARCH_RANK_WINDOW):
+    """Page of full-text matches as (Candidate, relevance) rows, best match first
+
+    `query_filter` is the select(Candidate) (or of candidates columns) to return
+    rows from and `filters` any other conditions on candidates. Without a
+    `page`, every match is returned, still best first. Returns None when the
+    database has no full-text index to use.
+
+    SQLite ranks candidates_fts rows by bm25 before joining candidates, so only
+    the rows on the page are read from the table. Ranking visits every match,
+    so without other filters only the newest `rank_window` matches are ranked.
+    MySQL uses MATCH ... AGAINST in boolean mode on the FULLTEXT indexes; words
+    shorter than innodb_ft_min_token_size (3 by default) and stopwords are
+    ignored there.
+    """
+    if dialect_name == "sqlite":
+        expression = to_fts5(terms)
+        if skill_terms:
+            expression = f"({expression}) AND experience_details : ({to_fts5(skill_terms)})"
+        # FTS5 takes the table name itself as the MATCH operand and bm25 argument
+        fts = literal_column(FTS_TABLE)
+        matches = fts.op("MATCH")(expression)
+        relevance = (-func.bm25(fts, *SQLITE_COLUMN_WEIGHTS)).label("relevance")
+        ranked = select(fts_table.c.rowid, relevance).where(matches)
+        if filters:
+            ranked = ranked.join(Candidate, Candidate.id == fts_table.c.rowid).where(*filters)
+        elif rank_window:
+            # Matches come out of FTS5 in rowid order, so finding the rowid of the
+            # Nth newest one is cheap; NULL when there are fewer matches
+            oldest_ranked = (
+                select(fts_table.c.rowid).where(matches).order_by(fts_table.c.rowid.desc())
+                .limit(1).offset(rank_window - 1).correlate(None).scalar_subquery()
+            )
+            ranked = ranked.where(fts_table.c.rowid >= func.coalesce(oldest_ranked, 0))
+        if page is not None:
+            ranked = page.apply(ranked, relevance, fts_table.c.rowid)
+        ranked = ranked.subquery("ranked")
+        return (
+            query_filter
+            .join(ranked, ranked.c.rowid == Candidate.id)
+            .add_columns(ranked.c.relevance)
+            .order_by(ranked.c.relevance.desc(), Candidate.id.desc())
+        )
+
+    if dialect_name in ("mysql", "mariadb"):
+        columns = [getattr(Candidate, name) for name in CANDIDATE_SEARCH_COLUMNS]
+        relevance = match(*columns, against=to_mysql_boolean(terms)).in_boolean_mode()
+        # A bare MATCH in WHERE is what lets MySQL drive the query from the FULLTEXT index
+        query_filter = query_filter.where(relevance, *filters)
+        if skill_terms:
+            query_filter = query_filter.where(
+                match(Candidate.experience_details, against=to_mysql_boolean(skill_terms)).in_boolean_mode()
+            )
+        relevance = relevance.label("relevance")
+        if page is None:
+            return query_filter.add_columns(relevance).order_by(relevance.desc(), Candidate.id.desc())
+        return page.apply(query_filter.add_columns(relevance), relevance, Candidate.id)
+
+    return None
+
+
+def fulltext_cursor_key(row) -> Tuple[float, int]:
+    """Keyset of a (Candidate, relevance) search row, for CursorPage.finish"""
+    return row.relevance, row.Candidate.id
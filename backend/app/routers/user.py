@@ -174,25 +174,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.core.security import get_password_hash
 from app.models.user import User as UserModel   # SQLAlchemy model
 from app.schemas.user import UserCreate, UserUpdate, User as UserSchema  # Pydantic schema
-from passlib.context import CryptContext
 from typing import List
 from app.models.user import UserRole
-from app.core.security import get_current_user
+from app.core.security import get_current_user, invalidate_cached_user, hash_password_bounded, hash_passwords_bulk
 
 router = APIRouter(
     prefix="/users",
     tags=["Users"]
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# Utility for hashing password
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
-
 # Create User
 @router.post("/", response_model=UserSchema)
 def create_user(user: UserCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
@@ -202,7 +194,7 @@ def create_user(user: UserCreate, db: Session = Depends(get_db), current_user=De
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_pw = get_password_hash(user.password)
+    hashed_pw = hash_password_bounded(user.password)
     new_user = UserModel(
         email=user.email,
         username=user.username,
@@ -217,6 +209,50 @@ def create_user(user: UserCreate, db: Session = Depends(get_db), current_user=De
     db.refresh(new_user)
     return new_user
 
+# Bulk provisioning - passwords are hashed in parallel on a process pool
+MAX_BULK_USERS = 1000
+
+@router.post("/bulk", response_model=List[UserSchema])
+def create_users_bulk(users: List[UserCreate], db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    if current_user.role not in [UserRole.ADMIN, UserRole.HR_SPOC]:
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not users:
+        raise HTTPException(status_code=400, detail="No users provided")
+    if len(users) > MAX_BULK_USERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_USERS} users per request")
+
+    emails = [u.email for u in users]
+    usernames = [u.username for u in users]
+    if len(set(emails)) != len(emails) or len(set(usernames)) != len(usernames):
+        raise HTTPException(status_code=400, detail="Duplicate email or username in request")
+
+    existing = db.query(UserModel.email, UserModel.username).filter(
+        (UserModel.email.in_(emails)) | (UserModel.username.in_(usernames))
+    ).all()
+    if existing:
+        taken = sorted({row.email for row in existing if row.email in emails} |
+                       {row.username for row in existing if row.username in usernames})
+        raise HTTPException(status_code=400, detail=f"Already registered: {', '.join(taken)}")
+
+    hashed_passwords = hash_passwords_bulk([u.password for u in users])
+    new_users = [
+        UserModel(
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            role=user.role,
+            hashed_password=hashed_pw,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+        )
+        for user, hashed_pw in zip(users, hashed_passwords)
+    ]
+    db.add_all(new_users)
+    db.commit()
+    for new_user in new_users:
+        db.refresh(new_user)
+    return new_users
+
 # Get All Users
 @router.get("/", response_model=List[UserSchema])
 def get_users(db: Session = Depends(get_db)):
@@ -240,16 +276,18 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
     user = db.query(UserModel).filter(UserModel.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_email = user.email
 
     for key, value in user_update.dict(exclude_unset=True).items():
         if key == "password":
-            value = get_password_hash(value)
+            value = hash_password_bounded(value)
             setattr(user, "hashed_password", value)  # map password -> hashed_password
         else:
             setattr(user, key, value)
 
     db.commit()
     db.refresh(user)
+    invalidate_cached_user(previous_email, user.email)
     return user
 
 # Delete User
@@ -261,6 +299,8 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_user=Depend
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    email = user.email
     db.delete(user)
     db.commit()
+    invalidate_cached_user(email)
     return {"message": "User deleted successfully"}
@@ -0,0 +1,222 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import bindparam, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import WHATSAPP_RETRY_BASE_SECONDS, WHATSAPP_SEND_MAX_ATTEMPTS, WHATSAPP_SEND_TIMEOUT_SECONDS
+from app.core.whatsapp_providers import DeliveryUpdate, OutboundMessage, SendResult
+from app.models.candidate import Candidate, WhatsAppCommunication, WhatsAppMessageStatus
+from app.routers.candidate_bulk_utils import selection_conditions
+from app.schemas.candidate import CandidateBulkSelection
+
+MESSAGES = WhatsAppCommunication.__table__
+# Longest retry backoff, whatever the attempt count
+MAX_RETRY_DELAY_SECONDS = 3600
+
+# A receipt only moves a message forward: a late "delivered" doesn't undo "read"
+RECEIPT_STATUSES = {
+    "delivered": (WhatsAppMessageStatus.DELIVERED, "delivered_at", (WhatsAppMessageStatus.SENT,)),
+    "read": (WhatsAppMessageStatus.READ, "read_at", (WhatsAppMessageStatus.SENT, WhatsAppMessageStatus.DELIVERED)),
+    "failed": (WhatsAppMessageStatus.FAILED, None, (WhatsAppMessageStatus.SENT,)),
+}
+
+
+class SendOutcome(NamedTuple):
+    message_id: int
+    attempts: int
+    result: SendResult
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def queue_message(communication: WhatsAppCommunication):
+    """Queue an existing message for sending; committed with the caller's transaction"""
+    communication.status = WhatsAppMessageStatus.QUEUED.value
+    communication.attempts = 0
+    communication.claimed_by = None
+    communication.next_attempt_at = None
+    communication.error = None
+
+
+def queue_bulk_messages(db: Session, selection: CandidateBulkSelection, content: str, message_type: str,
+                        owner_id: Optional[int] = None) -> int:
+    """Queue one message per selected candidate with a phone number, with a single
+    INSERT ... SELECT, and commit; returns the number queued"""
+    conditions = selection_conditions(selection)
+    if owner_id is not None:
+        conditions.append(Candidate.created_by == owner_id)
+    rows = select(
+        Candidate.id, Candidate.phone, literal(content), literal(message_type),
+        literal(WhatsAppMessageStatus.QUEUED.value), literal(0),
+    ).where(*conditions, Candidate.phone.is_not(None), Candidate.phone != "")
+    result = db.execute(insert(MESSAGES).from_select(
+        ["candidate_id", "phone_number", "message_content", "message_type", "status", "attempts"], rows
+    ))
+    db.commit()
+    return result.rowcount
+
+
+def claim_messages(db: Session, limit: int, token: str,
+                   lease_seconds: int = WHATSAPP_SEND_TIMEOUT_SECONDS) -> List[OutboundMessage]:
+    """Claim up to `limit` of the oldest queued messages that are due
+
+    As with resume parse jobs, the UPDATE only moves rows that are still
+    queued, so racing dispatchers each get different messages. A claim is a
+    lease: next_attempt_at becomes its expiry.
+    """
+    if limit <= 0:
+        return []
+    now = utcnow()
+    ids = db.scalars(
+        select(WhatsAppCommunication.id)
+        .where(WhatsAppCommunication.status == WhatsAppMessageStatus.QUEUED.value,
+               or_(WhatsAppCommunication.next_attempt_at.is_(None), WhatsAppCommunication.next_attempt_at <= now))
+        .order_by(WhatsAppCommunication.id)
+        .limit(limit)
+    ).all()
+    if not ids:
+        return []
+    db.execute(
+        update(WhatsAppCommunication)
+        .where(WhatsAppCommunication.id.in_(ids), WhatsAppCommunication.status == WhatsAppMessageStatus.QUEUED.value)
+        .values(
+            status=WhatsAppMessageStatus.SENDING.value, claimed_by=token,
+            next_attempt_at=now + timedelta(seconds=lease_seconds), attempts=WhatsAppCommunication.attempts + 1,
+        )
+    )
+    db.commit()
+    rows = db.execute(
+        select(WhatsAppCommunication.id, WhatsAppCommunication.phone_number, WhatsAppCommunication.message_content,
+               WhatsAppCommunication.message_type, WhatsAppCommunication.attempts)
+        .where(WhatsAppCommunication.claimed_by == token,
+               WhatsAppCommunication.status == WhatsAppMessageStatus.SENDING.value)
+        .order_by(WhatsAppCommunication.id)
+    ).all()
+    return [OutboundMessage(*row) for row in rows]
+
+
+def retry_delay(attempts: int, result: SendResult, base_seconds: float = WHATSAPP_RETRY_BASE_SECONDS) -> float:
+    """Seconds before the next attempt: the provider's Retry-After, else exponential backoff"""
+    if result.retry_after is not None:
+        return result.retry_after
+    return min(base_seconds * 2 ** (attempts - 1), MAX_RETRY_DELAY_SECONDS)
+
+
+# One executemany UPDATE per outcome; rows no longer claimed with the token
+# (lease expired and taken over) are left alone
+_FINISH_WHERE = (
+    (MESSAGES.c.id == bindparam("message_id")) & (MESSAGES.c.claimed_by == bindparam("token"))
+    & (MESSAGES.c.status == WhatsAppMessageStatus.SENDING.value)
+)
+_MARK_SENT = update(MESSAGES).where(_FINISH_WHERE).values(
+    status=WhatsAppMessageStatus.SENT.value, claimed_by=None, next_attempt_at=None, error=None,
+    sent_at=bindparam("at"), provider_message_id=bindparam("provider_id"),
+)
+_MARK_RETRY = update(MESSAGES).where(_FINISH_WHERE).values(
+    status=WhatsAppMessageStatus.QUEUED.value, claimed_by=None, error=bindparam("message_error"),
+    next_attempt_at=bindparam("retry_at"),
+)
+_MARK_FAILED = update(MESSAGES).where(_FINISH_WHERE).values(
+    status=WhatsAppMessageStatus.FAILED.value, claimed_by=None, next_attempt_at=None,
+    error=bindparam("message_error"),
+)
+
+
+def finish_messages(db: Session, token: str, outcomes: Sequence[SendOutcome],
+                    max_attempts: int = WHATSAPP_SEND_MAX_ATTEMPTS) -> Dict[str, int]:
+    """Record a batch of send results in one transaction; returns counts of sent,
+    retried and failed messages"""
+    now = utcnow()
+    sent, retried, failed = [], [], []
+    for message_id, attempts, result in outcomes:
+        params = {"message_id": message_id, "token": token}
+        if result.ok:
+            sent.append(dict(params, at=now, provider_id=result.provider_message_id))
+        elif result.retryable and attempts < max_attempts:
+            retry_at = now + timedelta(seconds=retry_delay(attempts, result))
+            retried.append(dict(params, message_error=result.error, retry_at=retry_at))
+        else:
+            failed.append(dict(params, message_error=result.error))
+    for statement, params in ((_MARK_SENT, sent), (_MARK_RETRY, retried), (_MARK_FAILED, failed)):
+        if params:
+            db.execute(statement, params)
+    db.commit()
+    return {"sent": len(sent), "retried": len(retried), "failed": len(failed)}
+
+
+def release_messages(db: Session, message_ids: Iterable[int], token: str):
+    """Hand claimed messages that weren't sent back to the queue, without using up an attempt"""
+    message_ids = list(message_ids)
+    if not message_ids:
+        return
+    db.execute(
+        update(WhatsAppCommunication)
+        .where(WhatsAppCommunication.id.in_(message_ids), WhatsAppCommunication.claimed_by == token,
+               WhatsAppCommunication.status == WhatsAppMessageStatus.SENDING.value)
+        .values(status=WhatsAppMessageStatus.QUEUED.value, claimed_by=None, next_attempt_at=None,
+                attempts=WhatsAppCommunication.attempts - 1)
+    )
+    db.commit()
+
+
+def requeue_stale_messages(db: Session, max_attempts: int = WHATSAPP_SEND_MAX_ATTEMPTS) -> int:
+    """Put back messages whose claim expired (their dispatcher stopped mid-send),
+    or fail them when out of attempts; returns the number requeued
+
+    The provider may have accepted such a message before the dispatcher died,
+    so it can be sent twice - delivery is at least once.
+    """
+    stale = [
+        WhatsAppCommunication.status == WhatsAppMessageStatus.SENDING.value,
+        WhatsAppCommunication.next_attempt_at < utcnow(),
+    ]
+    db.execute(
+        update(WhatsAppCommunication)
+        .where(*stale, WhatsAppCommunication.attempts >= max_attempts)
+        .values(status=WhatsAppMessageStatus.FAILED.value, claimed_by=None, next_attempt_at=None,
+                error="Send timed out")
+    )
+    requeued = db.execute(
+        update(WhatsAppCommunication)
+        .where(*stale)
+        .values(status=WhatsAppMessageStatus.QUEUED.value, claimed_by=None, next_attempt_at=None)
+    ).rowcount
+    db.commit()
+    return requeued
+
+
+def record_delivery_updates(db: Session, updates: Iterable[DeliveryUpdate]) -> int:
+    """Apply provider delivery receipts in one transaction; returns the number
+    of messages changed"""
+    by_status: Dict[str, List[Dict]] = {}
+    for receipt in updates:
+        if receipt.status in RECEIPT_STATUSES:
+            by_status.setdefault(receipt.status, []).append({
+                "provider_id": receipt.provider_message_id,
+                "at": receipt.timestamp or utcnow(),
+                "message_error": receipt.error,
+            })
+    changed = 0
+    for status, params in by_status.items():
+        new_status, timestamp_column, after = RECEIPT_STATUSES[status]
+        values = {"status": new_status.value}
+        if timestamp_column:
+            values[timestamp_column] = bindparam("at")
+        if new_status == WhatsAppMessageStatus.READ:
+            # Read implies delivered, whether or not that receipt arrived
+            values["delivered_at"] = func.coalesce(MESSAGES.c.delivered_at, bindparam("at"))
+        if new_status == WhatsAppMessageStatus.FAILED:
+            values["error"] = bindparam("message_error")
+        statement = update(MESSAGES).where(
+            MESSAGES.c.provider_message_id == bindparam("provider_id"),
+            MESSAGES.c.status.in_([state.value for state in after]),
+        ).values(values)
+        # One statement per receipt: executemany rowcounts aren't reliable on every driver
+        for param in params:
+            changed += db.execute(statement, param).rowcount
+    db.commit()
+    return changed
+
@@ -1,7 +1,10 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, computed_field, model_validator
+from typing import Any, Dict, List, Optional
 from datetime import datetime, date
+from app.core.config import CANDIDATE_BULK_MAX_IDS
 from app.models.candidate import CandidateStatus, CandidateSource
+from app.models.offer_batch import OfferBatchStatus
+from app.models.resume_parse_job import ResumeParseStatus
 from .user import User
 
 class CandidateBase(BaseModel):
@@ -105,6 +108,9 @@ class WhatsAppCommunicationUpdate(BaseModel):
 
 class WhatsAppCommunication(WhatsAppCommunicationBase):
     id: int
+    attempts: int = 0
+    provider_message_id: Optional[str] = None
+    error: Optional[str] = None
     sent_at: Optional[datetime] = None
     delivered_at: Optional[datetime] = None
     read_at: Optional[datetime] = None
@@ -112,4 +118,101 @@ class WhatsAppCommunication(WhatsAppCommunicationBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class ResumeParseJob(BaseModel):
+    id: int
+    candidate_id: int
+    status: ResumeParseStatus
+    attempts: int
+    # The parsed fields (name, email, phone, experience_summary) once status is "done"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class CandidateBulkFilter(BaseModel):
+    """Candidates a bulk change applies to when no ids are given; all set fields must match"""
+    status: Optional[CandidateStatus] = None
+    is_in_pool: Optional[bool] = None
+    job_id: Optional[int] = None
+    source: Optional[CandidateSource] = None
+    created_by: Optional[int] = None
+
+class CandidateBulkSelection(BaseModel):
+    """Either `ids` or a non-empty `filter`"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=CANDIDATE_BULK_MAX_IDS)
+    filter: Optional[CandidateBulkFilter] = None
+
+    @model_validator(mode="after")
+    def _one_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Give either ids or filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            # An empty filter would change every candidate
+            raise ValueError("filter needs at least one field")
+        return self
+
+class CandidateBulkPoolUpdate(CandidateBulkSelection):
+    in_pool: bool
+
+class CandidateBulkStatusUpdate(CandidateBulkSelection):
+    status: Optional[CandidateStatus] = None
+    reason_of_rejection: Optional[str] = None
+    reason_for_kiv_other_roles: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _has_change(self):
+        if not {"status", "reason_of_rejection", "reason_for_kiv_other_roles"} & self.model_fields_set:
+            raise ValueError("Give status, reason_of_rejection or reason_for_kiv_other_roles")
+        return self
+
+class WhatsAppBulkSend(CandidateBulkSelection):
+    message_content: str = Field(..., min_length=1)
+    message_type: str = "Initial Contact"
+
+class WhatsAppBulkResult(BaseModel):
+    message: str
+    # Selected candidates without a phone number, or not yours, get no message
+    queued: int
+
+class OfferBatchQueued(BaseModel):
+    message: str
+    batch_id: int
+    # Shortlisted candidates among the selection; only they get offers
+    total: int
+    status: OfferBatchStatus
+
+class OfferBatch(BaseModel):
+    id: int
+    status: OfferBatchStatus
+    total: int
+    rendered: int
+    failed: int
+    # {"offers": [{"candidate_id", "offer_id"}], "errors": [{"candidate_id", "error"}]} once status is "done"
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """Share of the letters rendered or failed, 0 to 1"""
+        return round((self.rendered + self.failed) / self.total, 3) if self.total else 1.0
+
+    class Config:
+        from_attributes = True
+
+class CandidateBulkResult(BaseModel):
+    message: str
+    updated: int
+    # With ids: how many were asked for, and how many of those weren't found or
+    # aren't yours to change
+    requested: Optional[int] = None
+    skipped: Optional[int] = None
@@ -4,6 +4,7 @@ from datetime import datetime, date
 from app.models.job import JobStatus, JobType, LocationType, Branch
 from app.models.interview import RoundType
 from .user import User
+from .candidate import Candidate
 
 
 class DepartmentBase(BaseModel):
@@ -103,6 +104,15 @@ class Job(JobBase):
         from_attributes = True
 
 
+class PoolCandidateMatch(BaseModel):
+    """A pool candidate ranked for a job"""
+    candidate: Candidate
+    # SKILL_WEIGHT x skill_score + EXPERIENCE_WEIGHT x experience_fit (app/routers/pool_scoring_utils.py)
+    score: float
+    skill_score: float
+    experience_fit: float
+    matched_skills: List[str]
+
 
 class RecruitmentWorkflowBase(BaseModel):
     name: str
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Concurrent throughput benchmark: sync Session vs AsyncSession inside `async def` routes
+
+Seeds a throwaway SQLite database and mounts the same slow candidate query behind
+`get_db` and `get_async_db`. While that query is hammered concurrently, a cheap
+`/ping` route is polled on the same worker; with the sync Session every ping
+queues behind the blocked event loop, with the AsyncSession it does not.
+
+Usage: python benchmarks/bench_async_db.py [--rows 50000] [--requests 200] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+DB_FILE = os.path.join(tempfile.mkdtemp(), "bench_async_db.sqlite")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, SessionLocal, engine, get_async_db, get_db
+from app.models import *  # noqa: F401,F403 - register every mapper
+from app.models.candidate import Candidate
+
+
+def seed(rows: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(Candidate, [
+            {
+                "first_name": f"Candidate{i}",
+                "last_name": "Bench",
+                "phone": f"9{i:09d}",
+                "experience_details": "python sql fastapi " * 20 + str(i),
+                "is_in_pool": i % 3 == 0,
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def search_stmt():
+    # Unindexable LIKE over a text column - a realistic "slow" query
+    return select(func.count(Candidate.id)).where(Candidate.experience_details.like("%fastapi%9%"))
+
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync")
+async def sync_route(db: Session = Depends(get_db)):
+    return {"count": db.execute(search_stmt()).scalar()}
+
+
+@bench_app.get("/async")
+async def async_route(db: AsyncSession = Depends(get_async_db)):
+    return {"count": await db.scalar(search_stmt())}
+
+
+@bench_app.get("/ping")
+async def ping():
+    return {"status": "ok"}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(path: str, total: int, concurrency: int):
+    transport = httpx.ASGITransport(app=bench_app)
+    semaphore = asyncio.Semaphore(concurrency)
+    ping_latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        async def poll(done: asyncio.Event):
+            # Latency is measured from when the ping was *due*, so time spent
+            # waiting for a blocked event loop is counted too
+            interval = 0.005
+            due = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - due)
+                due = max(due + interval, time.perf_counter())
+
+        await client.get(path)  # warm up the pool
+        done = asyncio.Event()
+        poller = asyncio.create_task(poll(done))
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await poller
+    return elapsed, ping_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Seeding {args.rows} candidates into {DB_FILE} ...")
+    seed(args.rows)
+
+    results = {}
+    for label, path in (("sync Session (before)", "/sync"), ("AsyncSession (after)", "/async")):
+        elapsed, pings = asyncio.run(run(path, args.requests, args.concurrency))
+        results[label] = (args.requests / elapsed, len(pings) / elapsed, percentile(pings, 99))
+        print(
+            f"{label:<24} query {results[label][0]:7.1f} req/s | "
+            f"ping {results[label][1]:7.1f} req/s, "
+            f"p50 {percentile(pings, 50) * 1000:7.1f} ms, p99 {results[label][2] * 1000:7.1f} ms"
+        )
+
+    before, after = results.values()
+    print(
+        f"Total throughput (query + ping): {before[0] + before[1]:.1f} -> {after[0] + after[1]:.1f} req/s; "
+        f"ping p99 {before[2] * 1000:.1f} -> {after[2] * 1000:.1f} ms at concurrency {args.concurrency}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Candidate Excel import benchmark: --rows candidates from an .xlsx upload
+
+Compares, each into a fresh SQLite database:
+
+  before    - what POST /candidates/upload-excel/ used to do: read the upload
+              into memory, pandas.read_excel, one ORM db.add per row, and a
+              single commit at the end
+  streaming - import_candidates: openpyxl read-only rows, per-chunk column
+              validation, one multi-row INSERT and commit per chunk
+
+Each variant runs in a fresh process; reports wall time, rows per second and
+the process's peak RSS. 1% of the generated rows are invalid; "before" skips
+them up front (it would abort the whole import otherwise).
+
+Usage: python benchmarks/bench_excel_import.py [--rows 100000] [--chunk-size 1000]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from openpyxl.utils import get_column_letter
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models import *  # noqa: F401,F403 - register every mapper
+from app.models.candidate import Candidate
+from app.routers.candidate_import_utils import IMPORT_COLUMNS, import_candidates
+
+CITIES = ["Noida", "Delhi", "Pune", "Mumbai", "Bengaluru", "Chennai"]
+EDUCATION = ["Graduate", "Post Graduate", "Diploma", "XIIth", None]
+
+
+# A minimal .xlsx as Excel writes it: text in the shared strings table (openpyxl
+# writes inline strings, which are slower to read back than what users upload)
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Candidates" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '<Relationship Id="rId2" Target="sharedStrings.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>'
+    '</Relationships>'
+)
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+def write_xlsx(path: str, rows):
+    strings = {}
+    sheet = [f'<?xml version="1.0" encoding="UTF-8"?><worksheet xmlns="{MAIN_NS}"><sheetData>']
+    for number, row in enumerate(rows, start=1):
+        cells = []
+        for column, value in enumerate(row):
+            ref = f"{get_column_letter(column + 1)}{number}"
+            if isinstance(value, str):
+                index = strings.setdefault(value, len(strings))
+                cells.append(f'<c r="{ref}" t="s"><v>{index}</v></c>')
+            elif value is not None:
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+        sheet.append(f'<row r="{number}">{"".join(cells)}</row>')
+    sheet.append("</sheetData></worksheet>")
+    shared = "".join(f"<si><t>{escape(value)}</t></si>" for value in strings)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", ROOT_RELS)
+        archive.writestr("xl/workbook.xml", WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", WORKBOOK_RELS)
+        archive.writestr("xl/worksheets/sheet1.xml", "".join(sheet))
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            f'<?xml version="1.0" encoding="UTF-8"?><sst xmlns="{MAIN_NS}" uniqueCount="{len(strings)}">{shared}</sst>',
+        )
+
+
+def build_sheet(path: str, rows: int):
+    rng = random.Random(7)
+
+    def generate():
+        yield list(IMPORT_COLUMNS)
+        for i in range(rows):
+            invalid = i % 100 == 99
+            yield [
+                None if invalid else f"Candidate{i}", "Bench", f"c{i}@example.com", 9000000000 + i,
+                "UP", rng.choice(CITIES), f"Sector {i % 150}", 201300 + i % 50, rng.choice(EDUCATION),
+            ]
+
+    write_xlsx(path, generate())
+
+
+def import_before(db, path, created_by):
+    import pandas as pd
+
+    with open(path, "rb") as upload:
+        contents = upload.read()
+    from io import BytesIO
+    df = pd.read_excel(BytesIO(contents))
+    df.columns = df.columns.str.strip().str.lower()
+    df = df[df["first_name"].notna()]
+    for _, row in df.iterrows():
+        db.add(Candidate(
+            **{column: str(row[column]).strip() if pd.notna(row[column]) else None for column in IMPORT_COLUMNS},
+            created_by=created_by,
+        ))
+    db.commit()
+
+
+def import_streaming(db, path, created_by, chunk_size):
+    with open(path, "rb") as upload:
+        import_candidates(db, upload, created_by=created_by, chunk_size=chunk_size)
+
+
+def peak_rss_mb() -> float:
+    # VmHWM restarts at exec, unlike ru_maxrss which a spawned worker inherits
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(name, path, workdir, chunk_size):
+    """Runs in a fresh worker process"""
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, name + '.sqlite')}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        start = time.perf_counter()
+        if name == "before":
+            import_before(db, path, 1)
+        else:
+            import_streaming(db, path, 1, chunk_size)
+        elapsed = time.perf_counter() - start
+        count = db.scalar(select(func.count(Candidate.id)))
+    engine.dispose()
+    return elapsed, peak_rss_mb(), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--skip-before", action="store_true", help="only time the streaming importer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "candidates.xlsx")
+        build_sheet(path, args.rows)
+        print(f"{args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB .xlsx")
+        variants = ["streaming"] if args.skip_before else ["before", "streaming"]
+        for name in variants:
+            with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                elapsed, peak_rss, count = pool.submit(run, name, path, workdir, args.chunk_size).result()
+            print(f"  {name:<10} {elapsed:6.1f} s  {count / elapsed:8.0f} rows/s  peak RSS {peak_rss:6.0f} MB  "
+                  f"{count} imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Pool matching benchmark: per-candidate set intersection vs the skill matrix
+
+Generates --rows synthetic pool candidates (3-8 skills each, Zipf-like skill
+frequencies, free-text years of experience) and, for a handful of jobs, times:
+
+  loop    - what get_pool_candidates_to_job used to do: split every
+            candidate's skills into a set and intersect it with the job's,
+            then check the experience range (unranked)
+  build   - PoolSkillMatrix construction (once per worker and pool change)
+  score   - PoolSkillMatrix.score: every candidate scored, top --limit ranked
+
+Usage: python benchmarks/bench_pool_scoring.py [--rows 500000] [--limit 20] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.routers.pool_scoring_utils import PoolSkillMatrix, normalize_skills, parse_years
+
+# 400 skills with Zipf-like frequencies: a few in most profiles, most of them rare
+SKILLS = [f"skill {i}" for i in range(400)]
+SKILL_WEIGHTS = [1 / (rank + 1) for rank in range(len(SKILLS))]
+
+JOBS = [
+    ("common skills", "skill 0, skill 1, skill 2", (2, 5)),
+    ("rare skills", "skill 150, skill 220, skill 390", (0, 3)),
+    ("mixed, no range", "skill 3, skill 40, skill 97, skill 250, skill 301", None),
+    ("many skills", ", ".join(f"skill {i}" for i in range(0, 60, 3)), (5, 10)),
+]
+
+
+def generate_pool(rows: int):
+    rng = random.Random(42)
+    cover_letters, experience = [], []
+    for _ in range(rows):
+        cover_letters.append(", ".join(rng.choices(SKILLS, SKILL_WEIGHTS, k=rng.randint(3, 8))))
+        experience.append(rng.choice([None, f"{rng.randint(0, 15)}", f"{rng.randint(0, 15)}.5 years"]))
+    return cover_letters, experience
+
+
+def loop_match(cover_letters, experience, required_skills, experience_range):
+    required = {skill.strip().lower() for skill in required_skills.split(",")}
+    matched = []
+    for candidate_id, (cover_letter, years) in enumerate(zip(cover_letters, experience), start=1):
+        skills = {skill.strip().lower() for skill in cover_letter.split(",")}
+        if not required & skills:
+            continue
+        if experience_range is not None:
+            value = parse_years(years)
+            if value is None or not experience_range[0] <= value <= experience_range[1]:
+                continue
+        matched.append(candidate_id)
+    return matched
+
+
+def timed(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Generating {args.rows} pool candidates...")
+    cover_letters, experience = generate_pool(args.rows)
+
+    start = time.perf_counter()
+    matrix = PoolSkillMatrix(
+        range(1, args.rows + 1), (normalize_skills(text) for text in cover_letters),
+        [parse_years(years) for years in experience],
+    )
+    build = time.perf_counter() - start
+    print(f"build: {build:.2f}s for {matrix.matrix.nnz} candidate skills, "
+          f"{matrix.matrix.data.nbytes + matrix.matrix.indices.nbytes + matrix.matrix.indptr.nbytes >> 20} MiB")
+
+    print(f"\n{'job':<18} {'loop (ms)':>10} {'matches':>9} {'score (ms)':>11} {'best score':>11}")
+    for name, required_skills, experience_range in JOBS:
+        loop_time, matched = timed(
+            lambda: loop_match(cover_letters, experience, required_skills, experience_range), max(1, args.repeat // 2)
+        )
+        low, high = experience_range or (None, None)
+        score_time, ranked = timed(
+            lambda: matrix.score(normalize_skills(required_skills), low, high, args.limit), args.repeat
+        )
+        best = f"{ranked[0].score:.4f}" if ranked else "-"
+        print(f"{name:<18} {loop_time * 1000:>10.1f} {len(matched):>9} {score_time * 1000:>11.1f} {best:>11}")
+
+
+if __name__ == "__main__":
+    main()
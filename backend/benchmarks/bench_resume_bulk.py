@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Resume parsing throughput: one file at a time vs the bulk upload path
+
+Generates --resumes synthetic one-page resumes (half .docx, half .pdf) and
+parses them with:
+
+  single - resume_utils.parse_resume_spacy per file, as
+           POST /candidates/{id}/upload-resume does: extract, then nlp(text)
+  bulk   - what POST /candidates/upload-resumes/ does: text extracted on the
+           extraction process pool, then one nlp.pipe pass over the batch
+
+The spaCy pipeline is loaded (and the extraction pool started) before timing,
+as in a warmed-up API worker. Uses SPACY_MODEL when it is installed; otherwise
+a blank English pipeline with a sentencizer and a rule-based PERSON
+recogniser, which makes the NLP share of the work much smaller than with a
+trained model - pass --model to pick one explicitly.
+
+Usage: python benchmarks/bench_resume_bulk.py [--resumes 400] [--batch-size 32] [--n-process 1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+FIRST_NAMES = ["Asha", "Ravi", "Priya", "Amit", "Neha", "Vikram", "Sneha", "Rahul", "Pooja", "Arjun"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Rao", "Gupta", "Singh", "Nair", "Patel", "Mehta", "Kumar"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Stark Industries", "Wayne Enterprises"]
+SKILLS = ["Python", "SQL", "Excel", "payroll", "recruitment", "sales", "React", "Tally", "negotiation", "Java"]
+
+
+def resolve_model(model: str, workdir: str) -> str:
+    """A loadable SPACY_MODEL: the named package, or a saved fallback pipeline"""
+    import spacy
+
+    if model != "fallback":
+        try:
+            spacy.load(model)
+            return model
+        except OSError:
+            print(f"spaCy model {model!r} is not installed; using the fallback pipeline")
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PERSON", "pattern": f"{first} {last}"}
+                        for first in FIRST_NAMES for last in LAST_NAMES])
+    path = os.path.join(workdir, "fallback_model")
+    nlp.to_disk(path)
+    return path
+
+
+def resume_lines(rng, i):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name, f"{name.split()[0].lower()}{i}@example.com | +91 9{i:09d}", "Professional Summary"]
+    for _ in range(rng.randint(3, 5)):
+        company, years = rng.choice(COMPANIES), rng.randint(1, 6)
+        lines.append(
+            f"Worked at {company} for {years} years on {', '.join(rng.sample(SKILLS, 3))}. "
+            f"Responsibilities included hiring, reporting and stakeholder management across {years + 2} teams."
+        )
+    lines += ["Education: B.Tech, 2015.", "Skills: " + ", ".join(rng.sample(SKILLS, 5)) + "."]
+    return lines
+
+
+def build_resumes(directory: str, count: int):
+    from docx import Document
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    rng = random.Random(11)
+    paths = []
+    for i in range(count):
+        lines = resume_lines(rng, i)
+        if i % 2:
+            path = os.path.join(directory, f"resume_{i}.pdf")
+            pdf = canvas.Canvas(path, pagesize=A4)
+            text = pdf.beginText(40, 800)
+            for line in lines:
+                # reportlab doesn't wrap; keep lines on the page
+                while line:
+                    text.textLine(line[:95])
+                    line = line[95:]
+            pdf.drawText(text)
+            pdf.save()
+        else:
+            path = os.path.join(directory, f"resume_{i}.docx")
+            document = Document()
+            for line in lines:
+                document.add_paragraph(line)
+            document.save(path)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=400)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--n-process", type=int, default=1, help="nlp.pipe processes")
+    parser.add_argument("--model", default=os.getenv("SPACY_MODEL", "en_core_web_sm"),
+                        help='spaCy model, or "fallback" for the built-in rule-based pipeline')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["SPACY_MODEL"] = resolve_model(args.model, workdir)
+
+        from app.routers.resume_bulk_utils import _extract_processes, extract_texts, shutdown_resume_extractors
+        from app.routers.resume_utils import get_nlp, parse_resume_spacy, parse_resume_texts
+
+        paths = build_resumes(workdir, args.resumes)
+        get_nlp()
+        extract_texts(paths[:8])  # start the extraction processes
+        print(f"{args.resumes} resumes, model {os.path.basename(os.environ['SPACY_MODEL'])}, "
+              f"{_extract_processes()} extraction processes, nlp.pipe batch {args.batch_size} "
+              f"x {args.n_process} process(es)")
+
+        start = time.perf_counter()
+        single = [parse_resume_spacy(path) for path in paths]
+        single_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        texts = [text for text, _ in extract_texts(paths)]
+        extract_seconds = time.perf_counter() - start
+        bulk = parse_resume_texts(texts, batch_size=args.batch_size, n_process=args.n_process)
+        bulk_seconds = time.perf_counter() - start
+        shutdown_resume_extractors()
+
+        assert bulk == single, "bulk and single-file parsing disagree"
+        print(f"  single {single_seconds:7.2f} s  {args.resumes / single_seconds:7.1f} resumes/s")
+        print(f"  bulk   {bulk_seconds:7.2f} s  {args.resumes / bulk_seconds:7.1f} resumes/s  "
+              f"(extraction {extract_seconds:.2f} s, nlp.pipe {bulk_seconds - extract_seconds:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Candidate search benchmark: substring (LIKE) vs full-text search on SQLite
+
+Builds a SQLite database with --rows synthetic candidates (cached in the temp
+directory and reused while the row count matches), then times the first page
+(limit 100) of GET /candidates/search/ queries in both modes:
+
+  contains  - the old `%term%` LIKE filters, newest first (full table scan)
+  rank-all  - FTS5 MATCH with every match ranked by bm25
+  fulltext  - what the endpoint does: FTS5 MATCH ranking the newest
+              SEARCH_RANK_WINDOW matches, through the same search_utils code
+
+Usage: python benchmarks/bench_search.py [--rows 1000000] [--repeat 5]
+"""
+
+import argparse
+import functools
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import Response
+from sqlalchemy import String, cast, create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import SEARCH_RANK_WINDOW
+from app.core.database import Base
+from app.core.pagination import CursorPage
+from app.models import *  # noqa: F401,F403 - register every mapper
+from app.models.candidate import Candidate
+from app.routers.search_utils import fulltext_cursor_key, fulltext_search, parse_search_query, parse_skills, to_fts5
+
+FIRST_NAMES = ["Asha", "Ravi", "Priya", "Amit", "Neha", "Vikram", "Sneha", "Rahul", "Pooja", "Arjun"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Rao", "Gupta", "Singh", "Nair", "Patel", "Mehta", "Kumar"]
+DESIGNATIONS = ["Software Engineer", "Data Analyst", "HR Executive", "Sales Manager", "Accountant", "Team Lead"]
+# Skill words get Zipf-like frequencies, so there are very common and very rare terms
+SKILLS = [
+    "python", "excel", "communication", "sql", "java", "sales", "recruitment", "javascript", "react",
+    "django", "fastapi", "tally", "payroll", "kubernetes", "terraform", "machine learning", "pandas",
+    "negotiation", "golang", "rust", "spark", "tableau", "figma", "salesforce", "sap", "angular", "vue",
+    "docker", "aws", "azure", "gcp", "linux", "networking", "cold calling", "lead generation", "gst",
+    "auditing", "onboarding", "sourcing", "power bi", "statistics", "r", "scala", "kotlin", "swift",
+    "android", "ios", "selenium", "jmeter", "photoshop", "illustrator", "copywriting", "seo", "crm",
+    "customer support", "mongodb", "postgresql", "redis", "kafka", "airflow",
+]
+SKILL_WEIGHTS = [1 / (rank + 1) for rank in range(len(SKILLS))]
+
+QUERIES = [
+    ("common word", "python", None),
+    ("rare word", "terraform", None),
+    ("phrase", '"machine learning"', None),
+    ("prefix", "java*", None),
+    ("name", "priya iyer", None),
+    ("word + skills", "engineer", "sql, react"),
+]
+
+
+def build_database(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    batch = []
+    for i in range(rows):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        skills = rng.choices(SKILLS, SKILL_WEIGHTS, k=rng.randint(3, 8))
+        batch.append((
+            f"{first}{i % 997}", last, f"{first.lower()}.{last.lower()}{i}@example.com", f"9{i:09d}",
+            rng.choice(DESIGNATIONS), f"{rng.randint(0, 15)} years: " + ", ".join(skills), "NEW", "JOB_PORTAL", 0,
+        ))
+        if len(batch) == 10000 or i == rows - 1:
+            conn.executemany(
+                "INSERT INTO candidates (first_name, last_name, email, phone, designation, experience_details, "
+                "status, source, is_in_pool) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            batch = []
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return engine
+
+
+def open_database(rows: int):
+    path = os.path.join(tempfile.gettempdir(), "bench_search.sqlite")
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        try:
+            cached = conn.execute("SELECT count(*) FROM candidates").fetchone()[0]
+        except sqlite3.DatabaseError:
+            cached = None
+        conn.close()
+        if cached == rows:
+            return create_engine(f"sqlite:///{path}")
+        os.remove(path)
+    print(f"building {rows} candidates in {path} ...")
+    start = time.perf_counter()
+    engine = build_database(path, rows)
+    print(f"  built in {time.perf_counter() - start:.1f} s")
+    return engine
+
+
+def contains_page(db, query, skills):
+    statement = select(Candidate).where(
+        Candidate.first_name.contains(query) | Candidate.last_name.contains(query)
+        | Candidate.email.contains(query) | cast(Candidate.education_qualification_short, String).contains(query)
+    )
+    for skill in (skills or "").split(","):
+        if skill.strip():
+            statement = statement.where(Candidate.experience_details.contains(skill.strip()))
+    page = CursorPage(cursor=None, limit=100)
+    return page.finish(db.execute(page.apply(statement, Candidate.id)).scalars().all(), Response())
+
+
+def fulltext_page(db, query, skills, rank_window):
+    page = CursorPage(cursor=None, limit=100)
+    statement = fulltext_search(
+        select(Candidate), "sqlite", parse_search_query(query), parse_skills(skills), page, rank_window=rank_window
+    )
+    return page.finish(db.execute(statement).all(), Response(), key=fulltext_cursor_key)
+
+
+def count_matches(engine, query, skills):
+    expression = to_fts5(parse_search_query(query))
+    if skills:
+        expression = f"({expression}) AND experience_details : ({to_fts5(parse_skills(skills))})"
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM candidates_fts WHERE candidates_fts MATCH :q"), {"q": expression}).scalar()
+
+
+def measure(engine, fn, query, skills, repeat):
+    timings = []
+    for _ in range(repeat + 1):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            rows = fn(db, query, skills)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings[1:]), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = open_database(args.rows)
+    print(f"{args.rows} candidates, first page of 100, median of {args.repeat} runs")
+    print(f"  {'query':<14} {'contains':>10} {'rank-all':>10} {'fulltext':>10}  matches")
+    for name, query, skills in QUERIES:
+        contains, _ = measure(engine, contains_page, query, skills, args.repeat)
+        rank_all, _ = measure(engine, functools.partial(fulltext_page, rank_window=0), query, skills, args.repeat)
+        fulltext, _ = measure(
+            engine, functools.partial(fulltext_page, rank_window=SEARCH_RANK_WINDOW), query, skills, args.repeat
+        )
+        print(f"  {name:<14} {contains * 1000:8.1f}ms {rank_all * 1000:8.1f}ms {fulltext * 1000:8.1f}ms  "
+              f"{count_matches(engine, query, skills)}")
+
+
+if __name__ == "__main__":
+    main()
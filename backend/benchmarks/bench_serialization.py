@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the list endpoints: 10k jobs and 10k candidates
+
+Compares, on the same in-memory ORM rows:
+
+  before   - what GET /jobs/ and GET /candidates/ used to do: jobs went through
+             Job.from_orm().dict() and were then validated again against
+             response_model; both were encoded by FastAPI's default JSONResponse
+  orjson   - FastAPI's response_model path with ORJSONResponse (the new app
+             default, used by routes that still return ORM objects or dicts)
+  single   - json_list_response: one validation pass, JSON written by pydantic
+
+Each variant's JSON is checked to decode to the same data.
+
+Usage: python benchmarks/bench_serialization.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import json_list_response
+from app.models import *  # noqa: F401,F403 - register every mapper
+from app.models.candidate import Candidate as CandidateModel, CandidateSource, CandidateStatus
+from app.models.job import Branch, Department, Job as JobModel, JobStatus, LocationType
+from app.models.user import User, UserRole
+from app.schemas.candidate import Candidate
+from app.schemas.job import Job
+
+
+def build_rows(count: int):
+    created = datetime(2024, 1, 1)
+    user = User(id=1, email="recruiter@example.com", username="recruiter", full_name="Recruiter",
+                role=UserRole.RECRUITER, is_active=True, is_superuser=False, created_at=created)
+    departments = [Department(id=i, name=f"Department {i}", created_at=created) for i in range(20)]
+    jobs = [
+        JobModel(
+            id=i, position_title=f"Engineer {i}", position_code=f"ENG{i:05d}",
+            branch=Branch.OKAYA_NOIDA, location_type=LocationType.ONSITE,
+            department_id=i % 20, department=departments[i % 20], required_skills="python, sql, fastapi",
+            experience_level="2-5 years", job_description="Build and run services. " * 10,
+            number_of_vacancies=2, compensation_min=50000, compensation_max=90000,
+            employment_type="Full-time", status=JobStatus.APPROVED, is_remote=False, is_published=True,
+            created_by=1, created_by_user=user, created_at=created + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+    candidates = [
+        CandidateModel(
+            id=i, first_name=f"Candidate{i}", last_name="Bench", email=f"c{i}@example.com",
+            phone=f"9{i:09d}", location_city="Noida", experience_years="4",
+            experience_details="python sql fastapi " * 10, source=CandidateSource.JOB_PORTAL,
+            status=CandidateStatus.NEW, is_in_pool=i % 3 == 0, job_id=i % 50, created_by=1,
+            created_by_user=user, created_at=created + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+    return jobs, candidates
+
+
+async def fastapi_path(schema, content, response_class):
+    field = create_response_field(name="response", type_=List[schema])
+    serialized = await serialize_response(field=field, response_content=content, is_coroutine=True)
+    return response_class(serialized).body
+
+
+def jobs_before(jobs):
+    job_outputs = []
+    for job in jobs:
+        job_dict = Job.from_orm(job).dict()
+        job_dict["pool_candidate_count"] = 1
+        job_outputs.append(job_dict)
+    return asyncio.run(fastapi_path(Job, job_outputs, JSONResponse))
+
+
+def jobs_orjson(jobs):
+    for job in jobs:
+        job.pool_candidate_count = 1
+    return asyncio.run(fastapi_path(Job, jobs, ORJSONResponse))
+
+
+def jobs_single(jobs):
+    for job in jobs:
+        job.pool_candidate_count = 1
+    return json_list_response(Job, jobs).body
+
+
+def candidates_before(candidates):
+    return asyncio.run(fastapi_path(Candidate, candidates, JSONResponse))
+
+
+def candidates_orjson(candidates):
+    return asyncio.run(fastapi_path(Candidate, candidates, ORJSONResponse))
+
+
+def candidates_single(candidates):
+    return json_list_response(Candidate, candidates).body
+
+
+def measure(fn, rows, repeat):
+    fn(rows)  # warm up pydantic's validators/serializers
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(rows)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    jobs, candidates = build_rows(args.rows)
+    suites = [
+        ("jobs", jobs, [("before", jobs_before), ("orjson", jobs_orjson), ("single", jobs_single)]),
+        ("candidates", candidates, [("before", candidates_before), ("orjson", candidates_orjson), ("single", candidates_single)]),
+    ]
+
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    for name, rows, variants in suites:
+        results = {variant: measure(fn, rows, args.repeat) for variant, fn in variants}
+        expected = json.loads(results["before"][1])
+        for variant, (_, body) in results.items():
+            assert json.loads(body) == expected, f"{name}/{variant} output differs"
+        baseline = results["before"][0]
+        for variant, (seconds, body) in results.items():
+            print(f"  {name:<11} {variant:<7} {seconds * 1000:8.1f} ms  {len(body) / 1e6:5.1f} MB  x{baseline / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark: import time, time to first response and RSS of a worker
+
+Every measurement runs in a fresh interpreter (that is what a uvicorn worker,
+a pytest run or a CLI script pays). For each scenario it reports the median
+wall time of the whole process, the time spent inside the measured step, peak
+RSS, and which heavy optional dependencies ended up loaded:
+
+  models      - `import app.models` (what init_database.py and similar scripts need)
+  main        - `import main` (module import of the API app)
+  first-req   - `import main` + startup events + one GET /health
+  warm-up     - first-req with WARMUP_MODULES=pandas,reportlab,spacy, after the
+                warm-up thread finished (the cost moved off the request path)
+
+Also prints the slowest modules from `python -X importtime -c "import main"`.
+
+Usage: python benchmarks/bench_startup.py [--repeat 5] [--top 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("spacy", "pandas", "reportlab", "pdfplumber", "docx", "openai")
+
+PROBE = """
+import json, os, resource, sys, time
+start = time.perf_counter()
+{step}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "step_s": elapsed,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+FIRST_REQUEST = """
+from fastapi.testclient import TestClient
+import main
+with TestClient(main.app) as client:
+    assert client.get("/health").status_code == 200
+"""
+
+SCENARIOS = {
+    "models": ("import app.models", {}),
+    "main": ("import main", {}),
+    "first-req": (FIRST_REQUEST, {}),
+    "warm-up": (
+        FIRST_REQUEST + """
+import threading
+for thread in threading.enumerate():
+    if thread.name == "warm-up":
+        thread.join()
+""",
+        {"WARMUP_MODULES": "pandas,reportlab,spacy"},
+    ),
+}
+
+
+def run_probe(step: str, env_overrides: dict) -> dict:
+    env = dict(os.environ, **env_overrides)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_startup.sqlite')}")
+    code = PROBE.format(step=step, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    probe["wall_s"] = wall
+    return probe
+
+
+def import_time_report(top: int):
+    """Direct imports of main, slowest first, as (cumulative microseconds, module)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR,
+        capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        module = fields[2].rstrip()
+        # One space after the bar, then two more per nesting level
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(fields[1]), module.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"median of {args.repeat} fresh interpreters")
+    print(f"  {'scenario':<10} {'process':>9} {'step':>9} {'rss':>8}  heavy modules loaded")
+    for name, (step, env) in SCENARIOS.items():
+        probes = [run_probe(step, env) for _ in range(args.repeat)]
+        wall = statistics.median(p["wall_s"] for p in probes)
+        step_s = statistics.median(p["step_s"] for p in probes)
+        rss = statistics.median(p["rss_mb"] for p in probes)
+        heavy = ", ".join(probes[-1]["heavy"]) or "-"
+        print(f"  {name:<10} {wall * 1000:7.0f}ms {step_s * 1000:7.0f}ms {rss:6.0f}MB  {heavy}")
+
+    print("\nslowest direct imports of main (cumulative):")
+    for cumulative_us, module in import_time_report(args.top):
+        print(f"  {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Shared test fixtures: every table registered on Base.metadata, and a fresh
+SQLite database per test
+
+Test modules seed data by overriding `db` or `session_factory` with a fixture
+of the same name that asks for the one here.
+"""
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+# Register every table on Base.metadata, as alembic/env.py does
+from app.models import (  # noqa: F401
+    application, candidate, candidate_profile, employee, interview, interview_module,
+    job, offer_batch, recruitment_workflow, resume_file, resume_parse_job, user,
+)
+
+
+@pytest.fixture
+def engine(tmp_path_factory):
+    # A file rather than :memory:, so dispatcher threads and the TestClient
+    # threadpool each get their own connection to the same database; kept out
+    # of tmp_path, which tests use for uploads
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    """The SQL run on `engine` from when this fixture is set up"""
+    executed = []
+    event.listen(engine, "before_cursor_execute", lambda *args: executed.append(args[2]))
+    return executed
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as db:
+        yield db
@@ -1,16 +1,32 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import auth, employees, candidates, jobs, applications, dashboard, recruitment_agencies, candidate_profile, recruitment_workflow, interviews, user, interview_module
-from app.core.config import ALLOWED_ORIGINS, HOST, PORT, DEBUG
+from app.core.config import ALLOWED_ORIGINS, HOST, PORT, DEBUG, METRICS_TOKEN, WARMUP_MODULES
+from app.core.database import engine, async_engine, read_async_engine, replica_router
+from app.core.pool_metrics import engine_pool_status
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.request_metrics import request_metrics, start_request, finish_request, UNMATCHED_ROUTE
+from app.core.security import get_current_user
+from app.core.passwords import shutdown_password_executors
+from app.core.warmup import start_warm_up
+from app.core.resume_workers import start_resume_dispatcher, stop_resume_dispatcher
+from app.core.whatsapp_dispatcher import start_whatsapp_dispatcher, stop_whatsapp_dispatcher, whatsapp_metrics
+from app.routers.resume_bulk_utils import shutdown_resume_extractors
+from app.routers.offer_batch_utils import shutdown_offer_renderers, start_offer_batch_runner
+from app.models.user import UserRole
 from fastapi.staticfiles import StaticFiles
 import os
+import secrets
+import time
 from pathlib import Path
 
 
 app = FastAPI(
     title="HRMS Recruitment API",
     description="A comprehensive HRMS system for managing employees, candidates, jobs, and applications",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 os.makedirs("uploads/resumes", exist_ok=True)
@@ -29,8 +45,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Latency, SQL statement count and DB time per route template, for /metrics"""
+    stats, token = start_request()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        finish_request(token)
+        route = request.scope.get("route")
+        request_metrics.record(
+            request.method,
+            getattr(route, "path", UNMATCHED_ROUTE),
+            status_code,
+            time.perf_counter() - start,
+            stats,
+        )
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(employees.router, prefix="/employees", tags=["Employees"])
@@ -48,6 +86,35 @@ app.include_router(interviews.router, prefix="/interviews", tags=["Interviews"])
 app.include_router(user.router)
 app.include_router(interview_module.router, tags=["Interview Module"])
 
+@app.on_event("startup")
+def warm_up_heavy_modules():
+    # spaCy/pandas/reportlab load lazily; WARMUP_MODULES preloads them in the background
+    start_warm_up(WARMUP_MODULES)
+
+@app.on_event("startup")
+def start_resume_parsing():
+    # Feeds queued resume uploads to parser processes (RESUME_PARSE_WORKERS, 0 = external)
+    start_resume_dispatcher()
+
+@app.on_event("startup")
+def start_whatsapp_sending():
+    # Sends queued WhatsApp messages in rate-limited batches (WHATSAPP_DISPATCHER; off by default,
+    # the dispatcher runs as its own service)
+    start_whatsapp_dispatcher()
+
+@app.on_event("startup")
+def start_offer_batches():
+    # Claims queued bulk offer batches; batches left running by a dead worker are requeued
+    start_offer_batch_runner(OFFER_DIR)
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    shutdown_password_executors()
+    stop_resume_dispatcher()
+    stop_whatsapp_dispatcher()
+    shutdown_resume_extractors()
+    shutdown_offer_renderers()
+
 @app.get("/")
 async def root():
     return {"message": "HRMS Recruitment API", "version": "1.0.0"}
@@ -56,6 +123,38 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db")
+async def db_pool_health(current_user = Depends(get_current_user)):
+    """Connection pool usage and checkout latency for each engine (admin only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Access denied")
+    pools = {
+        "primary": engine_pool_status(engine, "primary"),
+        "primary_async": engine_pool_status(async_engine.sync_engine, "primary_async"),
+    }
+    if replica_router is not None:
+        await replica_router.refresh()
+        pools["replica_async"] = {
+            **engine_pool_status(read_async_engine.sync_engine, "replica_async"),
+            **replica_router.status(),
+        }
+    return pools
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus scrape endpoint; requires `Authorization: Bearer <METRICS_TOKEN>` when set"""
+    if METRICS_TOKEN:
+        supplied = request.headers.get("Authorization", "")
+        if not secrets.compare_digest(supplied, f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=403, detail="Access denied")
+    pools = {"primary": engine, "primary_async": async_engine.sync_engine}
+    if read_async_engine is not None:
+        pools["replica_async"] = read_async_engine.sync_engine
+    return PlainTextResponse(
+        request_metrics.render(pools) + whatsapp_metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,49 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.models.candidate import Candidate, CandidateStatus
+from app.routers.candidate_bulk_utils import bulk_result, bulk_update_candidates
+from app.schemas.candidate import CandidateBulkPoolUpdate, CandidateBulkStatusUpdate
+
+
+@pytest.fixture
+def db(db, statements):
+    db.add_all(Candidate(first_name=f"C{i}", phone=f"900000000{i}", created_by=1 + i % 2) for i in range(6))
+    db.commit()
+    statements.clear()
+    db.info["statements"] = statements
+    return db
+
+
+def test_one_update_for_the_whole_selection(db):
+    change = CandidateBulkPoolUpdate(ids=[1, 2, 3, 3, 99], in_pool=True)
+    updated = bulk_update_candidates(db, change, {"is_in_pool": True})
+
+    assert bulk_result("Added", change, updated) == {"message": "Added: 3", "updated": 3, "requested": 4, "skipped": 1}
+    assert [sql.split()[0] for sql in db.info["statements"]] == ["UPDATE"]
+    assert db.scalars(select(Candidate.id).where(Candidate.is_in_pool == True)).all() == [1, 2, 3]
+
+
+def test_filter_and_owner_scope(db):
+    change = CandidateBulkStatusUpdate(filter={"status": "New"}, status=CandidateStatus.REJECTED,
+                                       reason_of_rejection="Position filled")
+    values = change.model_dump(include={"status", "reason_of_rejection", "reason_for_kiv_other_roles"},
+                               exclude_unset=True)
+    assert bulk_update_candidates(db, change, values, owner_id=2) == 3
+
+    rows = db.execute(select(Candidate.created_by, Candidate.status, Candidate.reason_of_rejection)).all()
+    assert {tuple(row) for row in rows} == {
+        (1, CandidateStatus.NEW, None), (2, CandidateStatus.REJECTED, "Position filled"),
+    }
+
+
+@pytest.mark.parametrize("body", [
+    {"in_pool": True},
+    {"ids": [1], "filter": {"job_id": 1}, "in_pool": True},
+    {"filter": {}, "in_pool": True},
+    {"ids": [], "in_pool": True},
+])
+def test_selection_must_be_ids_or_a_non_empty_filter(body):
+    with pytest.raises(ValidationError):
+        CandidateBulkPoolUpdate(**body)
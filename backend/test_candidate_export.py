@@ -0,0 +1,54 @@
+import csv
+import io
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import select
+
+from app.models.candidate import Candidate, CandidateStatus
+from app.routers.candidate_export_utils import EXPORT_COLUMNS, EXPORT_SELECT_COLUMNS, csv_chunks, export_rows, xlsx_chunks
+
+
+@pytest.fixture
+def session_factory(session_factory, statements):
+    with session_factory() as db:
+        db.add_all(Candidate(first_name=f"C{i}", phone=f"+91 90000 0000{i}", created_by=1) for i in range(5))
+        db.add(Candidate(first_name="=HYPERLINK(\"http://x\")", last_name="Rao", phone="9100000000",
+                         status=CandidateStatus.SHORTLISTED, created_by=1))
+        db.commit()
+    statements.clear()
+    return session_factory
+
+
+def statement():
+    return select(*EXPORT_SELECT_COLUMNS).order_by(Candidate.id)
+
+
+def test_rows_come_in_batches_from_one_query(session_factory, statements):
+    batches = list(export_rows(session_factory, statement(), batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 2]
+    assert [sql.split()[0] for sql in statements] == ["SELECT"]
+    assert len(batches[0][0]) == len(EXPORT_COLUMNS)
+
+
+def test_csv_streams_a_chunk_per_batch(session_factory):
+    chunks = list(csv_chunks(export_rows(session_factory, statement(), batch_size=4)))
+    assert len(chunks) == 2
+    text = b"".join(chunks).decode("utf-8")
+    assert text.startswith("\ufeff")
+    rows = list(csv.DictReader(io.StringIO(text.lstrip("\ufeff"))))
+    assert [row["first_name"] for row in rows[:2]] == ["C0", "C1"]
+    # Phone numbers are kept; formulas are neutralised
+    assert rows[0]["phone"] == "+91 90000 00000"
+    assert rows[5]["first_name"] == "'=HYPERLINK(\"http://x\")"
+    assert rows[5]["status"] == "Shortlisted"
+
+
+def test_xlsx_matches_the_csv_columns(session_factory, tmp_path):
+    path = tmp_path / "candidates.xlsx"
+    path.write_bytes(b"".join(xlsx_chunks(export_rows(session_factory, statement(), batch_size=4))))
+    rows = list(load_workbook(path, read_only=True)["Candidates"].values)
+    assert rows[0] == EXPORT_COLUMNS
+    assert len(rows) == 7
+    assert rows[1][EXPORT_COLUMNS.index("first_name")] == "C0"
+    assert rows[6][EXPORT_COLUMNS.index("status")] == "Shortlisted"
@@ -0,0 +1,109 @@
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+from sqlalchemy import select, text
+
+from app.models.candidate import Candidate, CandidateStatus
+from app.routers.candidate_import_utils import ImportReport, import_candidates
+
+HEADER = ["First_Name ", "last_name", "email", "phone", "location_pincode", "education_qualification_short", "notes"]
+
+
+def sheet(*rows, header=HEADER):
+    workbook = Workbook()
+    workbook.active.append(header)
+    for row in rows:
+        workbook.active.append(row)
+    buffer = BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def test_imports_valid_rows_and_reports_bad_ones(db):
+    upload = sheet(
+        ["Asha", "Rao", "asha@example.com", 9876543210.0, 110001, "graduate", "ignored"],
+        [None, "NoName", None, "9000000000", None, None, None],
+        ["Ravi", None, "not-an-email", "9000000001", None, None, None],
+        [None, None, None, None, None, None, None],
+        ["Neha", None, None, "9000000002", None, "PhD", None],
+        ["Amit", "Kumar", None, " 9000000003 ", None, "Post Graduate", None],
+    )
+    report = import_candidates(db, upload, created_by=7, chunk_size=2)
+
+    assert (report.imported, report.failed) == (2, 3)
+    assert report.errors == [
+        {"row": 3, "error": "first_name is required"},
+        {"row": 4, "error": "invalid email 'not-an-email'"},
+        {"row": 6, "error": "unknown education_qualification_short 'PhD'"},
+    ]
+    asha, amit = db.scalars(select(Candidate).order_by(Candidate.id)).all()
+    assert (asha.phone, asha.location_pincode, asha.education_qualification_short.value) == (
+        "9876543210", "110001", "Graduate",
+    )
+    assert (asha.created_by, asha.status, asha.is_in_pool) == (7, CandidateStatus.NEW, False)
+    assert amit.phone == "9000000003"
+
+
+def test_missing_required_column_is_rejected(db):
+    with pytest.raises(ValueError, match="phone"):
+        import_candidates(db, sheet(["Asha"], header=["first_name"]), created_by=1)
+
+
+def test_error_list_is_capped_but_count_is_exact(db):
+    upload = sheet(*([None, "x", None, "9", None, None, None] for _ in range(5)))
+    report = import_candidates(db, upload, created_by=1, report=ImportReport(max_errors=2))
+    response = report.as_response()
+    assert (response["failed"], len(response["errors"]), response["errors_truncated"]) == (5, 2, True)
+
+
+def test_rows_the_database_rejects_do_not_abort_their_chunk(db):
+    db.execute(text(
+        "CREATE TRIGGER reject_candidate BEFORE INSERT ON candidates WHEN new.last_name = 'Reject' "
+        "BEGIN SELECT RAISE(ABORT, 'rejected by database'); END"
+    ))
+    db.commit()
+    upload = sheet(*([f"C{i}", "Reject" if i == 1 else "Ok", None, str(i), None, None, None] for i in range(3)))
+    report = import_candidates(db, upload, created_by=1)
+    assert (report.imported, report.errors) == (2, [{"row": 3, "error": "rejected by database"}])
+    assert db.scalars(select(Candidate.first_name).order_by(Candidate.id)).all() == ["C0", "C2"]
+
+
+def test_rows_of_existing_candidates_update_them(db):
+    db.add_all([
+        Candidate(first_name="Asha", phone="+91 98765 43210", email="asha@example.com", location_pincode="110001"),
+        Candidate(first_name="Ravi", phone="9000000001", email="ravi@example.com"),
+    ])
+    db.commit()
+    upload = sheet(
+        ["Asha", "Rao", None, "09876543210", None, "Graduate", None],
+        ["Neha", None, "NEHA@example.com", "9000000002", None, None, None],
+        ["Neha", "Singh", "neha@example.com ", "+91 9000000002", "560001", None, None],
+        ["Mixed", None, "ravi@example.com", "9876543210", None, None, None],
+    )
+    report = import_candidates(db, upload, created_by=7, chunk_size=2)
+
+    assert (report.imported, report.updated, report.failed) == (1, 2, 1)
+    assert report.errors == [{"row": 5, "error": "phone and email belong to different candidates"}]
+    asha, ravi, neha = db.scalars(select(Candidate).order_by(Candidate.id)).all()
+    # Blank cells keep what is stored
+    assert (asha.last_name, asha.email, asha.location_pincode, asha.phone_e164) == (
+        "Rao", "asha@example.com", "110001", "+919876543210",
+    )
+    # Matched across chunks by the normalized email
+    assert (neha.last_name, neha.location_pincode, neha.phone_e164) == ("Singh", "560001", "+919000000002")
+    assert ravi.first_name == "Ravi"
+
+
+def test_duplicate_rows_in_one_chunk_make_one_candidate(db):
+    upload = sheet(
+        ["Neha", None, "neha@example.com", "9000000002", None, None, None],
+        ["Neha", "Singh", None, "+91 90000 00002", "560001", None, None],
+    )
+    report = import_candidates(db, upload, created_by=1)
+    assert (report.imported, report.updated, report.failed) == (1, 1, 0)
+    neha = db.scalars(select(Candidate)).one()
+    assert (neha.last_name, neha.email, neha.location_pincode, neha.phone) == (
+        "Singh", "neha@example.com", "560001", "+91 90000 00002",
+    )
@@ -0,0 +1,175 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+
+from app.core.conditional import (
+    collection_etag, make_etag, matches, not_modified, page_version_query, set_validators, version_column,
+)
+from app.core.database import get_async_db, get_db, get_read_db
+from app.core.pagination import CursorPage
+from app.core.security import get_current_user
+from app.models.application import Application
+from app.models.candidate import Candidate
+from app.models.job import Branch, Job, JobType
+from app.models.user import User, UserRole
+from app.routers import candidates, interviews
+
+MODIFIED = datetime(2026, 5, 6, 7, 8, 9, 500000)
+
+
+def request(**headers):
+    scope = {"type": "http", "method": "GET", "path": "/candidates/", "query_string": b"limit=2",
+             "headers": Headers(headers).raw}
+    return Request(scope)
+
+
+def test_validators():
+    etag = make_etag("candidate", 1, MODIFIED)
+    assert matches(request(**{"if-none-match": f'"x", {etag[2:]}'}), etag)
+    assert matches(request(**{"if-none-match": "*"}), etag)
+    assert not matches(request(**{"if-none-match": '"x"'}), etag, MODIFIED)
+    # If-None-Match wins; If-Modified-Since has whole seconds
+    assert not matches(request(**{"if-none-match": '"x"', "if-modified-since": "Wed, 06 May 2026 07:08:09 GMT"}),
+                       etag, MODIFIED)
+    assert matches(request(**{"if-modified-since": "Wed, 06 May 2026 07:08:09 GMT"}), etag, MODIFIED)
+    assert not matches(request(**{"if-modified-since": "Wed, 06 May 2026 07:08:08 GMT"}), etag, MODIFIED)
+    assert not matches(request(**{"if-modified-since": "yesterday"}), etag, MODIFIED)
+    assert not matches(request(), etag, MODIFIED)
+
+    response = not_modified(etag, MODIFIED)
+    assert response.status_code == 304 and response.body == b""
+    assert response.headers["last-modified"] == "Wed, 06 May 2026 07:08:09 GMT"
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+@pytest.fixture
+def client(engine):
+    with Session(engine) as db:
+        db.add_all(Candidate(first_name=f"C{i}", phone=f"900000000{i}") for i in range(4))
+        db.commit()
+    app = FastAPI()
+    app.state.engine = engine
+    app.state.loads = 0
+
+    @app.get("/candidates/")
+    def candidates(request: Request, response: Response):
+        page = CursorPage(cursor=None, limit=2)
+        with Session(engine) as db:
+            query = page.apply(select(Candidate), Candidate.id)
+            etag = collection_etag(request, *db.execute(page_version_query(query, Candidate)).one())
+            if matches(request, etag):
+                return not_modified(etag)
+            set_validators(response, etag)
+            app.state.loads += 1
+            return [c.first_name for c in page.finish(db.scalars(query).all(), response)]
+
+    return TestClient(app)
+
+
+def test_collection_etag_follows_the_rows_on_the_page(client):
+    engine = client.app.state.engine
+    first = client.get("/candidates/")
+    assert first.json() == ["C3", "C2"]
+    etag = first.headers["etag"]
+    assert client.get("/candidates/", headers={"If-None-Match": etag}).status_code == 304
+    assert client.app.state.loads == 1
+
+    with Session(engine) as db:
+        # Rows below the page (and its look-ahead row) don't matter
+        db.get(Candidate, 1).notes = "x"
+        db.commit()
+        assert client.get("/candidates/", headers={"If-None-Match": etag}).status_code == 304
+        db.delete(db.get(Candidate, 2))
+        db.commit()
+        assert client.get("/candidates/", headers={"If-None-Match": etag}).status_code == 200
+
+        # An edit moves the row's version
+        etag = client.get("/candidates/").headers["etag"]
+        db.get(Candidate, 3).updated_at = datetime(2030, 1, 1)
+        db.commit()
+        assert client.get("/candidates/", headers={"If-None-Match": etag}).status_code == 200
+        assert db.scalar(select(version_column(Candidate)).where(Candidate.id == 3)) == datetime(2030, 1, 1)
+
+
+def test_application_detail_reads_versions_only_when_conditional(engine, statements):
+    with Session(engine) as db:
+        db.add(Candidate(first_name="Asha", phone="9000000001"))
+        db.add(Job(position_title="Dev", position_code="D1", employment_type=JobType.FULL_TIME,
+                   branch=Branch.TRAPEZOID_NOIDA))
+        db.add(Application(candidate_id=1, job_id=1))
+        db.commit()
+
+    def session():
+        with Session(engine) as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(interviews.router, prefix="/interviews")
+    app.dependency_overrides[get_db] = session
+    client = TestClient(app)
+
+    statements.clear()
+    response = client.get("/interviews/1")
+    assert response.status_code == 200
+    # Validators come from the rows the response is built from: no version query
+    assert not any("coalesce" in sql.lower() for sql in statements)
+
+    statements.clear()
+    etag = response.headers["etag"]
+    assert client.get("/interviews/1", headers={"If-None-Match": etag}).status_code == 304
+    assert len(statements) == 1 and "coalesce" in statements[0].lower()
+
+    with Session(engine) as db:
+        db.get(Job, 1).updated_at = datetime(2030, 1, 1)
+        db.commit()
+    changed = client.get("/interviews/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+
+
+@pytest.mark.parametrize("path", ["/candidates/", "/candidates/pool/"])
+def test_candidate_lists_read_versions_only_when_conditional(engine, path):
+    with Session(engine) as db:
+        db.add(User(email="hr@x.com", username="hr", hashed_password="x", role=UserRole.HR_SPOC))
+        db.add_all(Candidate(first_name=f"C{i}", phone=f"900000000{i}", is_in_pool=True) for i in range(4))
+        db.commit()
+        user = db.get(User, 1)
+        db.expunge(user)
+
+    async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def session():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(candidates.router, prefix="/candidates")
+    app.dependency_overrides[get_read_db] = app.dependency_overrides[get_async_db] = session
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as client:
+        params = {"limit": 2, "fields": "first_name"}
+        response = client.get(path, params=params)
+        assert response.status_code == 200 and response.json() == [
+            {"id": 4, "first_name": "C3"}, {"id": 3, "first_name": "C2"},
+        ]
+        # The ETag comes from the rows on the page: one query, no aggregate
+        assert len(statements) == 1 and "coalesce" not in statements[0].lower()
+
+        statements.clear()
+        etag = response.headers["etag"]
+        assert client.get(path, params=params, headers={"If-None-Match": etag}).status_code == 304
+        assert len(statements) == 1 and "coalesce" in statements[0].lower()
+
+        with Session(engine) as db:
+            db.get(Candidate, 3).updated_at = datetime(2030, 1, 1)
+            db.commit()
+        changed = client.get(path, params=params, headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["etag"] != etag
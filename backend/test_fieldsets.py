@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app.core.fieldsets import load_options, parse_fields, sparse_schema
+from app.core.responses import json_list_response
+from app.models.candidate import Candidate as CandidateModel
+from app.models.user import User, UserRole
+from app.schemas.candidate import Candidate
+
+LOADS = {"created_by_user": joinedload(CandidateModel.created_by_user)}
+
+
+@pytest.fixture
+def db(db, statements):
+    db.add(User(email="hr@x.com", username="hr", full_name="HR", hashed_password="x", role=UserRole.HR_SPOC))
+    db.add(CandidateModel(first_name="Asha", phone="9876543210", experience_details="x" * 5000,
+                          cover_letter="y" * 5000, created_by=1))
+    db.commit()
+    statements.clear()
+    db.info["statements"] = statements
+    return db
+
+
+def fetch(db, fields):
+    selected = parse_fields(fields, Candidate)
+    query = select(CandidateModel).options(*load_options(CandidateModel, selected, LOADS))
+    rows = db.scalars(query).unique().all()
+    return json.loads(json_list_response(sparse_schema(Candidate, selected), rows).body)
+
+
+def test_selects_only_the_requested_columns(db):
+    assert fetch(db, "first_name, status") == [{"id": 1, "first_name": "Asha", "status": "New"}]
+    sql = db.info["statements"][0]
+    assert "experience_details" not in sql and "cover_letter" not in sql and "users" not in sql
+
+
+def test_requested_relationships_are_loaded_with_the_rows(db):
+    rows = fetch(db, "first_name,created_by_user")
+    assert rows[0]["created_by_user"]["email"] == "hr@x.com"
+    assert len(db.info["statements"]) == 1
+
+
+def test_all_fields_by_default(db):
+    row = fetch(db, None)[0]
+    assert set(row) == set(Candidate.model_fields)
+    assert len(row["cover_letter"]) == 5000
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as e:
+        parse_fields("first_name,password", Candidate)
+    assert e.value.status_code == 400 and "password" in e.value.detail
+    assert sparse_schema(Candidate, ("id", "status")) is sparse_schema(Candidate, ("id", "status"))
@@ -0,0 +1,90 @@
+import pytest
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+
+from app.core.pagination import NEXT_CURSOR_HEADER, CursorPage
+from app.models.candidate import Candidate
+from app.routers.search_utils import (
+    fulltext_cursor_key, fulltext_search, parse_search_query, parse_skills, to_fts5, to_mysql_boolean,
+)
+
+CANDIDATES = [
+    ("Asha", "Rao", "Senior Python developer, machine learning"),
+    ("Machine", "Learner", "Java developer"),
+    ("Pythonista", "Iyer", "Learning machine python"),
+    ("Ravi", "Kumar", "Python, Django, SQL"),
+]
+
+
+@pytest.fixture
+def db(db):
+    for i, (first, last, experience) in enumerate(CANDIDATES):
+        db.add(Candidate(first_name=first, last_name=last, phone=str(i), experience_details=experience))
+    db.commit()
+    return db
+
+
+def search(db, query, skills=None, limit=10, cursor=None, filters=(), rank_window=100):
+    page, response = CursorPage(cursor=cursor, limit=limit), Response()
+    statement = fulltext_search(
+        select(Candidate), "sqlite", parse_search_query(query), parse_skills(skills), page, filters, rank_window
+    )
+    rows = page.finish(db.execute(statement).all(), response, key=fulltext_cursor_key)
+    return [row.Candidate.first_name for row in rows], response.headers.get(NEXT_CURSOR_HEADER)
+
+
+def test_parses_words_phrases_and_prefixes():
+    terms = parse_search_query('"machine learning" pyth* node.js "unclosed')
+    assert [(term.words, term.prefix) for term in terms] == [
+        (["machine", "learning"], False), (["pyth"], True), (["node", "js"], False), (["unclosed"], False),
+    ]
+    assert to_fts5(terms) == '"machine learning" AND "pyth"* AND "node js" AND "unclosed"'
+    assert to_mysql_boolean(terms) == '+"machine learning" +pyth* +"node js" +unclosed'
+    # Operators in the input stay inside quotes
+    assert to_fts5(parse_search_query('a OR b NEAR(c) -d')) == '"a" AND "OR" AND "b" AND "NEAR c" AND "d"'
+
+
+def test_ranks_name_matches_first(db):
+    names, _ = search(db, "machine")
+    assert names[0] == "Machine" and sorted(names[1:]) == ["Asha", "Pythonista"]
+
+
+def test_phrase_prefix_and_skills(db):
+    assert search(db, '"machine learning"')[0] == ["Asha"]
+    assert sorted(search(db, "pyth*")[0]) == ["Asha", "Pythonista", "Ravi"]
+    assert search(db, "python", skills="django")[0] == ["Ravi"]
+
+
+def test_filters_and_rank_window(db):
+    assert search(db, "python", filters=[Candidate.last_name == "Iyer"])[0] == ["Pythonista"]
+    # Only the newest matches are ranked when there are more than rank_window
+    assert sorted(search(db, "python", rank_window=2)[0]) == ["Pythonista", "Ravi"]
+    assert sorted(search(db, "python", rank_window=0)[0]) == ["Asha", "Pythonista", "Ravi"]
+
+
+def test_pages_follow_relevance_order(db):
+    expected, _ = search(db, "developer")
+    names, cursor = search(db, "developer", limit=1)
+    while cursor:
+        more, cursor = search(db, "developer", limit=1, cursor=cursor)
+        names += more
+    assert names == expected and len(names) == 2
+
+
+def test_triggers_keep_the_index_current(db):
+    asha = db.scalars(select(Candidate).where(Candidate.first_name == "Asha")).one()
+    asha.experience_details = "Rust"
+    db.delete(db.scalars(select(Candidate).where(Candidate.first_name == "Ravi")).one())
+    db.commit()
+    assert search(db, "python")[0] == ["Pythonista"]
+    assert search(db, "rust")[0] == ["Asha"]
+
+
+def test_mysql_uses_match_against_in_boolean_mode():
+    page = CursorPage(cursor=None, limit=10)
+    statement = fulltext_search(select(Candidate), "mysql", parse_search_query("pyth*"), parse_skills("sql"), page)
+    sql = str(statement.compile(dialect=mysql.dialect()))
+    assert sql.count("AGAINST (%s IN BOOLEAN MODE)") == 3
+    assert "ORDER BY relevance DESC" in sql
+    assert fulltext_search(select(Candidate), "postgresql", parse_search_query("x"), [], page) is None
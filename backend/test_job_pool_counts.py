@@ -0,0 +1,80 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import get_read_db
+from app.core.security import get_current_user
+from app.models.candidate import Candidate
+from app.models.job import Branch, Job, JobType
+from app.models.user import User, UserRole
+from app.routers import jobs
+
+
+@pytest.fixture
+def client(engine):
+    with Session(engine) as db:
+        db.add(User(email="hr@x.com", username="hr", hashed_password="x", role=UserRole.HR_SPOC))
+        db.add_all(Job(position_title=f"Job {i}", position_code=f"J{i}", employment_type=JobType.FULL_TIME,
+                       branch=Branch.TRAPEZOID_NOIDA, created_by=1) for i in range(1, 5))
+        # Job 4: three in the pool, one not; job 2: one; jobs 1 and 3: none
+        db.add_all(Candidate(first_name=f"C{i}", phone=f"900000000{i}", job_id=job_id, is_in_pool=in_pool)
+                   for i, (job_id, in_pool) in enumerate([(4, True), (4, True), (4, True), (4, False),
+                                                          (2, True), (None, True)]))
+        db.commit()
+        user_row = db.get(User, 1)
+        db.expunge(user_row)
+
+    # The same database file, through the async driver the route uses
+    async_engine = create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    sessions = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def read_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(jobs.router, prefix="/jobs")
+    app.dependency_overrides[get_read_db] = read_db
+    app.dependency_overrides[get_current_user] = lambda: user_row
+    with TestClient(app) as client:
+        client.statements = statements
+        client.engine = engine
+        yield client
+
+
+def test_pool_counts_come_from_one_aggregate(client):
+    response = client.get("/jobs/", params={"limit": 3})
+    assert response.status_code == 200
+    assert [(job["id"], job["pool_candidate_count"]) for job in response.json()] == [(4, 3), (3, 0), (2, 1)]
+    candidate_queries = [sql for sql in client.statements if "candidates" in sql]
+    assert len(candidate_queries) == 1 and "GROUP BY candidates.job_id" in candidate_queries[0]
+    assert "candidates.first_name" not in candidate_queries[0]
+
+
+def test_etag_follows_the_pool_counts(client):
+    etag = client.get("/jobs/").headers["etag"]
+    assert client.get("/jobs/", headers={"If-None-Match": etag}).status_code == 304
+
+    with Session(client.engine) as db:
+        # Leaving the pool changes job 4's count, not the job row
+        db.get(Candidate, 1).is_in_pool = False
+        db.commit()
+    response = client.get("/jobs/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["pool_candidate_count"] == 2
+
+
+def test_versions_are_read_only_for_conditional_requests(client):
+    client.statements.clear()
+    etag = client.get("/jobs/", params={"fields": "position_title"}).headers["etag"]
+    assert not any("coalesce" in sql.lower() for sql in client.statements)
+
+    client.statements.clear()
+    assert client.get("/jobs/", params={"fields": "position_title"},
+                      headers={"If-None-Match": etag}).status_code == 304
+    assert sum("coalesce" in sql.lower() for sql in client.statements) == 1
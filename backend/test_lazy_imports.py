@@ -0,0 +1,25 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.warmup import warm_up
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+
+def test_importing_the_app_does_not_load_heavy_dependencies(tmp_path):
+    code = (
+        "import sys, main; "
+        "print('loaded:' + ','.join(m for m in ('spacy', 'pandas', 'reportlab', 'pdfplumber', 'docx') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env={"PATH": "", "DATABASE_URL": f"sqlite:///{tmp_path / 'lazy.db'}"},
+    )
+    assert result.stdout.strip().splitlines()[-1] == "loaded:"
+
+
+def test_warm_up_loads_known_modules_and_skips_unknown():
+    timings = warm_up(["pandas", "no-such-module"])
+    assert list(timings) == ["pandas"]
+    assert "pandas" in sys.modules
@@ -0,0 +1,148 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select
+
+from app.models.candidate import Candidate, CandidateStatus, OfferLetter
+from app.models.offer_batch import OfferBatch, OfferBatchStatus
+from app.routers import offer_pdf_utils
+from app.routers.offer_batch_utils import (
+    OfferBatchRunner, claim_offer_batch, create_offer_batch, offer_candidate_ids, requeue_stale_batches,
+    run_offer_batch, utcnow,
+)
+from app.routers.offer_pdf_utils import OfferContent, offer_template, render_offer_pdf
+from app.schemas.candidate import CandidateBulkSelection
+
+pytest.importorskip("reportlab")
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add_all(
+            Candidate(first_name=f"C{i}", last_name=None if i == 2 else "Rao", phone=f"90000000{i:02d}",
+                      email=f"c{i}@example.com",
+                      status=CandidateStatus.NEW if i == 6 else CandidateStatus.SHORTLISTED)
+            for i in range(1, 7)
+        )
+        db.commit()
+    return session_factory
+
+
+def queue_batch(session_factory):
+    with session_factory() as db:
+        candidate_ids = offer_candidate_ids(db, CandidateBulkSelection(ids=[1, 2, 3, 4, 5, 6]))
+        return create_offer_batch(db, candidate_ids, created_by=None).id
+
+
+def claim_batch(session_factory, token="host:1:a"):
+    with session_factory() as db:
+        return claim_offer_batch(db, token), token
+
+
+def test_batch_renders_on_processes_and_creates_the_offers(session_factory, tmp_path):
+    queue_batch(session_factory)
+    with session_factory() as db:
+        # Changed after the batch was queued: reported, not issued
+        db.get(Candidate, 5).status = CandidateStatus.REJECTED
+        db.commit()
+
+    batch_id, token = claim_batch(session_factory)
+    with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn")) as executor:
+        run_offer_batch(batch_id, token, tmp_path, session_factory, executor=executor)
+
+    with session_factory() as db:
+        batch = db.get(OfferBatch, batch_id)
+        offers = db.scalars(select(OfferLetter).order_by(OfferLetter.candidate_id)).all()
+    assert (batch.status, batch.total, batch.rendered, batch.failed) == (OfferBatchStatus.DONE, 5, 4, 1)
+    assert [offer.candidate_id for offer in offers] == [1, 2, 3, 4]
+    assert batch.result == {
+        "offers": [{"candidate_id": offer.candidate_id, "offer_id": offer.id} for offer in offers],
+        "errors": [{"candidate_id": 5, "error": "Candidate is no longer shortlisted"}],
+    }
+    for offer in offers:
+        assert (tmp_path / offer.file_path.removeprefix("/offers/")).read_bytes().startswith(b"%PDF")
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_failed_transaction_removes_the_letters(session_factory, tmp_path):
+    queue_batch(session_factory)
+    batch_id, token = claim_batch(session_factory)
+
+    def refuse_offers(session, flush_context, instances):
+        if any(isinstance(row, OfferLetter) for row in session.new):
+            raise RuntimeError("database went away")
+
+    event.listen(session_factory, "before_flush", refuse_offers)
+    run_offer_batch(batch_id, token, tmp_path, session_factory)
+
+    with session_factory() as db:
+        batch = db.get(OfferBatch, batch_id)
+        assert (batch.status, batch.error) == (OfferBatchStatus.FAILED, "RuntimeError: database went away")
+        assert db.scalars(select(OfferLetter)).all() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_each_batch_is_claimed_once_and_stopping_requeues_it(session_factory, tmp_path):
+    first, second = queue_batch(session_factory), queue_batch(session_factory)
+    assert claim_batch(session_factory, "host:1:a")[0] == first
+    assert claim_batch(session_factory, "host:2:b")[0] == second
+    assert claim_batch(session_factory, "host:3:c")[0] is None
+
+    # Another runner's token does nothing; stopping hands the batch back
+    run_offer_batch(first, "host:2:b", tmp_path, session_factory)
+    with ThreadPoolExecutor(2) as executor:
+        run_offer_batch(first, "host:1:a", tmp_path, session_factory, executor, stopping=lambda: True)
+    with session_factory() as db:
+        batch = db.get(OfferBatch, first)
+        assert (batch.status, batch.claimed_by, batch.attempts, batch.rendered) == (OfferBatchStatus.QUEUED, None, 0, 0)
+        assert db.scalars(select(OfferLetter)).all() == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stale_batches_are_requeued_then_failed(session_factory):
+    batch_id = queue_batch(session_factory)
+    for attempt in (1, 2):
+        claim_batch(session_factory)
+        with session_factory() as db:
+            db.get(OfferBatch, batch_id).started_at = utcnow() - timedelta(hours=1)
+            db.commit()
+            assert requeue_stale_batches(db, timeout_seconds=60, max_attempts=2) == (1 if attempt == 1 else 0)
+            batch = db.get(OfferBatch, batch_id)
+            assert batch.status == (OfferBatchStatus.QUEUED if attempt == 1 else OfferBatchStatus.FAILED)
+    assert (batch.error, batch.claimed_by) == ("Rendering timed out", None)
+
+
+def test_runner_issues_queued_batches(session_factory, tmp_path):
+    batch_id = queue_batch(session_factory)
+    with ThreadPoolExecutor(2) as executor:
+        runner = OfferBatchRunner(tmp_path, session_factory, executor, poll_seconds=0.05)
+        runner.start()
+        try:
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline:
+                with session_factory() as db:
+                    batch = db.get(OfferBatch, batch_id)
+                if batch.status == OfferBatchStatus.DONE:
+                    break
+                time.sleep(0.05)
+        finally:
+            runner.stop()
+    assert (batch.status, batch.rendered, batch.claimed_by, batch.attempts) == (OfferBatchStatus.DONE, 5, None, 1)
+
+
+def test_template_is_built_once_and_failed_renders_leave_no_file(tmp_path, monkeypatch):
+    offer_template.cache_clear()
+    for candidate_id in (1, 2):
+        render_offer_pdf(OfferContent(candidate_id, "Asha", "Rao", datetime(2026, 10, 18)), str(tmp_path))
+    assert (offer_template.cache_info().misses, offer_template.cache_info().hits) == (1, 1)
+
+    monkeypatch.setattr(offer_pdf_utils, "offer_template", lambda: offer_template()._replace(letterhead=None))
+    with pytest.raises(Exception):
+        render_offer_pdf(OfferContent(3, "Ravi", None, datetime(2026, 10, 18)), str(tmp_path))
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "offer_1_20261018000000.pdf", "offer_2_20261018000000.pdf",
+    ]
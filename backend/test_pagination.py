@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import Column, DateTime, Integer, create_engine, select
+from sqlalchemy.orm import Session, declarative_base
+
+from app.core.pagination import NEXT_CURSOR_HEADER, CursorPage, decode_cursor, encode_cursor
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as db:
+        # Pairs of rows share a timestamp so the id tie-breaker matters
+        db.add_all(Row(id=i, created_at=start + timedelta(minutes=i // 2)) for i in range(1, 26))
+        db.commit()
+        yield db
+
+
+def collect(db, *columns, limit=10):
+    ids, cursor = [], None
+    while True:
+        page, response = CursorPage(cursor=cursor, limit=limit), Response()
+        rows = page.finish(db.execute(page.apply(select(Row), *columns)).scalars().all(), response)
+        ids += [row.id for row in rows]
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("key", [("id",), ("created_at", "id")])
+def test_pages_cover_every_row_once_newest_first(session, key):
+    ids = collect(session, *(getattr(Row, name) for name in key))
+    assert ids == list(range(25, 0, -1))
+
+
+def test_cursor_round_trips_datetimes():
+    values = [datetime(2024, 5, 6, 7, 8, 9), 42]
+    assert decode_cursor(encode_cursor(values), [Row.created_at, Row.id]) == values
+
+
+def test_rejects_malformed_cursor_and_caps_page_size():
+    with pytest.raises(HTTPException) as e:
+        decode_cursor("not-a-cursor", [Row.id])
+    assert e.value.status_code == 400
+    assert CursorPage(cursor=None, limit=10 ** 6).limit < 10 ** 6
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.passwords import (
+    BULK_PROCESS_THRESHOLD, get_password_hash, hash_passwords_bulk, shutdown_password_executors, verify_password,
+    verify_password_async,
+)
+from app.core.security import get_current_user
+from app.models.user import User, UserRole
+from app.routers import user as user_router
+
+
+def test_verify_password_async():
+    hashed = get_password_hash("s3cret")
+
+    async def check():
+        return await asyncio.gather(verify_password_async("s3cret", hashed), verify_password_async("wrong", hashed))
+
+    assert asyncio.run(check()) == [True, False]
+
+
+@pytest.mark.parametrize("count", [BULK_PROCESS_THRESHOLD - 1, BULK_PROCESS_THRESHOLD])
+def test_bulk_hashes_keep_their_order(count):
+    # Below the threshold on the bcrypt threads, at it on the (spawned) process pool
+    passwords = [f"password-{i}" for i in range(count)]
+    try:
+        hashes = hash_passwords_bulk(passwords)
+    finally:
+        shutdown_password_executors()
+    assert len(hashes) == count and len(set(hashes)) == count
+    assert all(verify_password(password, hashed) for password, hashed in zip(passwords, hashes))
+    assert not verify_password(passwords[0], hashes[1])
+
+
+@pytest.fixture
+def client(engine):
+    with Session(engine) as db:
+        db.add(User(email="admin@x.com", username="admin", hashed_password="x", role=UserRole.ADMIN))
+        db.commit()
+        admin = db.get(User, 1)
+        db.expunge(admin)
+
+    def session():
+        with Session(engine) as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(user_router.router)
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_user] = lambda: admin
+    client = TestClient(app)
+    client.engine = engine
+    return client
+
+
+def new_user(name, **fields):
+    return {"email": f"{name}@x.com", "username": name, "full_name": name.title(), "password": f"{name}-pw",
+            "role": "RECRUITER", **fields}
+
+
+def test_bulk_create_users(client):
+    response = client.post("/users/bulk", json=[new_user("asha"), new_user("ravi")])
+    assert response.status_code == 200
+    assert [u["username"] for u in response.json()] == ["asha", "ravi"]
+    with Session(client.engine) as db:
+        hashes = dict(db.execute(select(User.username, User.hashed_password).where(User.id > 1)).all())
+    assert verify_password("asha-pw", hashes["asha"]) and verify_password("ravi-pw", hashes["ravi"])
+
+
+def test_bulk_create_rejects_duplicates_and_oversized_requests(client, monkeypatch):
+    duplicate = client.post("/users/bulk", json=[new_user("asha"), new_user("asha", email="other@x.com")])
+    assert duplicate.status_code == 400 and "Duplicate" in duplicate.json()["detail"]
+
+    taken = client.post("/users/bulk", json=[new_user("admin", email="new@x.com"), new_user("ravi")])
+    assert taken.status_code == 400 and taken.json()["detail"] == "Already registered: admin"
+
+    monkeypatch.setattr(user_router, "MAX_BULK_USERS", 2)
+    too_many = client.post("/users/bulk", json=[new_user(name) for name in ("a1", "a2", "a3")])
+    assert too_many.status_code == 400
+    assert client.post("/users/bulk", json=[]).status_code == 400
+    with Session(client.engine) as db:
+        assert db.scalars(select(User.username)).all() == ["admin"]
+
+
+def test_create_and_update_user_hash_on_the_bounded_executor(client):
+    created = client.post("/users/", json=new_user("neha"))
+    assert created.status_code == 200
+    user_id = created.json()["id"]
+    assert client.put(f"/users/{user_id}", json={"password": "changed"}).status_code == 200
+    with Session(client.engine) as db:
+        assert verify_password("changed", db.get(User, user_id).hashed_password)
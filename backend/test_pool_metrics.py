@@ -0,0 +1,44 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.core.pool_metrics import InstrumentedQueuePool, instrument_engine, engine_pool_status
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test_pool",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    instrument_engine(engine, "test_pool")
+    yield engine
+    engine.dispose()
+
+
+def test_pool_status_reports_checkouts_and_latency(pooled_engine):
+    for _ in range(5):
+        with pooled_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    status = engine_pool_status(pooled_engine, "test_pool")
+    assert status["size"] == 1
+    assert status["checked_out"] == 0
+    assert status["idle"] == 1
+    assert status["checkouts_total"] >= 5
+    assert status["checkout_latency"]["samples"] >= 5
+    assert status["checkout_latency"]["p99_ms"] >= status["checkout_latency"]["p50_ms"]
+
+
+def test_pool_status_counts_checkout_timeouts(pooled_engine):
+    held = pooled_engine.connect()
+    try:
+        with pytest.raises(exc.TimeoutError):
+            pooled_engine.connect()
+        assert engine_pool_status(pooled_engine, "test_pool")["checked_out"] == 1
+    finally:
+        held.close()
+
+    assert engine_pool_status(pooled_engine, "test_pool")["checkout_timeouts"] >= 1
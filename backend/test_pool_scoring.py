@@ -0,0 +1,123 @@
+import math
+import random
+import threading
+
+import pytest
+
+from app.models.candidate import Candidate
+from app.routers import pool_scoring_utils
+from app.routers.pool_scoring_utils import (
+    EXPERIENCE_WEIGHT, SKILL_WEIGHT, PoolSkillMatrix, clear_pool_matrix, normalize_skills, parse_years,
+    pool_matrix,
+)
+
+pytest.importorskip("scipy")
+
+
+def test_skills_and_years_are_normalized():
+    assert normalize_skills(" Python, SQL ;machine   learning|python\nDjango. ,") == [
+        "python", "sql", "machine learning", "django",
+    ]
+    assert [parse_years(value) for value in ("3", "4.5 years", "5+", "fresher", None)] == [3, 4.5, 5, None, None]
+
+
+def test_ranks_by_weighted_skills_then_experience():
+    matrix = PoolSkillMatrix(
+        [10, 11, 12, 13, 14],
+        [["python", "sql"], ["python", "sql"], ["python"], ["rust"], ["python", "sql", "rust"]],
+        [3, 9, 4, None, 12],
+    )
+    matches = matrix.score(["python", "sql", "go"], experience_min=2, experience_max=5, limit=10)
+    # 13 has none of the skills; 11 and 14 are outside 2-5 years but have both
+    # skills, which outweighs 12's missing sql; 11 ties with 14 and has the lower id
+    assert [match.candidate_id for match in matches] == [10, 11, 14, 12]
+    assert matches[0].matched_skills == ("python", "sql") and matches[0].experience_fit == 1
+    assert (matches[1].experience_fit, matches[2].experience_fit, matches[3].experience_fit) == (0, 0, 1)
+    # "sql" is rarer than "python", so having it counts for more than half
+    assert matches[3].skill_score < matches[0].skill_score / 2
+    assert matrix.score(["python", "sql"], limit=2)[1].candidate_id == 11
+
+
+def test_matches_a_reference_scorer_on_random_pools():
+    rng = random.Random(7)
+    skills = [f"skill{i}" for i in range(40)]
+    rows = [rng.sample(skills, rng.randint(0, 8)) for _ in range(2000)]
+    years = [rng.choice([None, rng.uniform(0, 15)]) for _ in rows]
+    matrix = PoolSkillMatrix(range(1, 2001), rows, years)
+    required = rng.sample(skills, 5)
+
+    frequency = {skill: sum(skill in row for row in rows) for skill in required}
+    weights = {skill: math.log(2001 / (1 + frequency[skill])) + 1 for skill in required}
+    expected = []
+    for candidate_id, (row, experience) in enumerate(zip(rows, years), start=1):
+        skill = sum(weights[s] for s in required if s in row) / sum(weights.values())
+        fit = 0.0 if experience is None else max(0.0, 1 - (max(3 - experience, 0) + max(experience - 6, 0)) / 3)
+        if skill:
+            # Rounded so candidates with the same skills tie whatever order the weights were summed in
+            expected.append((round(-(SKILL_WEIGHT * skill + EXPERIENCE_WEIGHT * fit), 9), candidate_id))
+    expected.sort()
+
+    matches = matrix.score(required, 3, 6, limit=25)
+    assert [match.candidate_id for match in matches] == [candidate_id for _, candidate_id in expected[:25]]
+    assert [match.score for match in matches] == [round(-score, 4) for score, _ in expected[:25]]
+
+
+def test_matrix_is_rebuilt_when_the_pool_changes(db):
+    clear_pool_matrix()
+    db.add_all([
+        Candidate(first_name="A", phone="9000000001", is_in_pool=True, cover_letter="Python, SQL"),
+        Candidate(first_name="B", phone="9000000002", is_in_pool=False, cover_letter="Python"),
+    ])
+    db.commit()
+    first = pool_matrix(db, refresh_seconds=3600)
+    assert list(first.candidate_ids) == [1]
+    # An unchanged pool keeps its matrix
+    assert pool_matrix(db, refresh_seconds=0) is first
+    wait_for_refresh()
+    assert pool_matrix(db, refresh_seconds=3600) is first
+
+    # Within the refresh interval the cached matrix is used without a check
+    db.get(Candidate, 2).is_in_pool = True
+    db.commit()
+    assert pool_matrix(db, refresh_seconds=3600) is first
+    # Past it the old matrix is served while the new one builds in the background
+    assert pool_matrix(db, refresh_seconds=0) is first
+    wait_for_refresh()
+    assert list(pool_matrix(db, refresh_seconds=3600).candidate_ids) == [1, 2]
+    clear_pool_matrix()
+
+
+def test_refresh_does_not_block_requests(db, monkeypatch):
+    clear_pool_matrix()
+    db.add_all([
+        Candidate(first_name="A", phone="9000000001", is_in_pool=True, cover_letter="Python"),
+        Candidate(first_name="B", phone="9000000002", is_in_pool=False, cover_letter="SQL"),
+    ])
+    db.commit()
+    first = pool_matrix(db)
+    db.get(Candidate, 2).is_in_pool = True
+    db.commit()
+
+    building, release = threading.Event(), threading.Event()
+    load = pool_scoring_utils.load_pool_matrix
+
+    def slow_load(*args):
+        building.set()
+        release.wait(10)
+        return load(*args)
+
+    monkeypatch.setattr(pool_scoring_utils, "load_pool_matrix", slow_load)
+    assert pool_matrix(db, refresh_seconds=0) is first
+    assert building.wait(10)
+    # One rebuild at a time; requests meanwhile get the current matrix at once
+    assert pool_matrix(db, refresh_seconds=0) is first
+    release.set()
+    wait_for_refresh()
+    assert pool_matrix(db, refresh_seconds=3600).skills == ["python", "sql"]
+    clear_pool_matrix()
+
+
+def wait_for_refresh():
+    refresh = pool_scoring_utils._refresh
+    if refresh is not None:
+        refresh.join(10)
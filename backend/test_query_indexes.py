@@ -0,0 +1,181 @@
+"""Runs the Alembic index migrations on a SQLite database and checks with
+EXPLAIN QUERY PLAN that the hot list/dashboard queries use an index, and that
+the full-text migration indexes existing candidates."""
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, func, inspect, or_, select, text
+
+from app.core.database import Base
+from app.models.application import Application, ApplicationStatus
+from app.models.candidate import Candidate, CandidateStatus, WhatsAppCommunication, WhatsAppMessageStatus
+from app.models.interview_module import InterviewSession
+from app.models.job import Job
+from app.models.offer_batch import OfferBatch, OfferBatchStatus
+from app.models.resume_parse_job import ResumeParseJob, ResumeParseStatus
+from app.routers.match_pool_utils import pool_candidate_counts
+
+BACKEND_DIR = Path(__file__).resolve().parent
+SINCE = datetime(2024, 1, 1)
+
+HOT_QUERIES = {
+    "candidate pool page": select(Candidate).where(Candidate.is_in_pool == True, Candidate.id < 500)
+        .order_by(Candidate.id.desc()).limit(101),
+    "recruiter's candidates": select(Candidate).where(Candidate.created_by == 3)
+        .order_by(Candidate.id.desc()).limit(101),
+    "candidates by status": select(func.count(Candidate.id)).where(Candidate.status == CandidateStatus.NEW),
+    "pool candidates per job": pool_candidate_counts(
+        select(Job.id).order_by(Job.id.desc()).limit(21).subquery()
+    ),
+    "recent candidates": select(Candidate).order_by(Candidate.created_at.desc()).limit(5),
+    "candidate sources last 30 days": select(Candidate.source, func.count(Candidate.id))
+        .where(Candidate.created_at >= SINCE).group_by(Candidate.source),
+    "application for job and candidate": select(Application)
+        .where(Application.job_id == 1, Application.candidate_id == 2),
+    "candidate's applications": select(Application).where(Application.candidate_id == 2),
+    "applications by status": select(func.count(Application.id))
+        .where(Application.status == ApplicationStatus.APPLIED),
+    "application funnel": select(Application.status, func.count(Application.id))
+        .where(Application.applied_at >= SINCE).group_by(Application.status),
+    "recent applications": select(Application).order_by(Application.applied_at.desc()).limit(5),
+    "upcoming interviews": select(Application).where(
+        Application.interview_scheduled_at >= SINCE,
+        Application.interview_scheduled_at <= SINCE + timedelta(days=7),
+    ),
+    "session for application round": select(InterviewSession)
+        .where(InterviewSession.application_id == 1, InterviewSession.round_id == 2),
+    "completed sessions for application": select(InterviewSession)
+        .where(InterviewSession.application_id == 1, InterviewSession.status == "COMPLETED"),
+    "sessions by round and status": select(InterviewSession)
+        .where(InterviewSession.round_id == 2, InterviewSession.status == "SCHEDULED"),
+    "candidates matching import keys": select(Candidate.id).where(or_(
+        Candidate.phone_e164.in_(["+919000000000", "+919000000001"]),
+        Candidate.email_normalized.in_(["asha@example.com"]),
+    )),
+    "oldest queued resume parse jobs": select(ResumeParseJob.id)
+        .where(ResumeParseJob.status == ResumeParseStatus.QUEUED).order_by(ResumeParseJob.id).limit(4),
+    "oldest queued whatsapp messages": select(WhatsAppCommunication.id)
+        .where(WhatsAppCommunication.status == WhatsAppMessageStatus.QUEUED.value)
+        .order_by(WhatsAppCommunication.id).limit(4),
+    "message for delivery receipt": select(WhatsAppCommunication.id)
+        .where(WhatsAppCommunication.provider_message_id == "wamid.1"),
+    "oldest queued offer batch": select(OfferBatch.id)
+        .where(OfferBatch.status == OfferBatchStatus.QUEUED).order_by(OfferBatch.id).limit(1),
+}
+
+
+@pytest.fixture(scope="module")
+def migrated_engine(tmp_path_factory):
+    url = f"sqlite:///{tmp_path_factory.mktemp('indexes') / 'hrms.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    # Start from a schema without the indexes so the migration does the work
+    with engine.begin() as conn:
+        for table in ("candidates", "applications", "interview_sessions", "whatsapp_communications"):
+            for index in Base.metadata.tables[table].indexes:
+                # ft_* are MySQL-only FULLTEXT indexes
+                if index.name.startswith("ft_"):
+                    continue
+                if len(index.columns) > 1 or index.name != f"ix_{table}_id":
+                    index.drop(conn)
+        for trigger in ("candidates_fts_ai", "candidates_fts_ad", "candidates_fts_au"):
+            conn.execute(text(f"DROP TRIGGER {trigger}"))
+        conn.execute(text("DROP TABLE candidates_fts"))
+        conn.execute(text("DROP TABLE resume_parse_jobs"))
+        conn.execute(text("DROP TABLE resume_files"))
+        conn.execute(text("DROP TABLE offer_batches"))
+        conn.execute(text("ALTER TABLE candidates DROP COLUMN phone_e164"))
+        conn.execute(text("ALTER TABLE candidates DROP COLUMN email_normalized"))
+        for column in ("attempts", "claimed_by", "next_attempt_at", "provider_message_id", "error"):
+            conn.execute(text(f"ALTER TABLE whatsapp_communications DROP COLUMN {column}"))
+        conn.execute(text(
+            "INSERT INTO candidates (first_name, last_name, phone, email, experience_details) "
+            "VALUES ('Asha', 'Rao', '9000000000', ' Asha@Example.com', 'Python and machine learning'), "
+            "('Asha', 'R', '+91 90000 00000', 'asha@example.com', NULL), "
+            "('Ravi', NULL, 'unknown', 'ravi@example.com', NULL)"
+        ))
+    engine.dispose()
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+    yield engine, config
+    engine.dispose()
+
+
+def query_plan(engine, statement):
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.execute(text("EXPLAIN QUERY PLAN " + sql))]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_does_not_full_scan(migrated_engine, name):
+    plan = query_plan(migrated_engine[0], HOT_QUERIES[name])
+    # SCAN anon_N reads a materialized subquery (a page of ids), not a table
+    full_scans = [step for step in plan if step.startswith("SCAN") and "USING" not in step
+                  and not step.startswith("SCAN anon_")]
+    assert not full_scans, f"{name} falls back to a full scan: {plan}"
+
+
+@pytest.mark.parametrize("name", [
+    "candidate pool page", "recruiter's candidates", "oldest queued resume parse jobs",
+    "oldest queued whatsapp messages", "oldest queued offer batch",
+])
+def test_keyset_pages_need_no_sort(migrated_engine, name):
+    plan = query_plan(migrated_engine[0], HOT_QUERIES[name])
+    assert not any("TEMP B-TREE" in step for step in plan), plan
+
+
+def test_pool_counts_read_only_the_index(migrated_engine):
+    plan = query_plan(migrated_engine[0], HOT_QUERIES["pool candidates per job"])
+    assert any("COVERING INDEX ix_candidates_job_id_is_in_pool" in step for step in plan), plan
+
+
+def test_fulltext_migration_indexes_existing_rows(migrated_engine):
+    with migrated_engine[0].connect() as conn:
+        rows = conn.execute(text(
+            "SELECT rowid FROM candidates_fts WHERE candidates_fts MATCH '\"machine learning\"'"
+        )).all()
+    assert len(rows) == 1
+
+
+def test_resume_parse_jobs_link_to_the_file_cache(migrated_engine):
+    foreign_keys = inspect(migrated_engine[0]).get_foreign_keys("resume_parse_jobs")
+    assert {"resume_file_id": "resume_files"}.items() <= {
+        key["constrained_columns"][0]: key["referred_table"] for key in foreign_keys
+    }.items()
+
+
+def test_offer_batches_table_is_created(migrated_engine):
+    columns = {column["name"] for column in inspect(migrated_engine[0]).get_columns("offer_batches")}
+    assert {"status", "attempts", "claimed_by", "candidate_ids", "total", "rendered", "failed", "result"} <= columns
+
+
+def test_dedupe_keys_are_backfilled_once_per_person(migrated_engine):
+    with migrated_engine[0].connect() as conn:
+        rows = conn.execute(text("SELECT phone_e164, email_normalized FROM candidates ORDER BY id")).all()
+    # The later duplicate of Asha keeps NULL keys, so the unique indexes could be built
+    assert [tuple(row) for row in rows] == [
+        ("+919000000000", "asha@example.com"), (None, None), (None, "ravi@example.com"),
+    ]
+    unique = {index["name"] for index in inspect(migrated_engine[0]).get_indexes("candidates") if index["unique"]}
+    assert {"ux_candidates_phone_e164", "ux_candidates_email_normalized"} <= unique
+
+
+def test_downgrade_drops_the_indexes(migrated_engine):
+    engine, config = migrated_engine
+    command.downgrade(config, "base")
+    try:
+        names = {index["name"] for index in inspect(engine).get_indexes("candidates")}
+        assert "ix_candidates_is_in_pool" not in names
+        assert "candidates_fts" not in inspect(engine).get_table_names()
+        assert not {"resume_parse_jobs", "resume_files", "offer_batches"} & set(inspect(engine).get_table_names())
+        assert "phone_e164" not in {column["name"] for column in inspect(engine).get_columns("candidates")}
+        assert "attempts" not in {column["name"] for column in inspect(engine).get_columns("whatsapp_communications")}
+    finally:
+        command.upgrade(config, "head")
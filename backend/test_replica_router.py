@@ -0,0 +1,36 @@
+import asyncio
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.core.replica import ReplicaRouter, make_read_only
+
+
+def test_replica_used_when_reachable_and_read_only(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    make_read_only(engine)
+    router = ReplicaRouter(engine, max_lag=5, check_interval=10)
+
+    async def run():
+        assert await router.use_replica()
+        async with engine.connect() as conn:
+            try:
+                await conn.execute(text("CREATE TABLE t (id INTEGER)"))
+            except exc.OperationalError:
+                return True
+        return False
+
+    try:
+        assert asyncio.run(run())
+        assert router.status()["lag_seconds"] == 0.0
+    finally:
+        asyncio.run(engine.dispose())
+
+
+def test_falls_back_to_primary_when_replica_unreachable(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(engine, max_lag=5, check_interval=10)
+
+    assert asyncio.run(router.use_replica()) is False
+    assert router.status()["last_error"]
+    # The failed check is cached until the interval passes
+    assert router.checked_at > 0
@@ -0,0 +1,42 @@
+from sqlalchemy import create_engine, text
+
+from app.core.request_metrics import RequestMetrics, finish_request, start_request, track_queries
+
+
+def test_statements_are_counted_against_the_current_request():
+    engine = create_engine("sqlite://")
+    track_queries(engine)
+
+    stats, token = start_request()
+    try:
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text("SELECT 1"))
+    finally:
+        finish_request(token)
+
+    assert stats.statements == 3
+    assert stats.db_seconds > 0
+
+    # Outside a request nothing is attributed
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    assert stats.statements == 3
+
+
+def test_render_prometheus_text():
+    metrics = RequestMetrics()
+    stats, token = start_request()
+    finish_request(token)
+    stats.statements = 7
+    metrics.record("GET", "/candidates/{candidate_id}", 200, 0.03, stats)
+    metrics.record("GET", "/candidates/{candidate_id}", 404, 2.0, stats)
+
+    lines = metrics.render().splitlines()
+    route = 'method="GET",route="/candidates/{candidate_id}"'
+    assert f'hrms_http_requests_total{{{route},status="404"}} 1' in lines
+    assert f'hrms_http_request_duration_seconds_bucket{{{route},le="0.05"}} 1' in lines
+    assert f'hrms_http_request_duration_seconds_bucket{{{route},le="+Inf"}} 2' in lines
+    assert f'hrms_db_statements_per_request_bucket{{{route},le="5"}} 0' in lines
+    assert f'hrms_db_statements_per_request_bucket{{{route},le="10"}} 2' in lines
+    assert "# TYPE hrms_db_time_seconds_total counter" in lines
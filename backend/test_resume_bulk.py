@@ -0,0 +1,100 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+from sqlalchemy import select
+
+from app.models.candidate import Candidate
+from app.routers import resume_utils
+from app.routers.resume_bulk_utils import BulkResumeReport, ingest_resumes, save_resumes
+
+spacy = pytest.importorskip("spacy")
+docx = pytest.importorskip("docx")
+
+
+@pytest.fixture(autouse=True)
+def nlp(monkeypatch):
+    # A small real pipeline (the trained models aren't installed in CI): sentence
+    # splitting plus a rule-based PERSON recogniser
+    pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer")
+    ruler = pipeline.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PERSON", "pattern": name} for name in ("Asha Rao", "Ravi Kumar", "Neha")])
+    monkeypatch.setattr(resume_utils, "_nlp", pipeline)
+
+
+def resume(*lines):
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def zipped(**files):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def test_creates_and_updates_candidates_from_files_and_zips(db, tmp_path):
+    db.add(Candidate(first_name="Old", phone="9000000001", email="RAVI@example.com"))
+    db.commit()
+    archive = zipped(**{
+        "cv/ravi.docx": resume("Ravi Kumar", "ravi@example.com", "Worked at Acme on payroll."),
+        "cv/neha.docx": resume("Neha", "9000000002", "Internship in sales."),
+        "__MACOSX/cv/._neha.docx": b"junk",
+        "notes.txt": b"not a resume",
+    })
+    uploads = [
+        ("asha.docx", BytesIO(resume("Asha Rao", "asha@example.com, 9000000003", "Experience: Python."))),
+        ("resumes.zip", archive),
+        ("noone.docx", BytesIO(resume("No contact details here"))),
+        ("broken.pdf", BytesIO(b"not really a pdf")),
+    ]
+    report = ingest_resumes(db, uploads, created_by=5, upload_dir=str(tmp_path), url_prefix="/uploads/resumes/")
+
+    response = report.as_response()
+    assert (response["files"], response["created"], response["updated"], response["failed"]) == (6, 2, 1, 3)
+    assert {error["file"] for error in response["errors"]} == {"notes.txt", "noone.docx", "broken.pdf"}
+    assert response["resumes_per_second"] > 0
+
+    candidates = {c.phone: c for c in db.scalars(select(Candidate))}
+    ravi, neha, asha = candidates["9000000001"], candidates["9000000002"], candidates["9000000003"]
+    assert (ravi.first_name, ravi.last_name, ravi.email) == ("Ravi", "Kumar", "ravi@example.com")
+    assert ravi.experience_details.endswith("Worked at Acme on payroll.")
+    assert (asha.first_name, asha.last_name, asha.email, asha.created_by) == ("Asha", "Rao", "asha@example.com", 5)
+    assert (neha.first_name, neha.last_name) == ("Neha", None)
+    assert neha.experience_details.endswith("Internship in sales.")
+    assert asha.resume_url.startswith("/uploads/resumes/") and asha.resume_url.endswith(".docx")
+    # Unreadable files aren't kept
+    assert len(list(tmp_path.iterdir())) == 4
+
+
+def test_rejects_too_many_files_without_leaving_any(tmp_path):
+    uploads = [(f"{name}.docx", BytesIO(resume(name))) for name in ("a", "b")]
+    with pytest.raises(ValueError, match="at most 1"):
+        save_resumes(uploads, str(tmp_path), BulkResumeReport(), max_files=1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_repeated_upload_is_parsed_once(db, tmp_path, monkeypatch):
+    from app.routers import resume_bulk_utils
+
+    parsed_texts = []
+    parse = resume_bulk_utils.parse_resume_texts
+    monkeypatch.setattr(resume_bulk_utils, "parse_resume_texts",
+                        lambda texts, **kwargs: parsed_texts.extend(texts) or parse(texts, **kwargs))
+    content = resume("Asha Rao", "asha@example.com, 9000000003")
+
+    def upload():
+        uploads = [("asha.docx", BytesIO(content)), ("copy of asha.docx", BytesIO(content))]
+        return ingest_resumes(db, uploads, created_by=5, upload_dir=str(tmp_path), url_prefix="/r/").as_response()
+
+    first, second = upload(), upload()
+    assert (first["created"], first["updated"], second["created"], second["updated"]) == (1, 1, 0, 2)
+    assert len(parsed_texts) == 1 and len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,76 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+from app.core.config import SPACY_MODEL
+from app.core.resume_workers import ResumeParseDispatcher
+from app.models.candidate import Candidate
+from app.models.resume_parse_job import ResumeParseJob, ResumeParseStatus
+from app.routers.resume_cache_utils import get_or_create_resume_file, save_hashed
+from app.routers.resume_queue_utils import enqueue_resume_parse
+
+PARSED = {"name": "Asha Rao", "email": "asha@example.com", "phone": "9000000003", "experience_summary": ""}
+
+
+def test_identical_uploads_share_one_file(tmp_path):
+    upload_dir = tmp_path / "resumes"
+    first = save_hashed(BytesIO(b"%PDF resume"), str(upload_dir), ".PDF")
+    second = save_hashed(BytesIO(b"%PDF resume"), str(upload_dir), ".pdf")
+    other = save_hashed(BytesIO(b"%PDF another"), str(upload_dir), ".pdf")
+
+    assert first[0] == hashlib.sha256(b"%PDF resume").hexdigest()
+    assert (first[1], first[2]) == (second[1], True) and second[2] is False
+    assert first[1].endswith(first[0] + ".pdf") and other[0] != first[0]
+    assert sorted(path.name for path in upload_dir.iterdir()) == sorted([f"{first[0]}.pdf", f"{other[0]}.pdf"])
+    # Too large: nothing is kept, not even the partial file
+    assert save_hashed(BytesIO(b"x" * 10), str(upload_dir), ".pdf", max_bytes=5) is None
+    assert len(list(upload_dir.iterdir())) == 2
+
+
+def test_duplicate_upload_reuses_the_parse(session_factory, tmp_path):
+    calls = []
+
+    def parse(file_path, text=None):
+        calls.append(file_path)
+        return "resume text", dict(PARSED)
+
+    sha256, path, _ = save_hashed(BytesIO(b"%PDF resume"), str(tmp_path), ".pdf")
+    with session_factory() as db:
+        cached = get_or_create_resume_file(db, sha256, path)
+        first = Candidate(first_name="Unknown", phone="1")
+        job = enqueue_resume_parse(db, first, path, created_by=None, resume_file=cached)
+        db.commit()
+        first_job = job.id
+
+    dispatcher = ResumeParseDispatcher(workers=1, session_factory=session_factory, parse=parse,
+                                       executor_factory=ThreadPoolExecutor, poll_seconds=0.05)
+    dispatcher.start()
+    try:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            with session_factory() as db:
+                if db.get(ResumeParseJob, first_job).status == ResumeParseStatus.DONE:
+                    break
+            time.sleep(0.02)
+    finally:
+        dispatcher.stop()
+
+    with session_factory() as db:
+        cached = get_or_create_resume_file(db, sha256, path)
+        assert (cached.extracted_text, cached.parsed, cached.parsed_with) == ("resume text", PARSED, SPACY_MODEL)
+        second = Candidate(first_name="Unknown", phone="2")
+        job = enqueue_resume_parse(db, second, path, created_by=None, resume_file=cached)
+        db.commit()
+        # Done at once, without a worker
+        assert (job.status, job.result) == (ResumeParseStatus.DONE, PARSED)
+        # The phone and email stay with the first candidate, who already has them
+        assert (second.first_name, second.last_name, second.phone, second.email) == ("Asha", "Rao", "2", None)
+
+        # A parse from another spaCy model isn't reused
+        cached.parsed_with = "some_other_model"
+        third = enqueue_resume_parse(db, Candidate(first_name="Unknown", phone="3"), path, None, cached)
+        db.commit()
+        assert third.status == ResumeParseStatus.QUEUED
+    assert calls == [path]
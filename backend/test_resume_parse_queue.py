@@ -0,0 +1,110 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.resume_workers import ResumeParseDispatcher
+from app.models.candidate import Candidate
+from app.models.resume_parse_job import ResumeParseJob, ResumeParseStatus
+from app.routers.resume_queue_utils import claim_jobs, enqueue_resume_parse, requeue_stale_jobs, utcnow
+
+PARSED = {"name": "Asha Rao", "email": "asha@example.com", "phone": "", "experience_summary": "Worked on Python"}
+
+
+def fake_parse(file_path, text=None):
+    if file_path.endswith("missing.pdf"):
+        return "", {}
+    if file_path.endswith("broken.pdf"):
+        raise ValueError("not a PDF")
+    return "resume text", dict(PARSED)
+
+
+def queue(session_factory, *file_paths):
+    with session_factory() as db:
+        candidate = Candidate(first_name="Unknown", phone="9000000000")
+        jobs = [enqueue_resume_parse(db, candidate, path, created_by=None) for path in file_paths]
+        db.commit()
+        return candidate.id, [job.id for job in jobs]
+
+
+def wait_for(session_factory, job_ids, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with session_factory() as db:
+            jobs = db.scalars(select(ResumeParseJob).where(ResumeParseJob.id.in_(job_ids))).all()
+            if all(job.status in (ResumeParseStatus.DONE, ResumeParseStatus.FAILED) for job in jobs):
+                return {job.id: job for job in jobs}
+        time.sleep(0.02)
+    raise AssertionError("jobs did not finish")
+
+
+def dispatcher(session_factory, parse=fake_parse):
+    return ResumeParseDispatcher(
+        workers=2, session_factory=session_factory, parse=parse,
+        executor_factory=ThreadPoolExecutor, poll_seconds=0.05,
+    )
+
+
+def test_parses_queued_jobs_and_updates_the_candidate(session_factory):
+    candidate_id, job_ids = queue(session_factory, "a.pdf", "missing.pdf", "broken.pdf")
+    worker = dispatcher(session_factory)
+    worker.start()
+    try:
+        jobs = wait_for(session_factory, job_ids)
+    finally:
+        worker.stop()
+
+    done, missing, broken = (jobs[job_id] for job_id in job_ids)
+    assert (done.status, done.result, done.attempts) == (ResumeParseStatus.DONE, PARSED, 1)
+    assert done.finished_at is not None and done.claimed_by is not None
+    assert (missing.status, missing.error) == (ResumeParseStatus.FAILED, "Resume file not found")
+    assert (broken.status, broken.error) == (ResumeParseStatus.FAILED, "ValueError: not a PDF")
+    with session_factory() as db:
+        candidate = db.get(Candidate, candidate_id)
+        # The name is split as by the bulk upload; fields the parser didn't find keep their value
+        assert (candidate.first_name, candidate.last_name, candidate.email, candidate.phone,
+                candidate.experience_details) == (
+            "Asha", "Rao", "asha@example.com", "9000000000", "Worked on Python",
+        )
+
+
+def test_each_job_is_claimed_once(session_factory):
+    _, job_ids = queue(session_factory, "a.pdf", "b.pdf", "c.pdf")
+    with session_factory() as first, session_factory() as second:
+        claimed = claim_jobs(first, 2, "first") + claim_jobs(second, 5, "second") + claim_jobs(first, 5, "third")
+    assert sorted(job.id for job in claimed) == job_ids
+
+
+def test_stale_running_jobs_are_requeued_until_out_of_attempts(session_factory):
+    _, (retried, exhausted) = queue(session_factory, "a.pdf", "b.pdf")
+    with session_factory() as db:
+        claim_jobs(db, 2, "dead dispatcher")
+        db.get(ResumeParseJob, exhausted).attempts = 3
+        for job_id in (retried, exhausted):
+            db.get(ResumeParseJob, job_id).started_at = utcnow() - timedelta(hours=1)
+        db.commit()
+        assert requeue_stale_jobs(db, timeout_seconds=600, max_attempts=3) == 1
+        assert db.get(ResumeParseJob, retried).status == ResumeParseStatus.QUEUED
+        assert db.get(ResumeParseJob, exhausted).status == ResumeParseStatus.FAILED
+
+
+def test_stopping_hands_running_jobs_back(session_factory):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_parse(file_path, text=None):
+        started.set()
+        release.wait(10)
+        return "resume text", dict(PARSED)
+
+    _, (job_id,) = queue(session_factory, "a.pdf")
+    worker = dispatcher(session_factory, parse=slow_parse)
+    worker.start()
+    assert started.wait(10)
+    worker.stop()
+    release.set()
+    with session_factory() as db:
+        job = db.get(ResumeParseJob, job_id)
+        assert (job.status, job.attempts, job.claimed_by) == (ResumeParseStatus.QUEUED, 0, None)
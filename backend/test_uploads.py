@@ -0,0 +1,87 @@
+import hashlib
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.uploads import UploadPolicy, place_by_hash, receive_uploads
+
+PDF = b"%PDF-1.4\n" + b"x" * 3000
+POLICY = UploadPolicy("files", {".pdf": 4096, ".zip": 8192}, max_files=2)
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = FastAPI()
+    app.state.received = []
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        uploads = await receive_uploads(request, POLICY, str(tmp_path / "tmp"))
+        app.state.received = uploads
+        return [{"name": u.filename, "size": u.size, "sha256": u.sha256} for u in uploads]
+
+    return TestClient(app)
+
+
+def test_streams_files_to_disk_with_their_hash(client, tmp_path):
+    zipped = b"PK\x03\x04" + b"z" * 5000
+    response = client.post("/upload", data={"note": "hello"},
+                           files=[("files", ("cv.PDF", PDF)), ("files", ("more.zip", zipped))])
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "cv.PDF", "size": len(PDF), "sha256": hashlib.sha256(PDF).hexdigest()},
+        {"name": "more.zip", "size": len(zipped), "sha256": hashlib.sha256(zipped).hexdigest()},
+    ]
+    first = client.app.state.received[0]
+    assert open(first.path, "rb").read() == PDF
+
+    stored = tmp_path / "stored"
+    path, is_new = place_by_hash(first, str(stored))
+    assert is_new and path.endswith(hashlib.sha256(PDF).hexdigest() + ".pdf")
+    # The same content again is dropped in favour of the stored file
+    duplicate = client.post("/upload", files={"files": ("again.pdf", PDF)})
+    assert duplicate.status_code == 200
+    assert place_by_hash(client.app.state.received[0], str(stored)) == (path, False)
+    assert len(list(stored.iterdir())) == 1
+
+
+@pytest.mark.parametrize("files, status, detail", [
+    ({"files": ("cv.exe", PDF)}, 415, "Unsupported file type '.exe'"),
+    ({"files": ("cv.pdf", b"MZ\x90\x00 not a pdf")}, 415, "cv.pdf is not a valid .pdf file"),
+    ({"files": ("cv.pdf", PDF + b"x" * 2000)}, 413, "cv.pdf is larger than"),
+    ({"resume": ("cv.pdf", PDF)}, 400, "send files as 'files'"),
+    ([("files", ("a.pdf", PDF))] * 3, 413, "Too many files"),
+])
+def test_rejects_without_leaving_files(client, tmp_path, files, status, detail):
+    response = client.post("/upload", files=files)
+    assert response.status_code == status
+    assert detail in response.json()["detail"]
+    assert list((tmp_path / "tmp").glob("*")) == []
+
+
+def test_refuses_oversized_content_length_before_reading(client, tmp_path):
+    def body():
+        raise AssertionError("the body must not be read")
+        yield b""
+
+    response = client.post("/upload", content=body(), headers={
+        "content-type": "multipart/form-data; boundary=x",
+        "content-length": str(POLICY.max_request_bytes + 1),
+    })
+    assert response.status_code == 413
+    assert not (tmp_path / "tmp").exists()
+
+
+def test_malformed_body_is_a_400(client, tmp_path):
+    part = b'--x\r\nContent-Disposition: form-data; name="files"; filename="a.pdf"\r\n\r\n' + PDF
+    # The first file is stored before the second part's header turns out to be bad
+    response = client.post("/upload", content=part + b"\r\n--x\r\nbad header\r\n\r\n", headers={
+        "content-type": "multipart/form-data; boundary=x",
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Malformed multipart body")
+    assert list((tmp_path / "tmp").glob("*")) == []
+    assert client.post("/upload", content=b"garbage", headers={
+        "content-type": "multipart/form-data; boundary=x",
+    }).status_code == 400
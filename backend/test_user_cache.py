@@ -0,0 +1,30 @@
+import time
+from app.core.cache import TTLCache
+from app.core.security import user_cache, invalidate_cached_user
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_cached_user_drops_every_given_subject():
+    user_cache.set("old@test.com", object())
+    user_cache.set("new@test.com", object())
+    invalidate_cached_user("old@test.com", "new@test.com", None)
+    assert user_cache.get("old@test.com") is None
+    assert user_cache.get("new@test.com") is None
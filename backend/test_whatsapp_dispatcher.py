@@ -0,0 +1,165 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.database import get_db
+from app.core.whatsapp_dispatcher import TokenBucket, WhatsAppDispatcher, WhatsAppMetrics
+from app.core.whatsapp_providers import DeliveryUpdate, SendResult, StubWhatsAppProvider
+from app.models.candidate import Candidate, WhatsAppCommunication, WhatsAppMessageStatus
+from app.routers import candidates
+from app.routers.whatsapp_queue_utils import (
+    claim_messages, queue_bulk_messages, record_delivery_updates, requeue_stale_messages, utcnow,
+)
+from app.schemas.candidate import WhatsAppBulkSend
+
+DONE = {WhatsAppMessageStatus.SENT, WhatsAppMessageStatus.FAILED}
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with session_factory() as db:
+        db.add_all(Candidate(first_name=f"C{i}", phone=f"90000000{i:02d}", created_by=1 + i % 2) for i in range(6))
+        db.commit()
+    return session_factory
+
+
+def queue(session_factory, **selection):
+    with session_factory() as db:
+        campaign = WhatsAppBulkSend(message_content="Hello", **selection)
+        return queue_bulk_messages(db, campaign, campaign.message_content, campaign.message_type)
+
+
+def wait_for(session_factory, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with session_factory() as db:
+            messages = db.scalars(select(WhatsAppCommunication).order_by(WhatsAppCommunication.id)).all()
+            if all(message.status in DONE for message in messages):
+                return messages
+        time.sleep(0.02)
+    raise AssertionError("messages were not sent")
+
+
+def test_bulk_queue_is_one_insert_and_respects_the_owner(session_factory, statements):
+    statements.clear()
+    with session_factory() as db:
+        campaign = WhatsAppBulkSend(filter={"status": "New"}, message_content="Hello")
+        assert queue_bulk_messages(db, campaign, "Hello", "Campaign", owner_id=2) == 3
+    assert [sql.split()[0] for sql in statements] == ["INSERT"]
+    with session_factory() as db:
+        rows = db.execute(select(WhatsAppCommunication.candidate_id, WhatsAppCommunication.status)).all()
+    assert sorted(rows) == [(2, "Queued"), (4, "Queued"), (6, "Queued")]
+
+
+def test_sends_in_batches_with_retries(session_factory):
+    queue(session_factory, ids=[1, 2, 3, 4, 5])
+    provider = StubWhatsAppProvider(results={
+        # Rate limited once, then sent; a bad number fails for good
+        "9000000001": [SendResult(False, error="HTTP 429", retryable=True, retry_after=0)],
+        "9000000002": [SendResult(False, error="HTTP 400: invalid recipient")],
+    })
+    metrics = WhatsAppMetrics()
+    worker = WhatsAppDispatcher(
+        provider_factory=lambda: provider, session_factory=session_factory, batch_size=2, concurrency=2,
+        rate=1000, burst=10, poll_seconds=0.05, metrics=metrics,
+    )
+    worker.start()
+    try:
+        messages = wait_for(session_factory)
+    finally:
+        worker.stop()
+
+    by_phone = {message.phone_number: message for message in messages}
+    retried, failed = by_phone["9000000001"], by_phone["9000000002"]
+    assert (retried.status, retried.attempts, retried.provider_message_id) == ("Sent", 2, f"stub-{retried.id}-2")
+    assert (failed.status, failed.attempts, failed.error) == ("Failed", 1, "HTTP 400: invalid recipient")
+    assert sum(message.status == "Sent" for message in messages) == 4
+    assert all(message.claimed_by is None and message.sent_at for message in messages if message.status == "Sent")
+    assert len(provider.sent) == 4
+    assert metrics.counts["stub"] == {"sent": 4, "retried": 1, "failed": 1}
+    assert 'hrms_whatsapp_messages_total{provider="stub",result="sent"} 4' in metrics.render()
+
+
+def test_token_bucket_limits_the_send_rate():
+    async def send_all():
+        bucket = TokenBucket(rate=20, capacity=2)
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # A burst of 2, then 4 more at 20/s
+    assert 0.18 <= asyncio.run(send_all()) < 1
+
+
+def test_expired_claims_are_requeued_until_out_of_attempts(session_factory):
+    queue(session_factory, ids=[1, 2])
+    with session_factory() as db:
+        retried, exhausted = claim_messages(db, 5, "dead dispatcher")
+        db.get(WhatsAppCommunication, exhausted.id).attempts = 5
+        for message in (retried, exhausted):
+            db.get(WhatsAppCommunication, message.id).next_attempt_at = utcnow() - timedelta(seconds=1)
+        db.commit()
+        assert requeue_stale_messages(db, max_attempts=5) == 1
+        assert db.get(WhatsAppCommunication, retried.id).status == "Queued"
+        assert db.get(WhatsAppCommunication, exhausted.id).status == "Failed"
+
+
+def test_delivery_receipts_only_move_forward(session_factory):
+    queue(session_factory, ids=[1, 2])
+    with session_factory() as db:
+        for message, provider_id in zip(db.scalars(select(WhatsAppCommunication)), ("wamid.1", "wamid.2")):
+            message.status, message.provider_message_id = "Sent", provider_id
+        db.commit()
+        assert record_delivery_updates(db, [
+            DeliveryUpdate("wamid.1", "read"), DeliveryUpdate("wamid.1", "delivered"),
+            DeliveryUpdate("wamid.2", "failed", error="Undeliverable"), DeliveryUpdate("unknown", "read"),
+        ]) == 2
+        first, second = db.scalars(select(WhatsAppCommunication).order_by(WhatsAppCommunication.id)).all()
+        assert (first.status, first.read_at is not None, first.delivered_at is not None) == ("Read", True, True)
+        assert (second.status, second.error) == ("Failed", "Undeliverable")
+
+
+def test_delivery_webhook_applies_every_receipt_off_the_event_loop(session_factory, monkeypatch):
+    queue(session_factory, ids=[1, 2, 3])
+    with session_factory() as db:
+        for message in db.scalars(select(WhatsAppCommunication)):
+            message.status, message.provider_message_id = "Sent", f"wamid.{message.id}"
+        db.commit()
+
+    on_loop = []
+
+    def record(db, updates):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return record_delivery_updates(db, updates)
+
+    def session():
+        with session_factory() as db:
+            yield db
+
+    monkeypatch.setattr(candidates, "WHATSAPP_WEBHOOK_TOKEN", "secret")
+    monkeypatch.setattr(candidates, "record_delivery_updates", record)
+    app = FastAPI()
+    app.include_router(candidates.router, prefix="/candidates")
+    app.dependency_overrides[get_db] = session
+    response = TestClient(app).post("/candidates/whatsapp/status?token=secret", json=[
+        {"provider_message_id": "wamid.1", "status": "delivered", "timestamp": 1760000000},
+        {"provider_message_id": "wamid.2", "status": "read"},
+        {"provider_message_id": "wamid.3", "status": "failed", "error": "Undeliverable"},
+    ])
+    assert response.status_code == 200 and response.json() == {"updated": 3}
+    assert on_loop == [False]
+    with session_factory() as db:
+        rows = db.execute(
+            select(WhatsAppCommunication.status, WhatsAppCommunication.error).order_by(WhatsAppCommunication.id)
+        ).all()
+    assert [tuple(row) for row in rows] == [("Delivered", None), ("Read", None), ("Failed", "Undeliverable")]
@@ -139,7 +139,11 @@ CREATE TABLE IF NOT EXISTS candidates (
     created_by INT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL
+    FOREIGN KEY (created_by) REFERENCES users(id) ON DELETE SET NULL,
+    INDEX ix_candidates_is_in_pool (is_in_pool),
+    INDEX ix_candidates_created_by (created_by),
+    INDEX ix_candidates_status_created_at (status, created_at),
+    INDEX ix_candidates_created_at (created_at)
 );
 
 -- Job Applications table (Enhanced)
@@ -158,7 +162,12 @@ CREATE TABLE IF NOT EXISTS applications (
     applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE,
-    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE,
+    INDEX ix_applications_job_id_candidate_id (job_id, candidate_id),
+    INDEX ix_applications_candidate_id (candidate_id),
+    INDEX ix_applications_status_applied_at (status, applied_at),
+    INDEX ix_applications_applied_at (applied_at),
+    INDEX ix_applications_interview_scheduled_at (interview_scheduled_at)
 );
 
 -- Job Posting Channels
@@ -182,13 +191,20 @@ CREATE TABLE IF NOT EXISTS whatsapp_communications (
     phone_number VARCHAR(20) NOT NULL,
     message_content TEXT,
     message_type ENUM('Initial Contact', 'Follow-up', 'Interview Schedule', 'Offer Letter', 'Rejection') DEFAULT 'Initial Contact',
-    status ENUM('Pending', 'Sent', 'Delivered', 'Read', 'Failed') DEFAULT 'Pending',
+    status VARCHAR(50) DEFAULT 'Pending',
+    attempts INT NOT NULL DEFAULT 0,
+    claimed_by VARCHAR(100) NULL,
+    next_attempt_at TIMESTAMP NULL,
+    provider_message_id VARCHAR(100) NULL,
+    error TEXT,
     sent_at TIMESTAMP NULL,
     delivered_at TIMESTAMP NULL,
     read_at TIMESTAMP NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE
+    FOREIGN KEY (candidate_id) REFERENCES candidates(id) ON DELETE CASCADE,
+    INDEX ix_whatsapp_communications_status_id (status, id),
+    INDEX ix_whatsapp_communications_provider_message_id (provider_message_id)
 );
 
 -- Insert sample data
@@ -37,10 +37,12 @@ export default function CandidateActions() {
 
     setUploading(true);
     try {
-      await api.post('/candidates/upload-excel/', formData, {
+      const response = await api.post('/candidates/upload-excel/', formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
-      alert('Candidates uploaded successfully!');
+      const { message, errors = [] } = response.data;
+      const details = errors.slice(0, 10).map((e) => `Row ${e.row}: ${e.error}`).join('\n');
+      alert(details ? `${message}\n\n${details}` : message);
     } catch (err) {
       console.error(err);
       alert('Failed to upload candidates');
@@ -49,6 +51,31 @@ export default function CandidateActions() {
     }
   };
 
+  const handleUploadResumes = async (e) => {
+    const files = Array.from(e.target.files);
+    if (!files.length) return;
+
+    const formData = new FormData();
+    files.forEach((file) => formData.append('files', file));
+
+    setUploading(true);
+    try {
+      const response = await api.post('/candidates/upload-resumes/', formData, {
+        headers: { 'Content-Type': 'multipart/form-data' },
+      });
+      const { message, errors = [], resumes_per_second } = response.data;
+      const details = errors.slice(0, 10).map((e) => `${e.file}: ${e.error}`).join('\n');
+      const summary = `${message} (${resumes_per_second} resumes/s)`;
+      alert(details ? `${summary}\n\n${details}` : summary);
+    } catch (err) {
+      console.error(err);
+      alert('Failed to upload resumes');
+    } finally {
+      setUploading(false);
+      e.target.value = '';
+    }
+  };
+
   return (
     <div className="flex gap-3">
       <button
@@ -59,7 +86,11 @@ export default function CandidateActions() {
       </button>
       <label className="bg-green-500 hover:bg-green-600 text-white px-4 py-2 rounded cursor-pointer">
         {uploading ? 'Uploading...' : 'Upload Candidate Excel'}
-        <input type="file" accept=".xlsx,.xls" className="hidden" onChange={handleUploadExcel} />
+        <input type="file" accept=".xlsx" className="hidden" onChange={handleUploadExcel} />
+      </label>
+      <label className="bg-indigo-500 hover:bg-indigo-600 text-white px-4 py-2 rounded cursor-pointer">
+        {uploading ? 'Uploading...' : 'Bulk Upload Resumes'}
+        <input type="file" accept=".pdf,.docx,.zip" multiple className="hidden" onChange={handleUploadResumes} />
       </label>
     </div>
   );
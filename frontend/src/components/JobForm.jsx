@@ -71,7 +71,7 @@ const JobForm = ({ isOpen, onClose, onSuccess, editJob = null }) => {
   const fetchExtras = async () => {
       try {
         const [jobsRes, workflowsRes, recruitersRes, agenciesRes] = await Promise.all([
-          jobsAPI.getAll(),
+          jobsAPI.getMinimal(),
           jobsAPI.getWorkflows(),
           authAPI.getRecruiters(),
           jobsAPI.getAgencies()
@@ -36,7 +36,7 @@ const Applications = () => {
   const fetchApplications = async () => {
     setLoading(true)
     try {
-      const res = await applicationsAPI.getAll()  // ✅ backend call
+      const res = await applicationsAPI.getAllPages()  // ✅ backend call
       setApplications(res.data || [])
     } catch (err) {
       console.error('Failed to fetch applications', err)
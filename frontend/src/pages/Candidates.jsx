@@ -10,6 +10,9 @@ const Candidates = () => {
   const [searchTerm, setSearchTerm] = useState('')
   const [selectedStatus, setSelectedStatus] = useState('all')
   const [candidates, setCandidates] = useState([])
+  // Cursor of the next page of candidates; null once all are loaded
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [formOpen, setFormOpen] = useState(false)
   const [editCandidate, setEditCandidate] = useState(null)
   const [viewCandidate, setViewCandidate] = useState(null)
@@ -38,13 +41,28 @@ const Candidates = () => {
 
   const fetchCandidates = async () => {
     try {
-      const res = await candidatesAPI.getAll()
-      setCandidates(res.data)
+      const page = await candidatesAPI.getPage()
+      setCandidates(page.data)
+      setNextCursor(page.nextCursor)
     } catch (err) {
       console.error('Failed to fetch candidates', err)
     }
   }
 
+  const loadMoreCandidates = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const page = await candidatesAPI.getPage({}, nextCursor)
+      setCandidates(prev => [...prev, ...page.data])
+      setNextCursor(page.nextCursor)
+    } catch (err) {
+      console.error('Failed to load more candidates', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const cityOptions = useMemo(() => {
       return ['all', ...Array.from(new Set(candidates.map(c => c.location_city?.trim()).filter(Boolean)))]
   }, [candidates])
@@ -175,8 +193,16 @@ const Candidates = () => {
 
   try {
     const res = await candidatesAPI.uploadResume(candidateId, formData)
-    alert('Resume uploaded & parsed successfully!')
+    alert('Resume uploaded, parsing in the background')
     fetchCandidates()  // refresh table
+    // Parsing runs on the server's resume workers; refresh once it finishes
+    const poll = async (attempt = 0) => {
+      const { data: job } = await candidatesAPI.getResumeJob(res.data.job_id)
+      if (job.status === 'done') fetchCandidates()
+      else if (job.status === 'failed') alert(`Resume parsing failed: ${job.error}`)
+      else if (attempt < 60) setTimeout(() => poll(attempt + 1), 2000)
+    }
+    poll()
   } catch (err) {
     console.error('Resume upload failed', err)
     alert('Failed to upload resume')
@@ -457,6 +483,15 @@ const Candidates = () => {
         </button>
         <span className="text-sm">
           Page {currentPage} of {totalPages}
+          {nextCursor && (
+            <button
+              onClick={loadMoreCandidates}
+              disabled={loadingMore}
+              className="ml-3 px-3 py-1 text-sm bg-blue-100 text-blue-800 rounded disabled:opacity-50"
+            >
+              {loadingMore ? 'Loading...' : `Load more (${candidates.length} loaded)`}
+            </button>
+          )}
         </span>
         <button
           onClick={() => setCurrentPage((prev) => Math.min(prev + 1, totalPages))}
@@ -311,7 +311,7 @@ const Jobs = () => {
   const fetchJobs = async () => {
     try {
       setLoading(true)
-      const response = await jobsAPI.getAll()
+      const response = await jobsAPI.getAllPages()
       setJobs(response.data)
     } catch (err) {
       console.error('Error fetching jobs:', err)
@@ -44,6 +44,30 @@ api.interceptors.response.use(
   }
 )
 
+// List endpoints return one page at a time, newest first. The cursor for the
+// next page is in the X-Next-Cursor header, which is absent on the last page.
+export const MAX_PAGE_SIZE = 500
+
+// One page of a list: { data, nextCursor }; pass nextCursor back for the next one
+export const getPage = async (url, params = {}, cursor = null) => {
+  const res = await api.get(url, {
+    params: { limit: MAX_PAGE_SIZE, ...params, ...(cursor ? { cursor } : {}) },
+  })
+  return { data: res.data, nextCursor: res.headers['x-next-cursor'] || null }
+}
+
+// Every page of a list, following X-Next-Cursor; resolves to { data }
+export const getAllPages = async (url, params = {}) => {
+  let data = []
+  let cursor = null
+  do {
+    const page = await getPage(url, params, cursor)
+    data = data.concat(page.data)
+    cursor = page.nextCursor
+  } while (cursor)
+  return { data }
+}
+
 // Auth API
 export const authAPI = {
   login: (credentials) => {
@@ -66,8 +90,10 @@ export const employeesAPI = {
 
 // Candidates API
 export const candidatesAPI = {
-  getAllOffers: () => api.get(`/candidates/offers/all`),
+  getAllOffers: () => getAllPages('/candidates/offers/all'),
   getAll: (params) => api.get('/candidates', { params }),
+  // { data, nextCursor }: see getPage
+  getPage: (params, cursor) => getPage('/candidates', params, cursor),
   getById: (id) => api.get(`/candidates/${id}`),
   create: (data) => api.post('/candidates', data),
   update: (id, data) => api.put(`/candidates/${id}`, data),
@@ -78,18 +104,34 @@ export const candidatesAPI = {
           'Content-Type': 'multipart/form-data',
         },
       }),
+  getResumeJob: (jobId) => api.get(`/candidates/resume-jobs/${jobId}`),
+  // { ids: [...] } or { filter: {...} }, plus in_pool / status and reasons
+  bulkUpdatePool: (data) => api.post('/candidates/bulk/pool', data),
+  bulkUpdateStatus: (data) => api.post('/candidates/bulk/status', data),
+  // Same filters as getAll/search, plus format: 'csv' | 'xlsx'
+  exportCandidates: (params) => api.get('/candidates/export/', { params, responseType: 'blob' }),
+  // { ids | filter, message_content, message_type }; messages are sent in the background
+  bulkSendWhatsApp: (data) => api.post('/candidates/bulk/whatsapp', data),
   issueOffer: (id) => api.post(`/candidates/${id}/issue-offer`),
+  // { ids | filter }; poll getOfferBatch(batch_id) for progress
+  bulkIssueOffers: (data) => api.post('/candidates/bulk/issue-offers', data),
+  getOfferBatch: (batchId) => api.get(`/candidates/offer-batches/${batchId}`),
 
 }
 
 // Jobs API
 export const jobsAPI = {
   getAll: (params) => api.get('/jobs', { params }),
+  // Every job, following the page cursor
+  getAllPages: (params) => getAllPages('/jobs', params),
+  // id, position_title and position_code of every job, for dropdowns
+  getMinimal: () => api.get('/jobs/minimal'),
   getById: (id) => api.get(`/jobs/${id}`),
   create: (data) => api.post('/jobs', data),
   update: (id, data) => api.put(`/jobs/${id}`, data),
   delete: (id) => api.delete(`/jobs/${id}`),
   getPoolForJob: (jobId) => api.get(`/jobs/${jobId}/pool_candidates`),
+  getPoolMatches: (jobId, params) => api.get(`/jobs/${jobId}/pool_matches`, { params }),
   submitForApproval: (jobId) =>
     api.post(`/jobs/${jobId}/submit-for-approval`),
   approveJob: (jobId) => api.post(`/jobs/${jobId}/approve`),
@@ -116,6 +158,7 @@ export const jobsAPI = {
 // Applications API
 export const applicationsAPI = {
   getAll: (params) => api.get('/applications', { params }),
+  getAllPages: (params) => getAllPages('/applications', params),
   getById: (id) => api.get(`/applications/${id}`),
   create: (data) => api.post('/applications', data),
   update: (id, data) => api.put(`/applications/${id}`, data),
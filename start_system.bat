@@ -68,6 +68,10 @@ REM Start backend server in a new window
 echo Starting backend server on http://localhost:8000...
 start "Backend Server" cmd /k "cd backend && python main.py"
 
+REM Start the WhatsApp dispatcher (one per deployment) in a new window
+echo Starting WhatsApp dispatcher...
+start "WhatsApp Dispatcher" cmd /k "cd backend && python -m app.core.whatsapp_dispatcher"
+
 REM Wait a moment for backend to start
 timeout /t 3 /nobreak >nul
 
@@ -77,6 +77,10 @@ Write-Host ""
 Write-Host "Starting backend server on http://localhost:8000..." -ForegroundColor Cyan
 Start-Process powershell -ArgumentList "-NoExit", "-Command", "cd backend; python main.py" -WindowStyle Normal
 
+# Start the WhatsApp dispatcher (one per deployment)
+Write-Host "Starting WhatsApp dispatcher..." -ForegroundColor Cyan
+Start-Process powershell -ArgumentList "-NoExit", "-Command", "cd backend; python -m app.core.whatsapp_dispatcher" -WindowStyle Normal
+
 # Wait a moment for backend to start
 Start-Sleep -Seconds 3
 